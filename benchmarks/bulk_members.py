@@ -0,0 +1,68 @@
+"""
+Benchmark of POST /api/project/<id>/members with a large list of emails.
+Seeds a throwaway SQLite database with --emails users and adds all of them to a
+project in one request, reporting latency and the number of SQL statements.
+
+    $ python benchmarks/bulk_members.py [--emails 1000]
+"""
+import argparse
+import datetime
+import os
+import sys
+import tempfile
+import time
+
+DB_PATH = os.path.join(tempfile.gettempdir(), 'echoboard_bench_members.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{DB_PATH}'
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '../src'))
+
+from sqlalchemy import event  # noqa: E402
+from flask_jwt_extended import create_access_token  # noqa: E402
+from app import app  # noqa: E402
+from api.models import db, User, Project  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--emails', type=int, default=1000)
+    args = parser.parse_args()
+
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+
+    with app.app_context():
+        db.create_all()
+        now = datetime.datetime.now()
+        db.session.execute(User.__table__.insert(), [{
+            'full_name': f'Bench User {i}', 'email': f'bench{i}@example.com', 'password': 'x',
+            'country': 'ES', 'created_at': now, 'is_active': True
+        } for i in range(args.emails + 1)])
+        db.session.execute(Project.__table__.insert(), [{
+            'title': 'Project', 'created_at': now, 'due_date': now,
+            'status': 'in_progress', 'admin_id': 1
+        }])
+        db.session.commit()
+        token = create_access_token(identity='1')
+        # bench0 is the admin, the rest are new members plus one unknown email
+        emails = [f'bench{i}@example.com' for i in range(1, args.emails + 1)] + ['missing@example.com']
+
+        statements = []
+        listener = lambda *a, **k: statements.append(1)  # noqa: E731
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        start = time.perf_counter()
+        response = app.test_client().post(
+            '/api/project/1/members', json={'members': emails},
+            headers={'Authorization': f'Bearer {token}'})
+        elapsed = (time.perf_counter() - start) * 1000
+        event.remove(db.engine, 'before_cursor_execute', listener)
+
+    data = response.get_json()
+    assert response.status_code == 200, data
+    print(f'POST /api/project/1/members with {len(emails)} emails')
+    print(f'  added: {len(data["added_members"])}, errors: {len(data["errors"])}')
+    print(f'  {len(statements)} queries, {elapsed:.2f} ms')
+    os.remove(DB_PATH)
+
+
+if __name__ == '__main__':
+    main()
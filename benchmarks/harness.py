@@ -0,0 +1,285 @@
+"""
+Benchmark of the main API endpoints, meant to be run on every commit and diffed.
+For every database and dataset size a fresh process creates the schema, seeds it with
+api.seed (same --seed, same data) and measures, for login, get_projects, get_project,
+get_project_tasks, create_task, update_task and ai_standup (Mistral stubbed out):
+latency percentiles, throughput with --clients concurrent clients and SQL statements
+per request. The user is the admin of the most projects and the project its largest
+one, the worst case of the dataset.
+
+SQLite always runs. PostgreSQL runs with --postgres or BENCH_POSTGRES_URL, e.g.
+postgresql://localhost/echoboard_bench: a dedicated database, its tables are dropped.
+
+    $ python benchmarks/harness.py [--sizes small medium] [--requests 50] [--clients 1]
+          [--postgres URL] [--output bench_report.json]
+    $ python benchmarks/harness.py --compare before.json after.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+DB_PATH = os.path.join(tempfile.gettempdir(), 'echoboard_bench_harness.db')
+os.environ.setdefault('DATABASE_URL', f'sqlite:///{DB_PATH}')
+os.environ.setdefault('MISTRAL_API_KEY', 'benchmark')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '../src'))
+
+import sqlalchemy  # noqa: E402
+from sqlalchemy import event, func  # noqa: E402
+from flask_jwt_extended import create_access_token  # noqa: E402
+from app import app  # noqa: E402
+from api.models import db, User, Project, Task  # noqa: E402
+from api.passwords import password_hasher  # noqa: E402
+from api.seed import seed_data  # noqa: E402
+
+PASSWORD = '123456'
+SIZES = {
+    'small': {'users': 100, 'projects': 20, 'tasks_per_project': 20},
+    'medium': {'users': 1000, 'projects': 200, 'tasks_per_project': 50},
+    'large': {'users': 10000, 'projects': 2000, 'tasks_per_project': 200},
+}
+ENDPOINTS = ['login', 'get_projects', 'get_project', 'get_project_tasks',
+             'create_task', 'update_task', 'ai_standup']
+STATUSES = ['in progress', 'urgent', 'delegated', 'done']
+
+
+def fake_mistral_response(*args, **kwargs):
+    response = mock.Mock(status_code=200)
+    response.json.return_value = {'choices': [{'message': {'content': 'All good.'}}]}
+    return response
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+
+def prepare(size, seed):
+    """ Seeds the database, returns the rows per table and what the requests need """
+    db.drop_all()
+    db.create_all()
+    start = time.perf_counter()
+    rows = seed_data(seed=seed, password_hash=password_hasher.hash(PASSWORD), **SIZES[size])
+    seed_seconds = time.perf_counter() - start
+
+    user_id = db.session.query(Project.admin_id).group_by(Project.admin_id).order_by(
+        func.count().desc(), Project.admin_id).limit(1).scalar()
+    project_id = db.session.query(Project.id).join(Task, Task.project_id == Project.id).filter(
+        Project.admin_id == user_id).group_by(Project.id).order_by(
+        func.count().desc(), Project.id).limit(1).scalar()
+    task_ids = [task_id for (task_id,) in db.session.query(Task.id).filter(
+        Task.project_id == project_id).order_by(Task.id).limit(100)]
+    emails = [email for (email,) in db.session.query(User.email).order_by(User.id).limit(20)]
+    context = {
+        'user_id': user_id,
+        'project_id': project_id,
+        'task_ids': task_ids,
+        'emails': emails,
+        'headers': {'Authorization': f'Bearer {create_access_token(identity=str(user_id))}'},
+    }
+    return rows, round(seed_seconds, 2), context
+
+
+def make_request(name, number, context):
+    """ (method, url, json body, expected status) of the number-th request to an endpoint """
+    project = f"/api/project/{context['project_id']}"
+    if name == 'login':
+        emails = context['emails']
+        return 'post', '/api/login', {'email': emails[number % len(emails)], 'password': PASSWORD}, 200
+    if name == 'get_projects':
+        return 'get', '/api/projects', None, 200
+    if name == 'get_project':
+        return 'get', project, None, 200
+    if name == 'get_project_tasks':
+        return 'get', f'{project}/tasks', None, 200
+    if name == 'create_task':
+        return 'post', f'{project}/task', {
+            'title': f'Benchmark task {number}', 'description': 'Created by the benchmark',
+            'status': STATUSES[number % len(STATUSES)], 'assigned_to_id': context['user_id']}, 201
+    if name == 'update_task':
+        task_ids = context['task_ids']
+        return 'put', f'{project}/task/{task_ids[number % len(task_ids)]}', {
+            'status': STATUSES[number % len(STATUSES)], 'description': f'Update {number}'}, 200
+    if name == 'ai_standup':
+        return 'post', '/api/ai/standup', None, 200
+    raise ValueError(name)
+
+
+def measure(name, context, requests, clients, warmup):
+    """ Latency (ms), throughput and SQL statements per request of one endpoint """
+    counter = threading.local()
+
+    def count_statement(*args, **kwargs):
+        counter.statements = getattr(counter, 'statements', 0) + 1
+
+    def call(number):
+        client = app.test_client()
+        method, url, body, expected = make_request(name, number, context)
+        counter.statements = 0
+        start = time.perf_counter()
+        response = getattr(client, method)(url, json=body, headers=context['headers'])
+        elapsed = time.perf_counter() - start
+        assert response.status_code == expected, (name, response.status_code, response.get_json())
+        return elapsed * 1000, counter.statements
+
+    event.listen(db.engine, 'before_cursor_execute', count_statement)
+    try:
+        for number in range(warmup):
+            call(requests + number)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=clients) as executor:
+            results = list(executor.map(call, range(requests)))
+        wall = time.perf_counter() - start
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', count_statement)
+
+    latencies = [latency for latency, _ in results]
+    statements = [count for _, count in results]
+    return {
+        'requests': requests,
+        'latency_ms': {
+            'min': round(min(latencies), 3),
+            'mean': round(statistics.mean(latencies), 3),
+            'p50': round(percentile(latencies, 0.50), 3),
+            'p95': round(percentile(latencies, 0.95), 3),
+            'p99': round(percentile(latencies, 0.99), 3),
+            'max': round(max(latencies), 3),
+        },
+        'throughput_rps': round(requests / wall, 2),
+        'queries': {'min': min(statements), 'max': max(statements),
+                    'mean': round(statistics.mean(statements), 2)},
+    }
+
+
+def run_case(args):
+    """ One database and size, runs in its own process so DATABASE_URL is read at import """
+    # Thousands of logins from one address would only measure the 429 path
+    app.config['RATE_LIMIT_ENABLED'] = False
+    with app.app_context():
+        rows, seed_seconds, context = prepare(args.case, args.seed)
+        result = {'rows': rows, 'seed_seconds': seed_seconds, 'endpoints': {}}
+        with mock.patch('requests.Session.post', side_effect=fake_mistral_response):
+            for name in ENDPOINTS:
+                result['endpoints'][name] = measure(name, context, args.requests, args.clients, args.warmup)
+                db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+    password_hasher.shutdown()
+    with open(args.result, 'w') as f:
+        json.dump(result, f)
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(before_path, after_path):
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+    print(f"{before['meta']['commit']} -> {after['meta']['commit']}")
+    for setting in ('requests', 'clients', 'seed', 'cpu_count', 'password_hash_method'):
+        if before['meta'].get(setting) != after['meta'].get(setting):
+            print(f"  warning: {setting} differs ({before['meta'].get(setting)} vs {after['meta'].get(setting)})")
+    for database, sizes in after['results'].items():
+        for size, result in sizes.items():
+            old = before['results'].get(database, {}).get(size)
+            if not old:
+                continue
+            print(f'{database} / {size}')
+            for name, new in result['endpoints'].items():
+                if name not in old['endpoints']:
+                    continue
+                old_p50 = old['endpoints'][name]['latency_ms']['p50']
+                new_p50 = new['latency_ms']['p50']
+                change = (new_p50 - old_p50) / old_p50 * 100 if old_p50 else 0
+                print(f"  {name:<18} p50 {old_p50:9.2f} -> {new_p50:9.2f} ms ({change:+6.1f}%)"
+                      f"   queries {old['endpoints'][name]['queries']['mean']:6.1f} -> "
+                      f"{new['queries']['mean']:6.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', nargs='+', choices=list(SIZES), default=['small', 'medium'])
+    parser.add_argument('--requests', type=int, default=50, help='Measured requests per endpoint')
+    parser.add_argument('--warmup', type=int, default=3, help='Unmeasured requests per endpoint')
+    parser.add_argument('--clients', type=int, default=1, help='Concurrent clients')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--postgres', default=os.getenv('BENCH_POSTGRES_URL'))
+    parser.add_argument('--output', default='bench_report.json')
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'))
+    # Internal: run a single size against DATABASE_URL and write the result to --result
+    parser.add_argument('--case', choices=list(SIZES), help=argparse.SUPPRESS)
+    parser.add_argument('--result', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+    if args.case:
+        run_case(args)
+        return
+
+    databases = {'sqlite': f'sqlite:///{DB_PATH}'}
+    if args.postgres:
+        databases['postgresql'] = args.postgres
+    report = {
+        'meta': {
+            'commit': git_commit(),
+            'created_at': datetime.datetime.now().replace(microsecond=0).isoformat(),
+            'python': platform.python_version(),
+            'sqlalchemy': sqlalchemy.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'requests': args.requests,
+            'warmup': args.warmup,
+            'clients': args.clients,
+            'seed': args.seed,
+            'password_hash_method': app.config['PASSWORD_HASH_METHOD'],
+        },
+        'results': {},
+    }
+    result_path = os.path.join(tempfile.gettempdir(), 'echoboard_bench_case.json')
+    for database, url in databases.items():
+        for size in args.sizes:
+            print(f'{database} / {size}', flush=True)
+            subprocess.run([sys.executable, os.path.abspath(__file__), '--case', size,
+                            '--result', result_path, '--requests', str(args.requests),
+                            '--warmup', str(args.warmup), '--clients', str(args.clients),
+                            '--seed', str(args.seed)],
+                           env={**os.environ, 'DATABASE_URL': url}, check=True)
+            with open(result_path) as f:
+                result = json.load(f)
+            report['results'].setdefault(database, {})[size] = result
+            print(f"  {sum(result['rows'].values())} rows seeded in {result['seed_seconds']}s")
+            for name, stats in result['endpoints'].items():
+                print(f"  {name:<18} p50 {stats['latency_ms']['p50']:9.2f} ms"
+                      f"  p95 {stats['latency_ms']['p95']:9.2f} ms"
+                      f"  {stats['throughput_rps']:8.1f} req/s  {stats['queries']['mean']:5.1f} queries")
+    os.remove(result_path)
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+
+    # Sorted keys and one value per line keep `git diff --no-index` of two reports readable
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write('\n')
+    print('Report written to', args.output)
+
+
+if __name__ == '__main__':
+    main()
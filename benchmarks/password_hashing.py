@@ -0,0 +1,96 @@
+"""
+Benchmark of POST /api/login throughput with the password hashing service.
+Seeds a throwaway SQLite database with --users users and runs --logins logins from
+--clients concurrent threads, hashing inline and with process pools of several sizes.
+Reports logins per second and per core, then checks that a legacy hash is upgraded
+on the first login only.
+
+    $ python benchmarks/password_hashing.py [--users 20] [--logins 100] [--clients 8]
+"""
+import argparse
+import datetime
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DB_PATH = os.path.join(tempfile.gettempdir(), 'echoboard_bench_passwords.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{DB_PATH}'
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '../src'))
+
+from werkzeug.security import generate_password_hash  # noqa: E402
+from app import app  # noqa: E402
+from api.models import db, User  # noqa: E402
+from api.passwords import password_hasher  # noqa: E402
+
+PASSWORD = 'benchmark-password'
+
+
+def run_logins(users, logins, clients):
+    def login(number):
+        response = app.test_client().post('/api/login', json={
+            'email': f'bench{number % users}@example.com', 'password': PASSWORD})
+        assert response.status_code == 200, response.get_json()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        list(executor.map(login, range(logins)))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--logins', type=int, default=100)
+    parser.add_argument('--clients', type=int, default=8)
+    args = parser.parse_args()
+
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+
+    cores = os.cpu_count() or 1
+    method = app.config['PASSWORD_HASH_METHOD']
+    with app.app_context():
+        db.create_all()
+        now = datetime.datetime.now()
+        # One hash for everybody is enough, the cost of checking it is the same
+        password = generate_password_hash(PASSWORD, method=method)
+        db.session.execute(User.__table__.insert(), [{
+            'full_name': f'Bench User {i}', 'email': f'bench{i}@example.com', 'password': password,
+            'country': 'ES', 'created_at': now, 'is_active': True
+        } for i in range(args.users)])
+        db.session.commit()
+
+    print(f'POST /api/login, {method}, {args.logins} logins from {args.clients} clients, {cores} cores')
+    for workers in sorted({0, 1, 2, cores}):
+        password_hasher.shutdown()
+        app.config['PASSWORD_HASH_WORKERS'] = workers
+        if workers:
+            # Start the pool outside of the measure
+            password_hasher.hash('warm up')
+        elapsed = run_logins(args.users, args.logins, args.clients)
+        throughput = args.logins / elapsed
+        used_cores = min(workers or args.clients, cores)
+        label = f'pool of {workers}' if workers else 'inline'
+        print(f'  {label:>10}: {throughput:7.1f} logins/s, {throughput / used_cores:7.1f} per core')
+
+    with app.app_context():
+        legacy = User.query.filter_by(email='bench0@example.com').first()
+        legacy.password = generate_password_hash(PASSWORD, method='pbkdf2:sha256:260000')
+        db.session.commit()
+    client = app.test_client()
+    for attempt in ('first', 'second'):
+        start = time.perf_counter()
+        client.post('/api/login', json={'email': 'bench0@example.com', 'password': PASSWORD})
+        elapsed = (time.perf_counter() - start) * 1000
+        with app.app_context():
+            stored = User.query.filter_by(email='bench0@example.com').first().password
+        print(f'  legacy hash, {attempt} login: {elapsed:.1f} ms, stored as {stored.split("$")[0]}')
+
+    password_hasher.shutdown()
+    os.remove(DB_PATH)
+
+
+if __name__ == '__main__':
+    main()
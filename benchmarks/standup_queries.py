@@ -0,0 +1,84 @@
+"""
+Counts the SQL statements run by POST /api/ai/standup for a growing number of
+projects, with the Mistral call stubbed out. The count should stay the same
+whatever the number of projects and tasks.
+
+    $ python benchmarks/standup_queries.py [--sizes 10 100 1000] [--tasks-per-project 20]
+"""
+import argparse
+import datetime
+import os
+import sys
+import tempfile
+import time
+from unittest import mock
+
+DB_PATH = os.path.join(tempfile.gettempdir(), 'echoboard_bench_standup.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{DB_PATH}'
+os.environ.setdefault('MISTRAL_API_KEY', 'benchmark')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '../src'))
+
+from sqlalchemy import event  # noqa: E402
+from flask_jwt_extended import create_access_token  # noqa: E402
+from app import app  # noqa: E402
+from api.models import db, User, Project, Task, TaskStatus  # noqa: E402
+
+
+def fake_mistral_response(*args, **kwargs):
+    response = mock.Mock(status_code=200)
+    response.json.return_value = {'choices': [{'message': {'content': 'All good.'}}]}
+    return response
+
+
+def seed(num_projects, tasks_per_project):
+    now = datetime.datetime.now()
+    db.session.execute(User.__table__.insert(), [{
+        'full_name': 'Bench User', 'email': 'bench@example.com', 'password': 'x',
+        'country': 'ES', 'created_at': now, 'is_active': True
+    }])
+    db.session.execute(Project.__table__.insert(), [{
+        'title': f'Project {i}', 'created_at': now, 'due_date': now,
+        'status': 'in_progress', 'admin_id': 1
+    } for i in range(num_projects)])
+    statuses = [status.name for status in TaskStatus]
+    db.session.execute(Task.__table__.insert(), [{
+        'title': f'Task {i}', 'created_at': now, 'status': statuses[i % len(statuses)],
+        'author_id': 1, 'project_id': 1 + i % num_projects
+    } for i in range(num_projects * tasks_per_project)])
+    db.session.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--tasks-per-project', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f'POST /api/ai/standup ({args.tasks_per_project} tasks per project)')
+    for num_projects in args.sizes:
+        if os.path.exists(DB_PATH):
+            os.remove(DB_PATH)
+        with app.app_context():
+            db.create_all()
+            seed(num_projects, args.tasks_per_project)
+            token = create_access_token(identity='1')
+
+            statements = []
+            listener = lambda *a, **k: statements.append(1)  # noqa: E731
+            event.listen(db.engine, 'before_cursor_execute', listener)
+            with mock.patch('requests.Session.post', side_effect=fake_mistral_response):
+                start = time.perf_counter()
+                response = app.test_client().post(
+                    '/api/ai/standup', headers={'Authorization': f'Bearer {token}'})
+                elapsed = (time.perf_counter() - start) * 1000
+            event.remove(db.engine, 'before_cursor_execute', listener)
+            db.session.remove()
+            db.engine.dispose()
+
+        assert response.status_code == 200, response.get_json()
+        print(f'  {num_projects:>6} projects: {len(statements):>3} queries, {elapsed:8.2f} ms')
+    os.remove(DB_PATH)
+
+
+if __name__ == '__main__':
+    main()
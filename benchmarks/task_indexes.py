@@ -0,0 +1,99 @@
+"""
+Benchmark of GET /api/project/<id>/tasks with and without the indexes added in
+migration ea11837b7558. Seeds a throwaway SQLite database with 100k tasks, times
+the endpoint for the project admin and for a member, then drops the indexes
+and times it again.
+
+    $ python benchmarks/task_indexes.py [--tasks 100000] [--projects 100] [--runs 20]
+"""
+import argparse
+import datetime
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+DB_PATH = os.path.join(tempfile.gettempdir(), 'echoboard_bench_indexes.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{DB_PATH}'
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '../src'))
+
+from flask_jwt_extended import create_access_token  # noqa: E402
+from app import app  # noqa: E402
+from api.models import db, User, Project, Project_Member, Task, TaskStatus  # noqa: E402
+
+def seed(num_tasks, num_projects, num_users=50):
+    now = datetime.datetime.now()
+    db.session.execute(User.__table__.insert(), [{
+        'full_name': f'Bench User {i}', 'email': f'bench{i}@example.com', 'password': 'x',
+        'country': 'ES', 'created_at': now, 'is_active': True
+    } for i in range(num_users)])
+    db.session.execute(Project.__table__.insert(), [{
+        'title': f'Project {i}', 'created_at': now, 'due_date': now,
+        'status': 'in_progress', 'admin_id': 1
+    } for i in range(num_projects)])
+    db.session.execute(Project_Member.__table__.insert(), [
+        {'project_id': project_id, 'member_id': member_id}
+        for project_id in range(1, num_projects + 1)
+        for member_id in range(2, num_users + 1)
+    ])
+    statuses = [status.name for status in TaskStatus]
+    db.session.execute(Task.__table__.insert(), [{
+        'title': f'Task {i}', 'created_at': now, 'status': statuses[i % len(statuses)],
+        'author_id': 1 + i % num_users, 'project_id': 1 + i % num_projects,
+        'assigned_to_id': 1 + (i * 7) % num_users
+    } for i in range(num_tasks)])
+    db.session.commit()
+
+
+def time_endpoint(client, url, token, runs):
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        response = client.get(url, headers={'Authorization': f'Bearer {token}'})
+        timings.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200, response.get_json()
+    return statistics.median(timings)
+
+
+def drop_indexes():
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.drop(db.engine)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tasks', type=int, default=100000)
+    parser.add_argument('--projects', type=int, default=100)
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+
+    with app.app_context():
+        db.create_all()
+        seed(args.tasks, args.projects)
+        admin_token = create_access_token(identity='1')
+        member_token = create_access_token(identity='2')
+        client = app.test_client()
+        url = f'/api/project/{args.projects // 2}/tasks'
+
+        results = {}
+        for label in ('with indexes', 'without indexes'):
+            if label == 'without indexes':
+                drop_indexes()
+            results[label] = (
+                time_endpoint(client, url, admin_token, args.runs),
+                time_endpoint(client, url, member_token, args.runs),
+            )
+
+    print(f'GET {url} ({args.tasks} tasks, {args.projects} projects), median of {args.runs} runs')
+    for label, (admin_ms, member_ms) in results.items():
+        print(f'  {label:<16} admin: {admin_ms:8.2f} ms   member: {member_ms:8.2f} ms')
+    os.remove(DB_PATH)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+"""add project_change table
+
+Revision ID: 0d6f2b8e91a4
+Revises: e4c9a17f3b58
+Create Date: 2026-10-18 13:48:09.503127
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0d6f2b8e91a4'
+down_revision = 'e4c9a17f3b58'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('project_change',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('revision', sa.Integer(), nullable=False),
+    sa.Column('entity', sa.String(length=20), nullable=False),
+    sa.Column('entity_id', sa.Integer(), nullable=True),
+    sa.Column('action', sa.String(length=20), nullable=False),
+    sa.Column('data', sa.JSON(), nullable=True),
+    sa.Column('user_id', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['project.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_project_change_project_id_revision', 'project_change', ['project_id', 'revision'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_project_change_project_id_revision', table_name='project_change')
+    op.drop_table('project_change')
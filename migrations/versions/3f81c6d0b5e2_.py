@@ -0,0 +1,33 @@
+"""add ai_suggestion cache table
+
+Revision ID: 3f81c6d0b5e2
+Revises: 9a4e2b7c1d36
+Create Date: 2026-10-18 12:31:48.227609
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f81c6d0b5e2'
+down_revision = '9a4e2b7c1d36'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('ai_suggestion',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('cache_key', sa.String(length=64), nullable=False),
+    sa.Column('title', sa.String(length=120), nullable=False),
+    sa.Column('suggestion', sa.String(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('cache_key')
+    )
+
+
+def downgrade():
+    op.drop_table('ai_suggestion')
@@ -0,0 +1,24 @@
+"""add task index for keyset pagination
+
+Revision ID: 5c0d7e41f2a9
+Revises: ea11837b7558
+Create Date: 2026-10-18 11:02:17.540318
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c0d7e41f2a9'
+down_revision = 'ea11837b7558'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_task_project_id_created_at_id', 'task', ['project_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_task_project_id_created_at_id', table_name='task')
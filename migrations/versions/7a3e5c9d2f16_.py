@@ -0,0 +1,24 @@
+"""index restore_password expires_at
+
+Revision ID: 7a3e5c9d2f16
+Revises: 0d6f2b8e91a4
+Create Date: 2026-10-18 14:05:37.912046
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7a3e5c9d2f16'
+down_revision = '0d6f2b8e91a4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(op.f('ix_restore_password_expires_at'), 'restore_password', ['expires_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_restore_password_expires_at'), table_name='restore_password')
@@ -0,0 +1,38 @@
+"""add outbound_mail queue table
+
+Revision ID: 9a4e2b7c1d36
+Revises: 5c0d7e41f2a9
+Create Date: 2026-10-18 11:47:05.902114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9a4e2b7c1d36'
+down_revision = '5c0d7e41f2a9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('outbound_mail',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('recipients', sa.String(length=500), nullable=False),
+    sa.Column('subject', sa.String(length=200), nullable=False),
+    sa.Column('html', sa.String(), nullable=False),
+    sa.Column('status', sa.Enum('pending', 'failed', name='mailstatus'), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(), nullable=False),
+    sa.Column('last_error', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_outbound_mail_status_next_attempt_at', 'outbound_mail', ['status', 'next_attempt_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_outbound_mail_status_next_attempt_at', table_name='outbound_mail')
+    op.drop_table('outbound_mail')
+    sa.Enum(name='mailstatus').drop(op.get_bind(), checkfirst=True)
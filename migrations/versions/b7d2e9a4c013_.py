@@ -0,0 +1,33 @@
+"""add standup_summary table
+
+Revision ID: b7d2e9a4c013
+Revises: 3f81c6d0b5e2
+Create Date: 2026-10-18 13:05:22.649870
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d2e9a4c013'
+down_revision = '3f81c6d0b5e2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('standup_summary',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('fingerprint', sa.String(length=64), nullable=False),
+    sa.Column('summary', sa.String(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['project.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('project_id')
+    )
+
+
+def downgrade():
+    op.drop_table('standup_summary')
@@ -0,0 +1,24 @@
+"""index ai_suggestion expires_at
+
+Revision ID: c8e1f4a7d305
+Revises: 7a3e5c9d2f16
+Create Date: 2026-10-18 15:12:08.448213
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c8e1f4a7d305'
+down_revision = '7a3e5c9d2f16'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(op.f('ix_ai_suggestion_expires_at'), 'ai_suggestion', ['expires_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_ai_suggestion_expires_at'), table_name='ai_suggestion')
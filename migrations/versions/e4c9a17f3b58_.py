@@ -0,0 +1,26 @@
+"""add project revision
+
+Revision ID: e4c9a17f3b58
+Revises: b7d2e9a4c013
+Create Date: 2026-10-18 13:30:41.218764
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4c9a17f3b58'
+down_revision = 'b7d2e9a4c013'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('revision', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('project', schema=None) as batch_op:
+        batch_op.drop_column('revision')
@@ -0,0 +1,54 @@
+"""add indexes on foreign keys and hot lookup columns
+
+Revision ID: ea11837b7558
+Revises: 22b8eb451648
+Create Date: 2026-10-18 10:12:41.118202
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ea11837b7558'
+down_revision = '22b8eb451648'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Remove duplicated memberships before adding the unique index
+    op.execute(
+        'DELETE FROM project_member WHERE id NOT IN '
+        '(SELECT MIN(id) FROM project_member GROUP BY project_id, member_id)'
+    )
+
+    op.create_index(op.f('ix_project_admin_id'), 'project', ['admin_id'], unique=False)
+    op.create_index('ix_project_member_project_id_member_id', 'project_member', ['project_id', 'member_id'], unique=True)
+    op.create_index(op.f('ix_project_member_member_id'), 'project_member', ['member_id'], unique=False)
+    op.create_index(op.f('ix_task_author_id'), 'task', ['author_id'], unique=False)
+    op.create_index(op.f('ix_task_assigned_to_id'), 'task', ['assigned_to_id'], unique=False)
+    op.create_index('ix_task_project_id_assigned_to_id', 'task', ['project_id', 'assigned_to_id'], unique=False)
+    op.create_index('ix_task_project_id_author_id', 'task', ['project_id', 'author_id'], unique=False)
+    op.create_index(op.f('ix_comment_task_id'), 'comment', ['task_id'], unique=False)
+    op.create_index(op.f('ix_comment_author_id'), 'comment', ['author_id'], unique=False)
+    op.create_index(op.f('ix_role_user_id'), 'role', ['user_id'], unique=False)
+    op.create_index(op.f('ix_role_project_id'), 'role', ['project_id'], unique=False)
+    op.create_index(op.f('ix_tags_task_id'), 'tags', ['task_id'], unique=False)
+    op.create_index(op.f('ix_restore_password_user_mail'), 'restore_password', ['user_mail'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_restore_password_user_mail'), table_name='restore_password')
+    op.drop_index(op.f('ix_tags_task_id'), table_name='tags')
+    op.drop_index(op.f('ix_role_project_id'), table_name='role')
+    op.drop_index(op.f('ix_role_user_id'), table_name='role')
+    op.drop_index(op.f('ix_comment_author_id'), table_name='comment')
+    op.drop_index(op.f('ix_comment_task_id'), table_name='comment')
+    op.drop_index('ix_task_project_id_author_id', table_name='task')
+    op.drop_index('ix_task_project_id_assigned_to_id', table_name='task')
+    op.drop_index(op.f('ix_task_assigned_to_id'), table_name='task')
+    op.drop_index(op.f('ix_task_author_id'), table_name='task')
+    op.drop_index(op.f('ix_project_member_member_id'), table_name='project_member')
+    op.drop_index('ix_project_member_project_id_member_id', table_name='project_member')
+    op.drop_index(op.f('ix_project_admin_id'), table_name='project')
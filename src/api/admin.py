@@ -1,7 +1,7 @@
 
 import os
 from flask_admin import Admin
-from .models import db, User, Project, Task, Comment, Role, Project_Member, Tags, RestorePassword
+from .models import db, User, Project, Task, Comment, Role, Project_Member, Tags, RestorePassword, OutboundMail, AISuggestion, StandupSummary, ProjectChange
 from flask_admin.contrib.sqla import ModelView
 
 
@@ -47,6 +47,19 @@ class RestorePasswordModelView(ModelView):
     column_auto_select_related = True
     column_list = ['id', 'user_mail', 'uuid', 'expires_at']
 
+class OutboundMailModelView(ModelView):
+    column_list = ['id', 'recipients', 'subject', 'status', 'attempts', 'next_attempt_at', 'last_error', 'created_at']
+
+class AISuggestionModelView(ModelView):
+    column_list = ['id', 'title', 'suggestion', 'created_at', 'expires_at']
+
+class StandupSummaryModelView(ModelView):
+    column_auto_select_related = True
+    column_list = ['id', 'project_id', 'project', 'fingerprint', 'summary', 'updated_at']
+
+class ProjectChangeModelView(ModelView):
+    column_list = ['id', 'project_id', 'revision', 'entity', 'entity_id', 'action', 'user_id', 'created_at']
+
 def setup_admin(app):
     app.secret_key = os.environ.get('FLASK_APP_KEY', 'sample key')
     app.config['FLASK_ADMIN_SWATCH'] = 'cerulean'
@@ -61,6 +74,10 @@ def setup_admin(app):
     admin.add_view(ProjectMemberModelView(Project_Member, db.session))
     admin.add_view(TagsModelView(Tags, db.session))
     admin.add_view(RestorePasswordModelView(RestorePassword, db.session))
+    admin.add_view(OutboundMailModelView(OutboundMail, db.session))
+    admin.add_view(AISuggestionModelView(AISuggestion, db.session))
+    admin.add_view(StandupSummaryModelView(StandupSummary, db.session))
+    admin.add_view(ProjectChangeModelView(ProjectChange, db.session))
 
     # You can duplicate that line to add mew models
     # admin.add_view(ModelView(YourModelName, db.session))
@@ -0,0 +1,133 @@
+"""
+Cache for AI task description suggestions.
+Suggestions are keyed on the normalized task title plus model and temperature, so
+"Fix login bug", "fix  login bug." and "FIX LOGIN BUG" only reach the LLM once.
+Lookups go to an in-process LRU/TTL cache first and then, when AI_SUGGESTION_CACHE_DB
+is enabled, to the ai_suggestion table, which survives restarts and is shared by
+all gunicorn workers. Expired rows are purged a few at a time on every write and in
+bulk by the maintenance job (api/maintenance.py). A failing table only costs a miss.
+"""
+
+import re
+import hashlib
+import datetime
+import threading
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from api.models import db, AISuggestion
+from api.utils import TTLCache
+from api.maintenance import delete_expired
+
+
+def normalize_title(title):
+    title = re.sub(r'\s+', ' ', title.strip().lower())
+    return title.rstrip('.!?;:, ')
+
+
+class SuggestionCache:
+    def __init__(self, app=None):
+        self.app = None
+        self.memory = None
+        self.stats = {'memory_hits': 0, 'db_hits': 0, 'misses': 0}
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('AI_SUGGESTION_CACHE_TTL', 24 * 60 * 60)
+        app.config.setdefault('AI_SUGGESTION_CACHE_SIZE', 1024)
+        app.config.setdefault('AI_SUGGESTION_CACHE_DB', True)
+        # Expired rows deleted by each write to the table
+        app.config.setdefault('AI_SUGGESTION_CACHE_PURGE_BATCH', 100)
+        self.app = app
+        self.memory = TTLCache(
+            ttl=app.config['AI_SUGGESTION_CACHE_TTL'], maxsize=app.config['AI_SUGGESTION_CACHE_SIZE'])
+
+    def key(self, title, model, temperature):
+        raw = f'{model}|{temperature}|{normalize_title(title)}'
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _count(self, stat):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def get(self, title, model, temperature):
+        cache_key = self.key(title, model, temperature)
+        suggestion = self.memory.get(cache_key)
+        if suggestion is not None:
+            self._count('memory_hits')
+            return suggestion
+
+        if self.app.config['AI_SUGGESTION_CACHE_DB']:
+            now = datetime.datetime.now()
+            try:
+                cached = AISuggestion.query.filter(
+                    AISuggestion.cache_key == cache_key,
+                    AISuggestion.expires_at > now
+                ).first()
+            except SQLAlchemyError as e:
+                # The cache is an optimization, a broken table must not break the endpoint
+                db.session.rollback()
+                print("Suggestion cache error:", e)
+                cached = None
+            if cached:
+                self._count('db_hits')
+                # Only for what is left of the row lifetime, not a fresh TTL
+                self.memory.set(cache_key, cached.suggestion,
+                                ttl=(cached.expires_at - now).total_seconds())
+                return cached.suggestion
+
+        self._count('misses')
+        return None
+
+    def set(self, title, model, temperature, suggestion):
+        if not suggestion or not suggestion.strip():
+            # An empty completion is a provider hiccup, caching it would serve it for a whole TTL
+            return
+        cache_key = self.key(title, model, temperature)
+        self.memory.set(cache_key, suggestion)
+        if not self.app.config['AI_SUGGESTION_CACHE_DB']:
+            return
+
+        now = datetime.datetime.now()
+        expires_at = now + datetime.timedelta(seconds=self.app.config['AI_SUGGESTION_CACHE_TTL'])
+        try:
+            cached = AISuggestion.query.filter_by(cache_key=cache_key).first()
+            if cached:
+                cached.suggestion = suggestion
+                cached.created_at = now
+                cached.expires_at = expires_at
+            else:
+                db.session.add(AISuggestion(
+                    cache_key=cache_key,
+                    title=title.strip()[:120],
+                    suggestion=suggestion,
+                    created_at=now,
+                    expires_at=expires_at
+                ))
+            db.session.commit()
+        except IntegrityError:
+            # Another worker stored the same title first
+            db.session.rollback()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            print("Suggestion cache error:", e)
+            return
+
+        try:
+            # Every write purges a few expired rows, so the table stays bounded
+            # even when nobody runs the maintenance job
+            delete_expired(AISuggestion, self.app.config['AI_SUGGESTION_CACHE_PURGE_BATCH'],
+                           now=now, max_batches=1)
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            print("Suggestion cache error:", e)
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats['memory_hits'] + stats['db_hits'] + stats['misses']
+        stats['hit_rate'] = round((lookups - stats['misses']) / lookups, 3) if lookups else None
+        return stats
+
+
+suggestion_cache = SuggestionCache()
@@ -0,0 +1,201 @@
+"""
+Shared HTTP client for the Mistral AI endpoints.
+- One pooled requests.Session per worker process, so calls reuse keep-alive TLS connections.
+- Connect and read timeouts, a hung provider can not pin a worker forever.
+- Bounded retries with exponential backoff and jitter for network errors, 429 and 5xx.
+- A circuit breaker: after AI_BREAKER_THRESHOLD consecutive failures calls fail fast
+  for AI_BREAKER_COOLDOWN seconds, then a single trial call decides if it closes again.
+- chat_stream() yields the completion token by token (Mistral "stream": true, server-sent events).
+"""
+
+import os
+import json
+import time
+import random
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from api.utils import PerProcess
+
+
+class AIServiceError(Exception):
+    def __init__(self, message, status_code=500, detail=None):
+        super().__init__(message)
+        self.message = message
+        self.status_code = status_code
+        self.detail = detail
+
+
+class CircuitOpenError(AIServiceError):
+    def __init__(self):
+        super().__init__('AI provider unavailable, try again later', status_code=503)
+
+
+class CircuitBreaker:
+    def __init__(self, threshold=5, cooldown=30):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.cooldown or self._trial_running:
+                return False
+            # Half open: let a single call through to probe the provider
+            self._trial_running = True
+            return True
+
+    def success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_running = False
+
+    def failure(self):
+        with self._lock:
+            self.failures += 1
+            self._trial_running = False
+            if self.opened_at is not None or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+class MistralClient:
+    RETRY_STATUS = (429, 500, 502, 503, 504)
+
+    def __init__(self, app=None):
+        self.app = None
+        self.breaker = None
+        self._session = PerProcess(self._new_session)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('MISTRAL_API_KEY', os.getenv('MISTRAL_API_KEY'))
+        app.config.setdefault('MISTRAL_API_URL', 'https://api.mistral.ai/v1/chat/completions')
+        app.config.setdefault('AI_CONNECT_TIMEOUT', 3.05)
+        app.config.setdefault('AI_READ_TIMEOUT', 30)
+        app.config.setdefault('AI_MAX_RETRIES', 2)
+        app.config.setdefault('AI_RETRY_BACKOFF', 0.5)
+        app.config.setdefault('AI_POOL_SIZE', 10)
+        app.config.setdefault('AI_BREAKER_THRESHOLD', 5)
+        app.config.setdefault('AI_BREAKER_COOLDOWN', 30)
+        self.app = app
+        self.breaker = CircuitBreaker(
+            app.config['AI_BREAKER_THRESHOLD'], app.config['AI_BREAKER_COOLDOWN'])
+
+    @property
+    def api_key(self):
+        return self.app.config['MISTRAL_API_KEY']
+
+    @property
+    def session(self):
+        return self._session.get()
+
+    def _new_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.app.config['AI_POOL_SIZE'])
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def _backoff(self, attempt):
+        base = self.app.config['AI_RETRY_BACKOFF'] * 2 ** attempt
+        return base + random.uniform(0, base)
+
+    def post(self, payload, stream=False):
+        """ POSTs a chat completion payload, returns the requests.Response (status 200) """
+        if not self.breaker.allow():
+            raise CircuitOpenError()
+
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+        timeout = (self.app.config['AI_CONNECT_TIMEOUT'], self.app.config['AI_READ_TIMEOUT'])
+        max_retries = self.app.config['AI_MAX_RETRIES']
+
+        healthy = False
+        try:
+            for attempt in range(max_retries + 1):
+                try:
+                    response = self.session.post(
+                        self.app.config['MISTRAL_API_URL'],
+                        headers=headers,
+                        json=payload,
+                        timeout=timeout,
+                        stream=stream
+                    )
+                except requests.RequestException as e:
+                    error = AIServiceError('AI provider request failed', 502, str(e))
+                else:
+                    if response.status_code == 200:
+                        healthy = True
+                        return response
+                    error = AIServiceError('AI provider returned an error', 502, response.text)
+                    response.close()
+                    if response.status_code not in self.RETRY_STATUS:
+                        # Client errors (bad key, bad payload) will not get better with retries
+                        # and say nothing about the provider health
+                        healthy = True
+                        raise error
+
+                if attempt < max_retries:
+                    time.sleep(self._backoff(attempt))
+            raise error
+        finally:
+            # Whatever happened the breaker hears about it, a half-open trial that is
+            # never settled would keep the circuit open until the process restarts
+            if healthy:
+                self.breaker.success()
+            else:
+                self.breaker.failure()
+
+    def chat(self, messages, max_tokens, temperature, model="mistral-tiny"):
+        """ Returns the text of the first completion choice """
+        payload = {
+            "model": model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature
+        }
+        response = self.post(payload)
+        try:
+            return response.json()["choices"][0]["message"]["content"].strip()
+        except (ValueError, KeyError, IndexError) as e:
+            raise AIServiceError('Unexpected AI provider response', 502, str(e))
+
+    def chat_stream(self, messages, max_tokens, temperature, model="mistral-tiny"):
+        """ Yields the text of the first completion choice as the provider generates it """
+        payload = {
+            "model": model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "stream": True
+        }
+        response = self.post(payload, stream=True)
+        try:
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith('data:'):
+                    continue
+                data = line[len('data:'):].strip()
+                if data == '[DONE]':
+                    break
+                token = json.loads(data)["choices"][0]["delta"].get("content")
+                if token:
+                    yield token
+        except requests.RequestException as e:
+            self.breaker.failure()
+            raise AIServiceError('AI provider request failed', 502, str(e))
+        except (ValueError, KeyError, IndexError) as e:
+            raise AIServiceError('Unexpected AI provider response', 502, str(e))
+        finally:
+            response.close()
+
+
+ai_client = MistralClient()
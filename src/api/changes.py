@@ -0,0 +1,126 @@
+"""
+Change feed of a project.
+Every write to a project, its members or its tasks bumps Project.revision and stores what
+changed in the project_change table under the new revision, in the same transaction.
+A client that knows revision N asks GET /api/project/<id>/changes?since=N for the deltas
+instead of reloading the project; the same revision backs the ETags of the project endpoints.
+
+Each change has an entity ('project', 'member', 'task', 'tasks' or 'user'), the entity id,
+an action ('created', 'updated', 'deleted', 'added', 'removed' or 'imported') and data:
+the new state of the entity (its plain columns, no relationships) or None when it is gone.
+"""
+
+import datetime
+from sqlalchemy import insert, update, select, literal, JSON
+from api.models import db, Project, ProjectChange, Task
+from api.queries import bump_project_revision, user_project_ids_query, get_user_project_revisions
+
+TASK_COLUMNS = (Task.id, Task.title, Task.description, Task.status,
+                Task.created_at, Task.author_id, Task.assigned_to_id)
+
+
+def task_state(task):
+    """ Change data of a task: a Task or a row with the TASK_COLUMNS """
+    return {
+        'id': task.id,
+        'title': task.title,
+        'description': task.description,
+        'status': task.status.value,
+        'created_at': task.created_at.isoformat() if task.created_at else None,
+        'author_id': task.author_id,
+        'assigned_to_id': task.assigned_to_id,
+    }
+
+
+def project_state(project):
+    return {
+        'id': project.id,
+        'title': project.title,
+        'description': project.description,
+        'project_picture_url': project.project_picture_url,
+        'due_date': project.due_date.isoformat() if project.due_date else None,
+        'status': project.status.value,
+    }
+
+
+def change(entity, entity_id, action, data=None):
+    return {'entity': entity, 'entity_id': entity_id, 'action': action, 'data': data}
+
+
+def record_changes(project_id, changes, user_id=None):
+    """
+    Bumps the project revision and stores the changes under it with one UPDATE ... RETURNING
+    and one bulk INSERT. Does not commit. Returns the new revision.
+    """
+    revision = db.session.execute(
+        update(Project).where(Project.id == project_id).values(
+            revision=Project.revision + 1).returning(Project.revision)
+    ).scalar()
+    now = datetime.datetime.now()
+    if changes:
+        db.session.execute(insert(ProjectChange.__table__), [{
+            'project_id': project_id,
+            'revision': revision,
+            'user_id': user_id,
+            'created_at': now,
+            **entry
+        } for entry in changes])
+        # Published to live subscribers once the transaction commits (see api/notifications.py)
+        db.session.info.setdefault('pending_notifications', []).append((project_id, revision, [{
+            'revision': revision,
+            **entry,
+            'user_id': user_id,
+            'created_at': now.isoformat()
+        } for entry in changes]))
+    return revision
+
+
+def record_user_change(user_id, action, data=None):
+    """
+    A change of a user shows in every project the user takes part in: one UPDATE bumps all
+    their revisions, one INSERT ... SELECT stores the change for each of them and one SELECT
+    reads the new revisions for the live notifications. Does not commit.
+    """
+    project_ids = user_project_ids_query(user_id)
+    now = datetime.datetime.now()
+    bump_project_revision(project_ids)
+    db.session.execute(insert(ProjectChange.__table__).from_select(
+        ['project_id', 'revision', 'entity', 'entity_id', 'action', 'data', 'user_id', 'created_at'],
+        select(
+            Project.id,
+            Project.revision,
+            literal('user'),
+            literal(user_id),
+            literal(action),
+            literal(data, JSON),
+            literal(user_id),
+            literal(now),
+        ).where(Project.id.in_(project_ids))
+    ))
+    # Published like record_changes does, with the new revision of each project
+    entry = {**change('user', user_id, action, data), 'user_id': user_id, 'created_at': now.isoformat()}
+    db.session.info.setdefault('pending_notifications', []).extend(
+        (project_id, revision, [{'revision': revision, **entry}])
+        for project_id, revision in get_user_project_revisions(user_id))
+
+
+def get_changes(project_id, since, limit=100):
+    """
+    Changes after revision `since`, grouped in whole revisions: at most `limit` revisions,
+    all the changes of each. Returns (changes, last_revision, has_more).
+    """
+    revisions = db.session.query(ProjectChange.revision).filter(
+        ProjectChange.project_id == project_id,
+        ProjectChange.revision > since
+    ).distinct().order_by(ProjectChange.revision).limit(limit + 1).all()
+    if not revisions:
+        return [], since, False
+
+    has_more = len(revisions) > limit
+    last_revision = revisions[:limit][-1][0]
+    changes = ProjectChange.query.filter(
+        ProjectChange.project_id == project_id,
+        ProjectChange.revision > since,
+        ProjectChange.revision <= last_revision
+    ).order_by(ProjectChange.revision, ProjectChange.id).all()
+    return changes, last_revision, has_more
@@ -1,6 +1,12 @@
 
+import time
+import datetime
 import click
 from api.models import db, User
+from api.passwords import password_hasher
+from api.seed import seed_data
+from api.mail_queue import mail_queue
+from api.maintenance import delete_expired_restore_passwords, delete_expired_suggestions
 
 """
 In this file, you can add as many commands as you want using the @app.cli.command decorator
@@ -12,23 +18,72 @@ def setup_commands(app):
     """ 
     This is an example command "insert-test-users" that you can run from the command line
     by typing: $ flask insert-test-users 5
-    Note: 5 is the number of users to add
+    Note: 5 is the number of users to add, all with the password 123456
     """
     @app.cli.command("insert-test-users") # name of our command
     @click.argument("count") # argument of out command
     def insert_test_users(count):
         print("Creating test users")
-        for x in range(1, int(count) + 1):
-            user = User()
-            user.email = "test_user" + str(x) + "@test.com"
-            user.password = "123456"
-            user.is_active = True
-            db.session.add(user)
-            db.session.commit()
-            print("User: ", user.email, " created.")
-
+        # One hash for everybody and a single INSERT, hashing per user would take most of the time
+        password = password_hasher.hash("123456")
+        now = datetime.datetime.now()
+        db.session.execute(User.__table__.insert(), [{
+            "full_name": "Test User " + str(x),
+            "email": "test_user" + str(x) + "@test.com",
+            "password": password,
+            "country": "ES",
+            "created_at": now,
+            "is_active": True,
+        } for x in range(1, int(count) + 1)])
+        db.session.commit()
         print("All test users created")
 
+    """
+    Fills the database with realistic data for development and benchmarks, e.g. a dataset of
+    about a million rows: $ flask insert-test-data --users 10000 --projects 2000 --tasks 200
+    The same --seed always generates the same data. Every user has the password 123456
+    """
     @app.cli.command("insert-test-data")
-    def insert_test_data():
-        pass
\ No newline at end of file
+    @click.option("--users", default=1000, show_default=True, help="Number of users")
+    @click.option("--projects", default=200, show_default=True, help="Number of projects")
+    @click.option("--members", default=5, show_default=True, help="Mean members per project")
+    @click.option("--tasks", default=50, show_default=True, help="Mean tasks per project")
+    @click.option("--comments", default=1.0, show_default=True, help="Mean comments per task")
+    @click.option("--tags", default=1.0, show_default=True, help="Mean tags per task")
+    @click.option("--seed", default=42, show_default=True, help="Random seed")
+    @click.option("--batch-size", default=5000, show_default=True, help="Rows per INSERT")
+    def insert_test_data(users, projects, members, tasks, comments, tags, seed, batch_size):
+        start = time.perf_counter()
+        counts = seed_data(users=users, projects=projects, members_per_project=members,
+                           tasks_per_project=tasks, comments_per_task=comments, tags_per_task=tags,
+                           seed=seed, password_hash=password_hasher.hash("123456"),
+                           batch_size=batch_size)
+        for table, rows in counts.items():
+            print(f"{table}: {rows} rows")
+        print(f"Inserted {sum(counts.values())} rows in {time.perf_counter() - start:.1f}s")
+
+    """
+    Delivers the queued emails (outbound_mail table) and exits, useful as a cronjob
+    when the background mail threads are disabled with MAIL_QUEUE_ASYNC=0
+    """
+    @app.cli.command("send-queued-mail")
+    def send_queued_mail():
+        total = 0
+        while True:
+            processed = mail_queue.send_pending()
+            if not processed:
+                break
+            total += processed
+        print("Processed", total, "queued emails")
+
+    """
+    Deletes the expired password reset tokens and cached AI suggestions in batches and
+    reports how many were removed, meant for a cronjob: $ flask delete-expired-tokens --batch-size 1000
+    """
+    @app.cli.command("delete-expired-tokens")
+    @click.option("--batch-size", default=1000, show_default=True, help="Rows per DELETE")
+    def delete_expired_tokens(batch_size):
+        deleted, batches = delete_expired_restore_passwords(batch_size)
+        print("Deleted", deleted, "expired password reset tokens in", batches, "batches")
+        deleted, batches = delete_expired_suggestions(batch_size)
+        print("Deleted", deleted, "expired AI suggestions in", batches, "batches")
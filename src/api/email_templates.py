@@ -0,0 +1,40 @@
+"""
+Email templates (src/api/templates/emails) are compiled once when the app starts
+and kept in memory, so sending an email does not read anything from disk.
+Compiled bytecode is also cached on disk to speed up the start of every gunicorn worker.
+In development (auto_reload) templates are recompiled when the file changes.
+"""
+
+import os
+import tempfile
+from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache, select_autoescape
+
+
+class EmailTemplates:
+    def __init__(self, app=None, template_dir=None):
+        self.env = None
+        if app is not None:
+            self.init_app(app, template_dir)
+
+    def init_app(self, app, template_dir):
+        app.config.setdefault('EMAIL_TEMPLATES_AUTO_RELOAD', app.debug)
+        app.config.setdefault('EMAIL_TEMPLATES_BYTECODE_DIR', os.path.join(
+            tempfile.gettempdir(), 'echoboard-email-templates'))
+
+        bytecode_dir = app.config['EMAIL_TEMPLATES_BYTECODE_DIR']
+        os.makedirs(bytecode_dir, exist_ok=True)
+        self.env = Environment(
+            loader=FileSystemLoader(template_dir),
+            autoescape=select_autoescape(['html']),
+            auto_reload=app.config['EMAIL_TEMPLATES_AUTO_RELOAD'],
+            bytecode_cache=FileSystemBytecodeCache(bytecode_dir)
+        )
+        # Compile every template now instead of on the first request
+        for name in self.env.list_templates(extensions=['html']):
+            self.env.get_template(name)
+
+    def render(self, name, **context):
+        return self.env.get_template(name).render(**context)
+
+
+email_templates = EmailTemplates()
@@ -0,0 +1,141 @@
+"""
+Outbound mail queue.
+Endpoints call mail_queue.enqueue(...) which only inserts a row in the outbound_mail table,
+so a slow or failing SMTP server never blocks a request. A background thread in each worker
+process delivers pending rows in batches over a single SMTP connection, and failed deliveries
+are retried with exponential backoff until MAIL_QUEUE_MAX_ATTEMPTS is reached.
+The queue can also be drained from the command line with: $ flask send-queued-mail
+"""
+
+import datetime
+import threading
+from flask_mail import Message
+from api.models import db, OutboundMail, MailStatus
+from api.utils import PerProcess
+
+
+class MailQueue:
+    def __init__(self, app=None, mail=None):
+        self.app = None
+        self.mail = None
+        self._wakeup = threading.Event()
+        self._workers = PerProcess(
+            self._start_workers, lambda threads: all(thread.is_alive() for thread in threads))
+        if app is not None:
+            self.init_app(app, mail)
+
+    def init_app(self, app, mail):
+        app.config.setdefault('MAIL_QUEUE_ASYNC', True)
+        app.config.setdefault('MAIL_QUEUE_WORKERS', 1)
+        app.config.setdefault('MAIL_QUEUE_BATCH_SIZE', 20)
+        app.config.setdefault('MAIL_QUEUE_MAX_ATTEMPTS', 5)
+        app.config.setdefault('MAIL_QUEUE_RETRY_SECONDS', 30)
+        app.config.setdefault('MAIL_QUEUE_POLL_SECONDS', 60)
+        # A claimed mail that is not sent within this time is picked up again (e.g. worker killed)
+        app.config.setdefault('MAIL_QUEUE_LEASE_SECONDS', 300)
+        self.app = app
+        self.mail = mail
+
+    def enqueue(self, subject, recipients, html, commit=True):
+        now = datetime.datetime.now()
+        outbound_mail = OutboundMail(
+            recipients=','.join(recipients),
+            subject=subject,
+            html=html,
+            status=MailStatus.pending,
+            attempts=0,
+            next_attempt_at=now,
+            created_at=now
+        )
+        db.session.add(outbound_mail)
+        if commit:
+            db.session.commit()
+        if self.app.config['MAIL_QUEUE_ASYNC']:
+            self._workers.get()
+            self._wakeup.set()
+        return outbound_mail
+
+    def _start_workers(self):
+        threads = []
+        for number in range(self.app.config['MAIL_QUEUE_WORKERS']):
+            thread = threading.Thread(
+                target=self._worker, name=f'mail-queue-{number}', daemon=True)
+            thread.start()
+            threads.append(thread)
+        return threads
+
+    def _worker(self):
+        while True:
+            self._wakeup.wait(self.app.config['MAIL_QUEUE_POLL_SECONDS'])
+            self._wakeup.clear()
+            try:
+                with self.app.app_context():
+                    while self.send_pending() > 0:
+                        pass
+            except Exception as e:
+                print("Mail queue error:", e)
+
+    def _claim(self, now):
+        # Claiming moves next_attempt_at forward, so other threads or processes skip the row
+        lease_until = now + datetime.timedelta(seconds=self.app.config['MAIL_QUEUE_LEASE_SECONDS'])
+        candidates = db.session.query(OutboundMail.id).filter(
+            OutboundMail.status == MailStatus.pending,
+            OutboundMail.next_attempt_at <= now
+        ).order_by(OutboundMail.next_attempt_at).limit(self.app.config['MAIL_QUEUE_BATCH_SIZE']).all()
+
+        claimed_ids = []
+        for (mail_id,) in candidates:
+            updated = OutboundMail.query.filter(
+                OutboundMail.id == mail_id,
+                OutboundMail.status == MailStatus.pending,
+                OutboundMail.next_attempt_at <= now
+            ).update({
+                OutboundMail.next_attempt_at: lease_until,
+                OutboundMail.attempts: OutboundMail.attempts + 1
+            }, synchronize_session=False)
+            if updated:
+                claimed_ids.append(mail_id)
+        db.session.commit()
+        if not claimed_ids:
+            return []
+        return OutboundMail.query.filter(OutboundMail.id.in_(claimed_ids)).all()
+
+    def _failed(self, outbound_mail, error, now):
+        outbound_mail.last_error = str(error)[:1000]
+        if outbound_mail.attempts >= self.app.config['MAIL_QUEUE_MAX_ATTEMPTS']:
+            outbound_mail.status = MailStatus.failed
+        else:
+            delay = self.app.config['MAIL_QUEUE_RETRY_SECONDS'] * 2 ** (outbound_mail.attempts - 1)
+            outbound_mail.next_attempt_at = now + datetime.timedelta(seconds=delay)
+
+    def send_pending(self, now=None):
+        """ Sends one batch of due mails over a single SMTP connection, returns how many were processed """
+        now = now or datetime.datetime.now()
+        batch = self._claim(now)
+        if not batch:
+            return 0
+
+        try:
+            with self.mail.connect() as connection:
+                for outbound_mail in batch:
+                    msg = Message(
+                        subject=outbound_mail.subject,
+                        recipients=outbound_mail.recipients.split(','),
+                    )
+                    msg.html = outbound_mail.html
+                    try:
+                        connection.send(msg)
+                        db.session.delete(outbound_mail)
+                    except Exception as e:
+                        self._failed(outbound_mail, e, now)
+        except Exception as e:
+            # Could not open the connection: the whole batch is retried later
+            for outbound_mail in batch:
+                if outbound_mail not in db.session.deleted:
+                    self._failed(outbound_mail, e, now)
+
+        db.session.commit()
+        return len(batch)
+
+
+mail_queue = MailQueue()
@@ -0,0 +1,92 @@
+"""
+Periodic cleanup jobs.
+Expired password reset tokens and cached AI suggestions are deleted in batches of
+MAINTENANCE_BATCH_SIZE rows, each batch in its own short transaction, so a large backlog
+never locks the table for long.
+Run it from cron with $ flask delete-expired-tokens, or let every worker do it in a
+background thread every MAINTENANCE_INTERVAL_SECONDS (0, the default, disables the thread).
+"""
+
+import time
+import random
+import datetime
+import threading
+from api.models import db, RestorePassword, AISuggestion
+from api.utils import PerProcess
+
+
+def delete_expired(model, batch_size=1000, now=None, max_batches=None):
+    """ Deletes the rows of a model with an expires_at in the past, returns (deleted, batches) """
+    now = now or datetime.datetime.now()
+    deleted = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        # Ids first: DELETE ... LIMIT is not portable, the id list bounds each statement
+        expired_ids = [row_id for (row_id,) in db.session.query(model.id).filter(
+            model.expires_at < now
+        ).order_by(model.expires_at).limit(batch_size).all()]
+        if not expired_ids:
+            break
+        deleted += model.query.filter(
+            model.id.in_(expired_ids)
+        ).delete(synchronize_session=False)
+        db.session.commit()
+        batches += 1
+        if len(expired_ids) < batch_size:
+            break
+    return deleted, batches
+
+
+def delete_expired_restore_passwords(batch_size=1000, now=None):
+    return delete_expired(RestorePassword, batch_size, now)
+
+
+def delete_expired_suggestions(batch_size=1000, now=None):
+    return delete_expired(AISuggestion, batch_size, now)
+
+
+class MaintenanceScheduler:
+    def __init__(self, app=None):
+        self.app = None
+        self._thread = PerProcess(self._start_thread, threading.Thread.is_alive)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('MAINTENANCE_INTERVAL_SECONDS', 0)
+        app.config.setdefault('MAINTENANCE_BATCH_SIZE', 1000)
+        self.app = app
+        if app.config['MAINTENANCE_INTERVAL_SECONDS']:
+            app.before_request(self._ensure_thread)
+
+    def _ensure_thread(self):
+        self._thread.get()
+
+    def _start_thread(self):
+        thread = threading.Thread(target=self._worker, name='maintenance', daemon=True)
+        thread.start()
+        return thread
+
+    def run(self):
+        """ Runs every job once, returns {job: (deleted, batches)} """
+        batch_size = self.app.config['MAINTENANCE_BATCH_SIZE']
+        return {
+            'restore_password': delete_expired_restore_passwords(batch_size),
+            'ai_suggestion': delete_expired_suggestions(batch_size),
+        }
+
+    def _worker(self):
+        interval = self.app.config['MAINTENANCE_INTERVAL_SECONDS']
+        while True:
+            # Jitter keeps the workers from all cleaning up at the same moment
+            time.sleep(interval * random.uniform(0.9, 1.1))
+            try:
+                with self.app.app_context():
+                    for job, (deleted, batches) in self.run().items():
+                        if deleted:
+                            print(f"Maintenance: deleted {deleted} expired {job} rows in {batches} batches")
+            except Exception as e:
+                print("Maintenance error:", e)
+
+
+maintenance = MaintenanceScheduler()
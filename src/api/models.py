@@ -1,5 +1,5 @@
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import String, Boolean, Integer, DateTime, Enum, ForeignKey
+from sqlalchemy import String, Boolean, Integer, DateTime, Enum, ForeignKey, Index, JSON
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 import enum
 
@@ -26,6 +26,11 @@ class RoleType(enum.Enum):
     admin = "admin"
     member = "member"
 
+
+class MailStatus(enum.Enum):
+    pending = "pending"
+    failed = "failed"
+
 # --- USER MODEL ---
 
 
@@ -92,7 +97,10 @@ class Project(db.Model):
     due_date: Mapped[DateTime] = mapped_column(DateTime, nullable=False)
     status: Mapped[ProjectStatus] = mapped_column(
         Enum(ProjectStatus), nullable=False, default=ProjectStatus.in_progress)
-    admin_id: Mapped[int] = mapped_column(ForeignKey('user.id'))
+    admin_id: Mapped[int] = mapped_column(ForeignKey('user.id'), index=True)
+    # Bumped on every change to the project, its members or its tasks (see bump_project_revision)
+    revision: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default='0')
     admin: Mapped[User] = relationship(back_populates='admin_of')
     members: Mapped[list['Project_Member']] = relationship(
         back_populates='project', cascade='all, delete-orphan')
@@ -100,6 +108,10 @@ class Project(db.Model):
         back_populates='project', cascade='all, delete-orphan')
     roles: Mapped[list['Role']] = relationship(
         back_populates='project', cascade='all, delete-orphan')
+    standup_summary: Mapped['StandupSummary'] = relationship(
+        back_populates='project', cascade='all, delete-orphan')
+    changes: Mapped[list['ProjectChange']] = relationship(
+        back_populates='project', cascade='all, delete-orphan')
 
     def __str__(self):
         return f'Project {self.title}'
@@ -120,13 +132,37 @@ class Project(db.Model):
             'tasks': [task.serialize() for task in self.tasks]
         }
 
+    def serialize_summary(self, task_counts=None, members_count=0):
+        # Lightweight version for project lists: counts instead of tasks and members
+        task_counts = task_counts or {}
+        return {
+            'id': self.id,
+            'title': self.title,
+            'description': self.description,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'project_picture_url': self.project_picture_url,
+            'due_date': self.due_date.isoformat() if self.due_date else None,
+            'status': self.status.value,
+            'admin_id': self.admin_id,
+            'admin_profile_picture_url': self.admin.profile_picture_url if self.admin else None,
+            'admin_full_name': self.admin.full_name if self.admin else None,
+            'members_count': members_count,
+            'tasks_count': sum(task_counts.values()),
+            'tasks_by_status': {status.value: task_counts.get(status, 0) for status in TaskStatus}
+        }
+
 # --- PROJECT_MEMBER MODEL ---
 
 
 class Project_Member(db.Model):
     __tablename__ = 'project_member'
+    __table_args__ = (
+        # One membership per user and project; also serves lookups by project_id
+        Index('ix_project_member_project_id_member_id',
+              'project_id', 'member_id', unique=True),
+    )
     id: Mapped[int] = mapped_column(primary_key=True)
-    member_id: Mapped[int] = mapped_column(ForeignKey('user.id'))
+    member_id: Mapped[int] = mapped_column(ForeignKey('user.id'), index=True)
     project_id: Mapped[int] = mapped_column(ForeignKey('project.id'))
     member: Mapped[User] = relationship(back_populates='member_of')
     project: Mapped[Project] = relationship(back_populates='members')
@@ -148,6 +184,13 @@ class Project_Member(db.Model):
 
 class Task(db.Model):
     __tablename__ = 'task'
+    __table_args__ = (
+        # Project task lists filter by project and by assignee or author
+        Index('ix_task_project_id_assigned_to_id', 'project_id', 'assigned_to_id'),
+        Index('ix_task_project_id_author_id', 'project_id', 'author_id'),
+        # Keyset pagination of a project's tasks by (created_at, id)
+        Index('ix_task_project_id_created_at_id', 'project_id', 'created_at', 'id'),
+    )
     id: Mapped[int] = mapped_column(primary_key=True)
     title: Mapped[str] = mapped_column(String(120), nullable=False)
     description: Mapped[str] = mapped_column(String, nullable=True)
@@ -155,13 +198,13 @@ class Task(db.Model):
     status: Mapped[TaskStatus] = mapped_column(
         Enum(TaskStatus), nullable=False, default=TaskStatus.in_progress)
 
-    author_id: Mapped[int] = mapped_column(ForeignKey('user.id'))
+    author_id: Mapped[int] = mapped_column(ForeignKey('user.id'), index=True)
     task_author: Mapped[User] = relationship(
         'User', back_populates='author_of_task', foreign_keys=[author_id])
     project_id: Mapped[int] = mapped_column(ForeignKey('project.id'))
     project: Mapped[Project] = relationship(back_populates='tasks')
     assigned_to_id: Mapped[int] = mapped_column(
-        ForeignKey('user.id'), nullable=True)
+        ForeignKey('user.id'), nullable=True, index=True)
     assigned_to: Mapped[User] = relationship(
         'User', back_populates='tasks_asigned', foreign_keys=[assigned_to_id])
     comments: Mapped[list['Comment']] = relationship(
@@ -224,9 +267,9 @@ class Comment(db.Model):
     title: Mapped[str] = mapped_column(String(120), nullable=False)
     description: Mapped[str] = mapped_column(String, nullable=False)
     created_at: Mapped[DateTime] = mapped_column(DateTime, nullable=False)
-    task_id: Mapped[int] = mapped_column(ForeignKey('task.id'))
+    task_id: Mapped[int] = mapped_column(ForeignKey('task.id'), index=True)
     task: Mapped['Task'] = relationship(back_populates='comments')
-    author_id: Mapped[int] = mapped_column(ForeignKey('user.id'))
+    author_id: Mapped[int] = mapped_column(ForeignKey('user.id'), index=True)
     comment_author: Mapped[User] = relationship(
         back_populates='author_of_comment')
 
@@ -252,9 +295,9 @@ class Role(db.Model):
     __tablename__ = 'role'
     id: Mapped[int] = mapped_column(primary_key=True)
     status: Mapped[RoleType] = mapped_column(Enum(RoleType), nullable=False)
-    user_id: Mapped[int] = mapped_column(ForeignKey('user.id'))
+    user_id: Mapped[int] = mapped_column(ForeignKey('user.id'), index=True)
     user: Mapped[User] = relationship(back_populates='roles')
-    project_id: Mapped[int] = mapped_column(ForeignKey('project.id'))
+    project_id: Mapped[int] = mapped_column(ForeignKey('project.id'), index=True)
     project: Mapped[Project] = relationship(back_populates='roles')
 
     def __str__(self):
@@ -277,7 +320,7 @@ class Tags(db.Model):
     __tablename__ = 'tags'
     id: Mapped[int] = mapped_column(primary_key=True)
     tag: Mapped[str] = mapped_column(String(120), nullable=False)
-    task_id: Mapped[int] = mapped_column(ForeignKey('task.id'))
+    task_id: Mapped[int] = mapped_column(ForeignKey('task.id'), index=True)
     task: Mapped['Task'] = relationship(back_populates='tags')
 
     def __str__(self):
@@ -300,10 +343,12 @@ class RestorePassword(db.Model):
     user_mail: Mapped[str] = mapped_column(
         String(120),
         ForeignKey('user.email', ondelete="CASCADE"),
-        nullable=False
+        nullable=False,
+        index=True
     )
     uuid: Mapped[str] = mapped_column(String(36), unique=True, nullable=False)
-    expires_at: Mapped[DateTime] = mapped_column(DateTime, nullable=False)
+    # Cleanup of expired tokens scans by expires_at (see api/maintenance.py)
+    expires_at: Mapped[DateTime] = mapped_column(DateTime, nullable=False, index=True)
 
     # Relationships
     user: Mapped[User] = relationship(back_populates='restore_passwords')
@@ -318,3 +363,124 @@ class RestorePassword(db.Model):
             'uuid': self.uuid,
             'expires_at': self.expires_at.isoformat() if self.expires_at else None
         }
+
+# --- OUTBOUND MAIL MODEL ---
+
+
+class OutboundMail(db.Model):
+    # Queue of emails waiting to be delivered by api/mail_queue.py; rows are deleted once sent
+    __tablename__ = 'outbound_mail'
+    __table_args__ = (
+        Index('ix_outbound_mail_status_next_attempt_at', 'status', 'next_attempt_at'),
+    )
+    id: Mapped[int] = mapped_column(primary_key=True)
+    recipients: Mapped[str] = mapped_column(String(500), nullable=False)
+    subject: Mapped[str] = mapped_column(String(200), nullable=False)
+    html: Mapped[str] = mapped_column(String, nullable=False)
+    status: Mapped[MailStatus] = mapped_column(
+        Enum(MailStatus), nullable=False, default=MailStatus.pending)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    next_attempt_at: Mapped[DateTime] = mapped_column(DateTime, nullable=False)
+    last_error: Mapped[str] = mapped_column(String, nullable=True)
+    created_at: Mapped[DateTime] = mapped_column(DateTime, nullable=False)
+
+    def __str__(self):
+        return f'OutboundMail {self.subject} to {self.recipients}'
+
+    def serialize(self):
+        return {
+            'id': self.id,
+            'recipients': self.recipients.split(','),
+            'subject': self.subject,
+            'status': self.status.value,
+            'attempts': self.attempts,
+            'next_attempt_at': self.next_attempt_at.isoformat() if self.next_attempt_at else None,
+            'last_error': self.last_error,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+
+# --- AI SUGGESTION CACHE MODEL ---
+
+
+class AISuggestion(db.Model):
+    # Cached AI task descriptions shared by every worker, see api/ai_cache.py
+    __tablename__ = 'ai_suggestion'
+    id: Mapped[int] = mapped_column(primary_key=True)
+    cache_key: Mapped[str] = mapped_column(String(64), unique=True, nullable=False)
+    title: Mapped[str] = mapped_column(String(120), nullable=False)
+    suggestion: Mapped[str] = mapped_column(String, nullable=False)
+    created_at: Mapped[DateTime] = mapped_column(DateTime, nullable=False)
+    # Expired rows are purged by expires_at (see api/maintenance.py)
+    expires_at: Mapped[DateTime] = mapped_column(DateTime, nullable=False, index=True)
+
+    def __str__(self):
+        return f'AISuggestion for {self.title}'
+
+    def serialize(self):
+        return {
+            'id': self.id,
+            'title': self.title,
+            'suggestion': self.suggestion,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'expires_at': self.expires_at.isoformat() if self.expires_at else None
+        }
+
+# --- STANDUP SUMMARY MODEL ---
+
+
+class StandupSummary(db.Model):
+    # Last AI standup summary of a project and the fingerprint of the data it was made from
+    __tablename__ = 'standup_summary'
+    id: Mapped[int] = mapped_column(primary_key=True)
+    project_id: Mapped[int] = mapped_column(
+        ForeignKey('project.id'), unique=True, nullable=False)
+    project: Mapped[Project] = relationship(back_populates='standup_summary')
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+    summary: Mapped[str] = mapped_column(String, nullable=False)
+    updated_at: Mapped[DateTime] = mapped_column(DateTime, nullable=False)
+
+    def __str__(self):
+        return f'StandupSummary for Project {self.project.title if self.project else None}'
+
+    def serialize(self):
+        return {
+            'id': self.id,
+            'project_id': self.project_id,
+            'fingerprint': self.fingerprint,
+            'summary': self.summary,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+# --- PROJECT CHANGE MODEL ---
+
+
+class ProjectChange(db.Model):
+    # One entry of the change feed of a project, see api/changes.py
+    __tablename__ = 'project_change'
+    __table_args__ = (
+        Index('ix_project_change_project_id_revision', 'project_id', 'revision'),
+    )
+    id: Mapped[int] = mapped_column(primary_key=True)
+    project_id: Mapped[int] = mapped_column(ForeignKey('project.id'), nullable=False)
+    project: Mapped[Project] = relationship(back_populates='changes')
+    revision: Mapped[int] = mapped_column(Integer, nullable=False)
+    entity: Mapped[str] = mapped_column(String(20), nullable=False)
+    entity_id: Mapped[int] = mapped_column(Integer, nullable=True)
+    action: Mapped[str] = mapped_column(String(20), nullable=False)
+    data: Mapped[dict] = mapped_column(JSON, nullable=True)
+    user_id: Mapped[int] = mapped_column(Integer, nullable=True)
+    created_at: Mapped[DateTime] = mapped_column(DateTime, nullable=False)
+
+    def __str__(self):
+        return f'ProjectChange {self.revision} of Project {self.project_id}'
+
+    def serialize(self):
+        return {
+            'revision': self.revision,
+            'entity': self.entity,
+            'entity_id': self.entity_id,
+            'action': self.action,
+            'data': self.data,
+            'user_id': self.user_id,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
@@ -0,0 +1,197 @@
+"""
+Live notifications of project changes.
+Every change stored by api/changes.py is published once its transaction commits (never for
+a rolled back one) on the channel of its project, and GET /api/project/<id>/events forwards
+them to the subscribed clients as server-sent events.
+
+Brokers (NOTIFY_BACKEND):
+- 'memory' (default): subscribers of the same process only, enough for a single worker.
+- 'redis': publishes through Redis (NOTIFY_REDIS_URL, needs the redis package). Every worker
+  process keeps one Redis connection that feeds its local subscribers, so notifications reach
+  clients connected to any worker.
+Any object with publish(channel, message) and subscribe(channel) can be set as notifier.broker.
+
+A subscriber that does not keep up loses messages instead of blocking the publishers: its
+subscription is marked as overflowed and the client is told to resync from the change feed.
+
+Every open stream holds a request thread of its worker for as long as the client stays, so a
+worker takes at most NOTIFY_MAX_SUBSCRIBERS of them: subscribe() raises TooManySubscribers
+beyond that and the client falls back to polling the change feed.
+"""
+
+import json
+import time
+import queue
+import threading
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from api.utils import PerProcess
+
+
+class TooManySubscribers(Exception):
+    pass
+
+
+class Subscription:
+    def __init__(self, broker, channel, queue_size):
+        self.broker = broker
+        self.channel = channel
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.overflowed = False
+        self.closed = False
+        self.on_close = None
+
+    def put(self, message):
+        try:
+            self.queue.put_nowait(message)
+        except queue.Full:
+            self.overflowed = True
+
+    def get(self, timeout=None):
+        """ Next message or None after timeout seconds """
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.broker.unsubscribe(self)
+        if self.on_close is not None:
+            self.on_close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class MemoryBroker:
+    def __init__(self, queue_size=100):
+        self.queue_size = queue_size
+        self._subscriptions = {}
+        self._lock = threading.Lock()
+
+    def publish(self, channel, message):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            subscription.put(message)
+
+    def subscribe(self, channel):
+        subscription = Subscription(self, channel, self.queue_size)
+        with self._lock:
+            self._subscriptions.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.channel)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.channel]
+
+
+class RedisBroker(MemoryBroker):
+    def __init__(self, url, queue_size=100, prefix='echoboard:'):
+        super().__init__(queue_size)
+        import redis
+        self.redis = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self._listener = PerProcess(self._start_listener, threading.Thread.is_alive)
+
+    def publish(self, channel, message):
+        self.redis.publish(self.prefix + channel, message)
+
+    def subscribe(self, channel):
+        self._listener.get()
+        return super().subscribe(channel)
+
+    def _start_listener(self):
+        # One Redis connection per worker process feeds all its subscribers
+        thread = threading.Thread(target=self._listen, name='notify-redis', daemon=True)
+        thread.start()
+        return thread
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(self.prefix + '*')
+                for item in pubsub.listen():
+                    if item['type'] == 'pmessage':
+                        channel = item['channel'].decode()[len(self.prefix):]
+                        MemoryBroker.publish(self, channel, item['data'].decode())
+            except Exception as e:
+                print("Notifications Redis error:", e)
+                time.sleep(1)
+
+
+class Notifier:
+    def __init__(self, app=None):
+        self.app = None
+        self.broker = None
+        self.subscribers = 0
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('NOTIFY_BACKEND', 'memory')
+        app.config.setdefault('NOTIFY_REDIS_URL', 'redis://localhost:6379/0')
+        app.config.setdefault('NOTIFY_QUEUE_SIZE', 100)
+        app.config.setdefault('NOTIFY_HEARTBEAT_SECONDS', 15)
+        app.config.setdefault('NOTIFY_MAX_SUBSCRIBERS', 4)
+        app.config.setdefault('NOTIFY_RETRY_AFTER', 30)
+        self.app = app
+        if app.config['NOTIFY_BACKEND'] == 'redis':
+            self.broker = RedisBroker(app.config['NOTIFY_REDIS_URL'], app.config['NOTIFY_QUEUE_SIZE'])
+        else:
+            self.broker = MemoryBroker(app.config['NOTIFY_QUEUE_SIZE'])
+        if not event.contains(Session, 'after_commit', self._after_commit):
+            event.listen(Session, 'after_commit', self._after_commit)
+            event.listen(Session, 'after_soft_rollback', self._after_rollback)
+
+    @staticmethod
+    def channel(project_id):
+        return f'project:{project_id}'
+
+    def publish(self, project_id, revision, changes):
+        message = json.dumps({'project_id': project_id, 'revision': revision, 'changes': changes})
+        try:
+            self.broker.publish(self.channel(project_id), message)
+        except Exception as e:
+            # The change is committed and in the feed, clients catch up from there
+            print("Notification error:", e)
+
+    def subscribe(self, project_id):
+        """ Raises TooManySubscribers when this process already has NOTIFY_MAX_SUBSCRIBERS """
+        with self._lock:
+            if self.subscribers >= self.app.config['NOTIFY_MAX_SUBSCRIBERS']:
+                raise TooManySubscribers()
+            self.subscribers += 1
+        try:
+            subscription = self.broker.subscribe(self.channel(project_id))
+        except Exception:
+            self._release()
+            raise
+        subscription.on_close = self._release
+        return subscription
+
+    def _release(self):
+        with self._lock:
+            self.subscribers -= 1
+
+    def _after_commit(self, session):
+        for project_id, revision, changes in session.info.pop('pending_notifications', []):
+            self.publish(project_id, revision, changes)
+
+    def _after_rollback(self, session, previous_transaction):
+        session.info.pop('pending_notifications', None)
+
+
+notifier = Notifier()
@@ -0,0 +1,130 @@
+"""
+Password hashing service.
+Hashing is CPU bound by design, so it runs in a small process pool per worker
+(PASSWORD_HASH_WORKERS processes, 0 hashes inline): a burst of logins or registrations
+can use at most that many cores and the request threads stay free to serve everything
+else. At most PASSWORD_HASH_MAX_PENDING hashes are queued or running in the pool, past that
+callers get PasswordHasherBusy instead of piling up, as do callers whose hash does not finish
+within PASSWORD_HASH_TIMEOUT. A pool broken by a crashed child is replaced.
+
+PASSWORD_HASH_METHOD is any werkzeug method, e.g. 'scrypt:32768:8:1' or 'pbkdf2:sha256:600000'.
+Hashes made with another method or parameters still verify, and verify() returns a new hash
+with the current method so login can upgrade them transparently.
+"""
+
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from werkzeug.security import generate_password_hash, check_password_hash
+from api.utils import PerProcess
+
+
+def _hash(password, method):
+    return generate_password_hash(password, method=method)
+
+
+def _verify(stored_hash, password, method, rehash):
+    # Runs in the pool: checking and rehashing in one call saves a round trip
+    if not check_password_hash(stored_hash, password):
+        return False, None
+    return True, generate_password_hash(password, method=method) if rehash else None
+
+
+class PasswordHasherBusy(Exception):
+    pass
+
+
+class PasswordHasher:
+    def __init__(self, app=None):
+        self.app = None
+        self._pool = PerProcess(self._new_pool)
+        self._pending = None
+        self._method_prefix = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+        app.config.setdefault('PASSWORD_HASH_WORKERS', min(2, os.cpu_count() or 1))
+        app.config.setdefault('PASSWORD_HASH_MAX_PENDING', 64)
+        app.config.setdefault('PASSWORD_HASH_TIMEOUT', 10)
+        self.app = app
+        self._pending = threading.BoundedSemaphore(app.config['PASSWORD_HASH_MAX_PENDING'])
+
+    @property
+    def method(self):
+        return self.app.config['PASSWORD_HASH_METHOD']
+
+    @property
+    def pool(self):
+        return self._pool.get()
+
+    def _new_pool(self):
+        # 'spawn' keeps the children free of the threads and sockets of the app
+        return ProcessPoolExecutor(
+            max_workers=self.app.config['PASSWORD_HASH_WORKERS'],
+            mp_context=multiprocessing.get_context('spawn'))
+
+    def _discard(self, pool):
+        # The next call to self.pool starts a new one
+        self._pool.reset(pool)
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, func, *args):
+        pool = self.pool
+        try:
+            return pool, pool.submit(func, *args)
+        except (BrokenProcessPool, RuntimeError):
+            # Broken by an earlier job (or already shut down by the thread that saw it break):
+            # this one never ran, so it can go to a new pool
+            self._discard(pool)
+            pool = self.pool
+            return pool, pool.submit(func, *args)
+
+    def _run(self, func, *args):
+        if not self.app.config['PASSWORD_HASH_WORKERS']:
+            return func(*args)
+        timeout = self.app.config['PASSWORD_HASH_TIMEOUT']
+        if not self._pending.acquire(timeout=timeout):
+            raise PasswordHasherBusy('Too many password hashes in progress')
+        try:
+            pool, future = self._submit(func, *args)
+        except BaseException:
+            self._pending.release()
+            raise
+        # Released once the job is over (or cancelled), not when the caller stops waiting,
+        # so the jobs left in the pool by timed out callers still count
+        future.add_done_callback(lambda future: self._pending.release())
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise PasswordHasherBusy('Password hash timed out')
+        except BrokenProcessPool:
+            self._discard(pool)
+            raise PasswordHasherBusy('Password hashing pool crashed')
+
+    def needs_rehash(self, stored_hash):
+        """ True if the hash was not made with the current method and parameters """
+        if self._method_prefix is None:
+            # werkzeug fills in default parameters ('pbkdf2' -> 'pbkdf2:sha256:1000000'),
+            # the prefix of a real hash is the only reliable way to compare
+            self._method_prefix = _hash('', self.method).split('$', 1)[0]
+        return stored_hash.split('$', 1)[0] != self._method_prefix
+
+    def hash(self, password):
+        return self._run(_hash, password, self.method)
+
+    def verify(self, stored_hash, password):
+        """ Returns (valid, new_hash); new_hash is set when the stored one should be replaced """
+        return self._run(_verify, stored_hash, password, self.method, self.needs_rehash(stored_hash))
+
+    def shutdown(self):
+        pool = self._pool.reset()
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher()
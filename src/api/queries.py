@@ -0,0 +1,329 @@
+"""
+Query helpers used by the endpoints in app.py.
+serialize() walks a lot of relationships (admin, members, tasks, comments, tags...),
+so every endpoint that returns a graph of objects should load it with these
+options: the whole graph then comes back in a fixed number of SELECTs instead of
+one SELECT per project, task and comment.
+"""
+
+import base64
+import datetime
+from sqlalchemy import func, and_, or_, insert
+from sqlalchemy.orm import joinedload, selectinload
+from api.models import db, User, Project, Project_Member, Task, Comment, Tags, TaskStatus
+
+
+def task_load_options():
+    """ Everything Task.serialize() and Task.serialize_for_member() touch """
+    return (
+        joinedload(Task.task_author),
+        joinedload(Task.assigned_to),
+        selectinload(Task.tags),
+        selectinload(Task.comments).joinedload(Comment.comment_author),
+    )
+
+
+def task_export_load_options():
+    """ Only the tags, selectinload keeps working with yield_per (joined collections do not) """
+    return (
+        selectinload(Task.tags),
+    )
+
+
+def project_load_options():
+    """ Everything Project.serialize() touches, tasks included """
+    return (
+        joinedload(Project.admin),
+        selectinload(Project.members).joinedload(Project_Member.member),
+        selectinload(Project.tasks).options(*task_load_options()),
+    )
+
+
+def project_summary_load_options():
+    """ Only what Project.serialize_summary() touches """
+    return (
+        joinedload(Project.admin),
+    )
+
+
+def user_projects_queries(user_id, load_options=None):
+    """ Queries for (admin_projects, member_projects) of a user, fully loaded by default """
+    if load_options is None:
+        load_options = project_load_options()
+
+    admin_projects = Project.query.options(*load_options).filter(
+        Project.admin_id == user_id
+    ).order_by(Project.id)
+
+    member_projects = Project.query.options(*load_options).join(
+        Project_Member, Project_Member.project_id == Project.id
+    ).filter(
+        Project_Member.member_id == user_id
+    ).order_by(Project_Member.id)
+
+    return admin_projects, member_projects
+
+
+def get_user_projects(user_id, load_options=None):
+    """ Returns (admin_projects, member_projects) for a user, fully loaded by default """
+    admin_projects, member_projects = user_projects_queries(user_id, load_options)
+    return admin_projects.all(), member_projects.all()
+
+
+def get_project_graph(project_id):
+    """ A single project with its members, tasks and comments loaded """
+    return Project.query.options(*project_load_options()).filter(
+        Project.id == project_id
+    ).first()
+
+
+def get_project_counts(project_ids):
+    """
+    Task counts per status and member counts for several projects, computed
+    with two GROUP BY queries instead of loading tasks and members.
+    Returns (task_counts, member_counts) keyed by project id.
+    """
+    task_counts = {}
+    member_counts = {}
+    if not project_ids:
+        return task_counts, member_counts
+
+    task_rows = db.session.query(
+        Task.project_id, Task.status, func.count(Task.id)
+    ).filter(
+        Task.project_id.in_(project_ids)
+    ).group_by(Task.project_id, Task.status).all()
+    for project_id, status, count in task_rows:
+        task_counts.setdefault(project_id, {})[status] = count
+
+    member_rows = db.session.query(
+        Project_Member.project_id, func.count(Project_Member.id)
+    ).filter(
+        Project_Member.project_id.in_(project_ids)
+    ).group_by(Project_Member.project_id).all()
+    for project_id, count in member_rows:
+        member_counts[project_id] = count
+
+    return task_counts, member_counts
+
+
+def get_project_role(project, user_id):
+    """
+    Role of a user in a project: 'admin', 'member' or None.
+    Answered from project.admin_id or with a single EXISTS on the
+    (project_id, member_id) index, whatever the size of the project.
+    """
+    if project.admin_id == user_id:
+        return 'admin'
+    is_member = db.session.query(
+        Project_Member.query.filter_by(
+            project_id=project.id, member_id=user_id).exists()
+    ).scalar()
+    return 'member' if is_member else None
+
+
+def get_project_participant_ids(project):
+    """ Ids of the admin and every member of a project, with one query on the member ids only """
+    member_ids = db.session.query(Project_Member.member_id).filter(
+        Project_Member.project_id == project.id).all()
+    return {project.admin_id} | {member_id for (member_id,) in member_ids}
+
+
+def filter_tasks(query, status=None, assigned_to_id=None, unassigned=False, tag=None):
+    """ Applies the optional task list filters in SQL """
+    if status is not None:
+        query = query.filter(Task.status == status)
+    if unassigned:
+        query = query.filter(Task.assigned_to_id.is_(None))
+    elif assigned_to_id is not None:
+        query = query.filter(Task.assigned_to_id == assigned_to_id)
+    if tag:
+        query = query.filter(Task.tags.any(Tags.tag == tag))
+    return query
+
+
+def encode_task_cursor(task):
+    raw = f'{task.created_at.isoformat()}|{task.id}'
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_task_cursor(cursor):
+    """ Returns (created_at, id) from a cursor, raises ValueError if it is not valid """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        created_at, task_id = raw.split('|')
+        return datetime.datetime.fromisoformat(created_at), int(task_id)
+    except Exception:
+        raise ValueError('Invalid cursor')
+
+
+def paginate_tasks(query, cursor=None, limit=50):
+    """
+    Keyset pagination on (created_at, id): every page is a range scan that
+    starts after the last task of the previous one, no OFFSET involved.
+    Returns (tasks, next_cursor); next_cursor is None on the last page.
+    """
+    query = query.order_by(Task.created_at, Task.id)
+    if cursor:
+        created_at, task_id = decode_task_cursor(cursor)
+        query = query.filter(or_(
+            Task.created_at > created_at,
+            and_(Task.created_at == created_at, Task.id > task_id)
+        ))
+
+    tasks = query.limit(limit + 1).all()
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        return tasks, encode_task_cursor(tasks[-1])
+    return tasks, None
+
+
+def user_project_ids_query(user_id):
+    """ Ids of the projects a user administers or is a member of, as a subquery """
+    member_project_ids = db.session.query(Project_Member.project_id).filter(
+        Project_Member.member_id == user_id)
+    return db.session.query(Project.id).filter(or_(
+        Project.admin_id == user_id,
+        Project.id.in_(member_project_ids)
+    ))
+
+
+def bump_project_revision(project_ids):
+    """
+    Increments the revision of the given projects (a list of ids or an id subquery) with an
+    atomic UPDATE. Must run in the same transaction as every write that changes what the
+    project, member or task endpoints return. Does not commit.
+    """
+    db.session.query(Project).filter(Project.id.in_(project_ids)).update(
+        {Project.revision: Project.revision + 1}, synchronize_session=False)
+
+
+def get_project_revision(project_id):
+    """ Current revision of a project straight from the database (not the session's copy) """
+    return db.session.query(Project.revision).filter(Project.id == project_id).scalar()
+
+
+def get_user_project_revisions(user_id):
+    """ (id, revision) of every project of a user, one query on the project table only """
+    return db.session.query(Project.id, Project.revision).filter(
+        Project.id.in_(user_project_ids_query(user_id))
+    ).order_by(Project.id).all()
+
+
+def get_standup_data(user_id, titles_per_project=10):
+    """
+    Data for the AI standup of a user's projects in three queries whatever the
+    number of projects: the projects, their task counts per status (GROUP BY)
+    and the latest task titles of each one (ranked with a window function).
+    The project revision comes along so callers can tell any change apart.
+    """
+    project_ids = user_project_ids_query(user_id)
+    projects = db.session.query(
+        Project.id, Project.title, Project.description, Project.revision
+    ).filter(Project.id.in_(project_ids)).order_by(Project.id).all()
+    if not projects:
+        return []
+
+    counts = {}
+    count_rows = db.session.query(
+        Task.project_id, Task.status, func.count(Task.id)
+    ).filter(
+        Task.project_id.in_(project_ids)
+    ).group_by(Task.project_id, Task.status).all()
+    for project_id, status, count in count_rows:
+        counts.setdefault(project_id, {})[status] = count
+
+    ranked = db.session.query(
+        Task.project_id.label('project_id'),
+        Task.title.label('title'),
+        func.row_number().over(
+            partition_by=Task.project_id,
+            order_by=(Task.created_at.desc(), Task.id.desc())
+        ).label('position')
+    ).filter(Task.project_id.in_(project_ids)).subquery()
+    titles = {}
+    title_rows = db.session.query(ranked.c.project_id, ranked.c.title).filter(
+        ranked.c.position <= titles_per_project
+    ).order_by(ranked.c.project_id, ranked.c.position).all()
+    for project_id, title in title_rows:
+        titles.setdefault(project_id, []).append(title)
+
+    summaries = []
+    for project_id, title, description, revision in projects:
+        status_counts = counts.get(project_id, {})
+        summaries.append({
+            "id": project_id,
+            "revision": revision,
+            "title": title,
+            "description": description or "",
+            "tasks": titles.get(project_id, []),
+            "num_tasks": sum(status_counts.values()),
+            "num_done": status_counts.get(TaskStatus.done, 0),
+            "num_inprogress": status_counts.get(TaskStatus.in_progress, 0),
+            "num_urgent": status_counts.get(TaskStatus.urgent, 0),
+        })
+    return summaries
+
+
+MEMBER_RESULT_MESSAGES = {
+    'not_found': 'User with email {email} not found',
+    'already_member': 'User {email} is already a member',
+    'is_admin': 'Cannot add admin as member',
+    'duplicate': 'Email {email} is repeated',
+}
+
+
+def add_members_bulk(project, emails):
+    """
+    Adds users to a project by email with a fixed number of queries: one IN query to
+    resolve the emails, one to find existing memberships and one bulk INSERT.
+    Does not commit. Returns (added_members, results) where results has one
+    {'email', 'status', 'msg'} entry per submitted email.
+    """
+    emails = [email.strip() for email in emails if isinstance(email, str) and email.strip()]
+
+    users = {}
+    if emails:
+        users = {
+            email: (user_id, full_name) for user_id, email, full_name in db.session.query(
+                User.id, User.email, User.full_name
+            ).filter(User.email.in_(set(emails))).all()
+        }
+
+    existing_member_ids = set()
+    if users:
+        existing_member_ids = {
+            member_id for (member_id,) in db.session.query(Project_Member.member_id).filter(
+                Project_Member.project_id == project.id,
+                Project_Member.member_id.in_([user_id for user_id, _ in users.values()])
+            ).all()
+        }
+
+    results = []
+    added_members = []
+    seen = set()
+    for email in emails:
+        if email in seen:
+            status = 'duplicate'
+        elif email not in users:
+            status = 'not_found'
+        elif users[email][0] == project.admin_id:
+            status = 'is_admin'
+        elif users[email][0] in existing_member_ids:
+            status = 'already_member'
+        else:
+            status = 'added'
+            user_id, full_name = users[email]
+            added_members.append({'id': user_id, 'email': email, 'full_name': full_name})
+        seen.add(email)
+        results.append({
+            'email': email,
+            'status': status,
+            'msg': MEMBER_RESULT_MESSAGES[status].format(email=email) if status != 'added' else None
+        })
+
+    if added_members:
+        db.session.execute(insert(Project_Member), [
+            {'project_id': project.id, 'member_id': member['id']} for member in added_members
+        ])
+    return added_members, results
@@ -0,0 +1,170 @@
+"""
+Token bucket rate limiting for the endpoints that attackers hammer (login, password reset).
+Limits are strings like '10/minute': a bucket of 10 tokens that refills at 10 per minute,
+so short bursts pass and a sustained flood is cut to the refill rate. Endpoints call
+rate_limiter.hit(...) with the client IP and the email before touching the database or
+checking a password, so a rejected request costs nothing but a dictionary lookup.
+
+Stores (RATE_LIMIT_STORAGE):
+- 'memory' (default): buckets live in the worker process, each worker counts on its own.
+- 'redis': buckets shared by every worker and instance (RATE_LIMIT_REDIS_URL, needs the
+  redis package), updated atomically by a Lua script.
+Any object with consume([(key, capacity, rate), ...]) -> retry_after can be set as
+rate_limiter.store.
+"""
+
+import re
+import math
+import time
+import threading
+from collections import OrderedDict
+from flask import request
+
+PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+
+def parse_limit(limit):
+    """ '10/minute' -> (capacity, tokens refilled per second) """
+    match = re.fullmatch(r'\s*(\d+)\s*/\s*(second|minute|hour|day)\s*', limit)
+    if not match:
+        raise ValueError(f'Invalid rate limit: {limit}')
+    capacity = int(match.group(1))
+    return capacity, capacity / PERIODS[match.group(2)]
+
+
+class RateLimitExceeded(Exception):
+    def __init__(self, retry_after):
+        super().__init__('Too many requests')
+        self.retry_after = retry_after
+
+
+class MemoryStore:
+    def __init__(self, maxsize=100000):
+        self.maxsize = maxsize
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, buckets):
+        """
+        Takes a token from every (key, capacity, rate) bucket, or from none of them if one is
+        empty. Returns 0 or the seconds until all of them have a token.
+        """
+        now = time.monotonic()
+        with self._lock:
+            levels = []
+            retry_after = 0
+            for key, capacity, rate in buckets:
+                tokens, updated = self._buckets.pop(key, (capacity, now))
+                tokens = min(capacity, tokens + (now - updated) * rate)
+                if tokens < 1:
+                    retry_after = max(retry_after, (1 - tokens) / rate)
+                levels.append((key, tokens))
+            for key, tokens in levels:
+                self._buckets[key] = (tokens if retry_after else tokens - 1, now)
+            # Least recently used buckets go first, they are the fullest anyway
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+        return retry_after
+
+
+class RedisStore:
+    SCRIPT = """
+    local now = tonumber(ARGV[1])
+    local levels = {}
+    local retry_after = 0
+    for i, key in ipairs(KEYS) do
+        local capacity = tonumber(ARGV[2 * i])
+        local rate = tonumber(ARGV[2 * i + 1])
+        local bucket = redis.call('HMGET', key, 'tokens', 'updated')
+        local tokens = tonumber(bucket[1]) or capacity
+        local updated = tonumber(bucket[2]) or now
+        tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+        if tokens < 1 then
+            retry_after = math.max(retry_after, (1 - tokens) / rate)
+        end
+        levels[i] = tokens
+    end
+    for i, key in ipairs(KEYS) do
+        local capacity = tonumber(ARGV[2 * i])
+        local rate = tonumber(ARGV[2 * i + 1])
+        local tokens = levels[i]
+        if retry_after == 0 then
+            tokens = tokens - 1
+        end
+        redis.call('HSET', key, 'tokens', tokens, 'updated', now)
+        redis.call('EXPIRE', key, math.ceil(capacity / rate))
+    end
+    return tostring(retry_after)
+    """
+
+    def __init__(self, url, prefix='echoboard:ratelimit:'):
+        import redis
+        self.redis = redis.Redis.from_url(url)
+        self.prefix = prefix
+        self._consume = self.redis.register_script(self.SCRIPT)
+
+    def consume(self, buckets):
+        args = [time.time()]
+        for _, capacity, rate in buckets:
+            args += [capacity, rate]
+        return float(self._consume(keys=[self.prefix + key for key, _, _ in buckets], args=args))
+
+
+class RateLimiter:
+    def __init__(self, app=None):
+        self.app = None
+        self.store = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('RATE_LIMIT_ENABLED', True)
+        app.config.setdefault('RATE_LIMIT_STORAGE', 'memory')
+        app.config.setdefault('RATE_LIMIT_REDIS_URL', 'redis://localhost:6379/0')
+        # Proxies in front of the app that append to X-Forwarded-For (Render, nginx...)
+        app.config.setdefault('RATE_LIMIT_TRUSTED_PROXIES', 0)
+        app.config.setdefault('RATE_LIMIT_LOGIN_IP', '30/minute')
+        app.config.setdefault('RATE_LIMIT_LOGIN_EMAIL', '10/minute')
+        app.config.setdefault('RATE_LIMIT_RESTORE_PASSWORD_IP', '10/hour')
+        app.config.setdefault('RATE_LIMIT_RESTORE_PASSWORD_EMAIL', '3/hour')
+        self.app = app
+        if app.config['RATE_LIMIT_STORAGE'] == 'redis':
+            self.store = RedisStore(app.config['RATE_LIMIT_REDIS_URL'])
+        else:
+            self.store = MemoryStore()
+
+    def client_ip(self):
+        trusted = self.app.config['RATE_LIMIT_TRUSTED_PROXIES']
+        route = request.access_route
+        if trusted and len(route) >= trusted:
+            # The last trusted proxy appended the address it got the request from
+            return route[-trusted]
+        return request.remote_addr
+
+    def hit(self, name, email=None):
+        """
+        Counts a request to the `name` endpoint against the RATE_LIMIT_<NAME>_IP and
+        RATE_LIMIT_<NAME>_EMAIL limits. Raises RateLimitExceeded if either is exhausted, in
+        which case neither is charged: a flood from one address cannot drain the bucket of
+        an email and lock its owner out.
+        """
+        if not self.app.config['RATE_LIMIT_ENABLED']:
+            return
+        prefix = f'RATE_LIMIT_{name.upper()}'
+        keys = [('IP', self.client_ip())]
+        if email:
+            keys.append(('EMAIL', email.strip().lower()))
+
+        buckets = []
+        for kind, value in keys:
+            limit = self.app.config.get(f'{prefix}_{kind}')
+            if not limit:
+                continue
+            capacity, rate = parse_limit(limit)
+            buckets.append((f'{name}:{kind.lower()}:{value}', capacity, rate))
+        retry_after = self.store.consume(buckets) if buckets else 0
+        if retry_after:
+            raise RateLimitExceeded(math.ceil(retry_after))
+
+
+rate_limiter = RateLimiter()
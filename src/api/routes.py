@@ -1,6 +1,5 @@
 from flask import Blueprint, jsonify
-from flask_jwt_extended import jwt_required, get_jwt_identity
-from api.models import User
+from flask_jwt_extended import jwt_required, get_current_user
 
 api = Blueprint('api', __name__)
 
@@ -11,10 +10,7 @@ def handle_hello():
 @api.route('/private', methods=['GET'])
 @jwt_required()
 def api_private():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user:
-        return jsonify({'msg': 'User not found'}), 404
+    user = get_current_user()
     return jsonify({'msg': 'Este es un endpoint privado!', 'user': user.serialize()}), 200
 
 
@@ -0,0 +1,188 @@
+"""
+Realistic test data for development and benchmarks: users, projects, memberships, tasks,
+comments and tags with skewed distributions like a real board (a few busy users own most
+projects and get most assignments, project sizes vary a lot, most tasks are done or in
+progress). The same seed always produces the same data (dates relative to today). Rows are
+written with Core bulk INSERTs of batch_size rows with explicit ids, so a million rows take
+a few minutes at most.
+"""
+
+import random
+import datetime
+from sqlalchemy import func, text
+from api.models import db, User, Project, Project_Member, Task, Comment, Tags, ProjectStatus, TaskStatus
+
+TASK_STATUS_WEIGHTS = {
+    TaskStatus.done: 45,
+    TaskStatus.in_progress: 30,
+    TaskStatus.urgent: 15,
+    TaskStatus.delegated: 10,
+}
+PROJECT_STATUS_WEIGHTS = {
+    ProjectStatus.in_progress: 50,
+    ProjectStatus.done: 25,
+    ProjectStatus.yet_to_start: 15,
+    ProjectStatus.dismissed: 10,
+}
+TAGS = ['frontend', 'backend', 'bug', 'feature', 'design', 'docs', 'testing', 'devops',
+        'research', 'meeting', 'refactor', 'security', 'performance', 'ux', 'data']
+WORDS = ['review', 'update', 'fix', 'deploy', 'write', 'plan', 'design', 'test', 'migrate',
+         'clean', 'report', 'api', 'login', 'dashboard', 'sprint', 'client', 'budget', 'docs']
+COUNTRIES = ['ES', 'AR', 'MX', 'CO', 'CL', 'VE', 'PE', 'UY', 'US', 'GB']
+
+
+def skewed(rng, items, skew=2.5):
+    """ Random item, the first ones much more likely than the last ones """
+    return items[int(len(items) * rng.random() ** skew)]
+
+
+def weighted(rng, weights):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def amount(rng, mean):
+    """ Exponentially distributed count: most are small, a few are several times the mean """
+    return int(rng.expovariate(1 / mean) + 0.5) if mean > 0 else 0
+
+
+def sentence(rng, words=4):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+class BulkWriter:
+    """ Buffers rows per table and writes them with executemany, parents before children """
+
+    def __init__(self, tables, batch_size):
+        self.tables = tables
+        self.batch_size = batch_size
+        self.buffers = {table.name: [] for table in tables}
+        self.counts = {table.name: 0 for table in tables}
+
+    def add(self, table, row):
+        buffer = self.buffers[table.name]
+        buffer.append(row)
+        if len(buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        for table in self.tables:
+            buffer = self.buffers[table.name]
+            if buffer:
+                db.session.execute(table.insert(), buffer)
+                self.counts[table.name] += len(buffer)
+                buffer.clear()
+
+
+def next_id(model):
+    return (db.session.query(func.max(model.id)).scalar() or 0) + 1
+
+
+def reset_sequences(models):
+    # Explicit ids leave PostgreSQL sequences behind, the next INSERT of the app would collide
+    if db.engine.dialect.name != 'postgresql':
+        return
+    for model in models:
+        table = model.__tablename__
+        db.session.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('\"{table}\"', 'id'), "
+            f"(SELECT COALESCE(MAX(id), 1) FROM \"{table}\"))"))
+
+
+def seed_data(users=1000, projects=200, tasks_per_project=50, members_per_project=5,
+              comments_per_task=1, tags_per_task=1, seed=42, password_hash='', batch_size=5000,
+              days=365):
+    """
+    Inserts the data and commits. The per project and per task numbers are means of
+    exponential distributions. Returns the number of rows written per table.
+    """
+    rng = random.Random(seed)
+    now = datetime.datetime.now().replace(microsecond=0)
+    start = now - datetime.timedelta(days=days)
+
+    def moment(after=start):
+        return after + datetime.timedelta(seconds=rng.randint(0, max(1, int((now - after).total_seconds()))))
+
+    tables = [model.__table__ for model in (User, Project, Project_Member, Task, Comment, Tags)]
+    writer = BulkWriter(tables, batch_size)
+    user_table, project_table, member_table, task_table, comment_table, tag_table = tables
+
+    first_user = next_id(User)
+    user_ids = list(range(first_user, first_user + users))
+    for user_id in user_ids:
+        writer.add(user_table, {
+            'id': user_id,
+            'full_name': f'Seed User {user_id}',
+            'email': f'seed_user{user_id}@test.com',
+            'password': password_hash,
+            'country': rng.choice(COUNTRIES),
+            'created_at': moment(),
+            'random_profile_color': rng.randint(0, 9),
+            'is_active': True,
+        })
+    # Busy users first: skewed() picks them for most projects and assignments
+    busy_users = user_ids[:]
+    rng.shuffle(busy_users)
+
+    task_id = next_id(Task)
+    comment_id = next_id(Comment)
+    tag_id = next_id(Tags)
+    member_id = next_id(Project_Member)
+    first_project = next_id(Project)
+    for project_id in range(first_project, first_project + projects):
+        admin_id = skewed(rng, busy_users)
+        created_at = moment()
+        writer.add(project_table, {
+            'id': project_id,
+            'title': f'{sentence(rng, 2)} {project_id}',
+            'description': sentence(rng, 10),
+            'created_at': created_at,
+            'due_date': created_at + datetime.timedelta(days=rng.randint(7, 180)),
+            'status': weighted(rng, PROJECT_STATUS_WEIGHTS),
+            'admin_id': admin_id,
+        })
+
+        members = set()
+        wanted = min(users - 1, amount(rng, members_per_project))
+        for _ in range(wanted * 3):
+            if len(members) >= wanted:
+                break
+            candidate = skewed(rng, busy_users)
+            if candidate != admin_id:
+                members.add(candidate)
+        for member in sorted(members):
+            writer.add(member_table, {'id': member_id, 'project_id': project_id, 'member_id': member})
+            member_id += 1
+
+        participants = [admin_id] + sorted(members)
+        for _ in range(amount(rng, tasks_per_project)):
+            task_created = moment(created_at)
+            writer.add(task_table, {
+                'id': task_id,
+                'title': sentence(rng),
+                'description': sentence(rng, 12) if rng.random() < 0.7 else None,
+                'created_at': task_created,
+                'status': weighted(rng, TASK_STATUS_WEIGHTS),
+                'author_id': admin_id if rng.random() < 0.6 else rng.choice(participants),
+                'project_id': project_id,
+                'assigned_to_id': None if rng.random() < 0.25 else skewed(rng, participants, 1.5),
+            })
+            for _ in range(amount(rng, comments_per_task)):
+                writer.add(comment_table, {
+                    'id': comment_id,
+                    'title': sentence(rng, 3),
+                    'description': sentence(rng, 15),
+                    'created_at': moment(task_created),
+                    'task_id': task_id,
+                    'author_id': rng.choice(participants),
+                })
+                comment_id += 1
+            task_tags = set(skewed(rng, TAGS, 1.8) for _ in range(amount(rng, tags_per_task)))
+            for tag in sorted(task_tags):
+                writer.add(tag_table, {'id': tag_id, 'tag': tag, 'task_id': task_id})
+                tag_id += 1
+            task_id += 1
+
+    writer.flush()
+    reset_sequences([User, Project, Project_Member, Task, Comment, Tags])
+    db.session.commit()
+    return writer.counts
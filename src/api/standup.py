@@ -0,0 +1,180 @@
+"""
+Incremental AI standup.
+Every project gets its own short summary, stored in the standup_summary table with a
+fingerprint of the data it was generated from (title, description, task counts per status,
+latest task titles and the project revision, see get_standup_data in api/queries.py). The
+revision catches the changes that leave counts and titles alike, such as two tasks swapping
+status or a task being reassigned. A standup only asks the LLM again for the projects whose
+fingerprint changed and merges the stored summaries of the rest, so repeated standups with
+no changes cost no LLM calls at all.
+"""
+
+import json
+import hashlib
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import insert, update
+from sqlalchemy.exc import IntegrityError
+from api.models import db, StandupSummary
+from api.ai_client import AIServiceError
+
+SYSTEM_PROMPT = "You are an AI project manager. Write a short standup summary update for all current projects given their tasks and status."
+
+PROMPT_INTRO = (
+    "You are an AI standup bot. Summarize the current progress for each project. "
+    "For each project, give a brief status update mentioning tasks done, in progress, urgent tasks, and anything notable. "
+    "Make it readable and actionable for a daily standup update.\n\n"
+)
+
+
+def project_prompt(proj):
+    return (
+        f"Project: {proj['title']}\n"
+        f"Description: {proj['description']}\n"
+        f"Total Tasks: {proj['num_tasks']}, Done: {proj['num_done']}, In Progress: {proj['num_inprogress']}, Urgent: {proj['num_urgent']}\n"
+        f"Tasks: {', '.join(proj['tasks']) if proj['tasks'] else 'No tasks yet.'}\n\n"
+    )
+
+
+def project_fingerprint(proj):
+    return hashlib.sha256(json.dumps(proj, sort_keys=True).encode()).hexdigest()
+
+
+def project_messages(proj):
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": PROMPT_INTRO + project_prompt(proj)}
+    ]
+
+
+def load_stored_summaries(project_summaries):
+    """ Returns (fingerprints, stored, changed): stored maps project id -> (id, fingerprint, summary) """
+    fingerprints = {proj['id']: project_fingerprint(proj) for proj in project_summaries}
+    stored = {
+        project_id: (summary_id, fingerprint, summary)
+        for summary_id, project_id, fingerprint, summary in db.session.query(
+            StandupSummary.id, StandupSummary.project_id, StandupSummary.fingerprint, StandupSummary.summary
+        ).filter(StandupSummary.project_id.in_(fingerprints.keys())).all()
+    }
+    changed = [
+        proj for proj in project_summaries
+        if proj['id'] not in stored or stored[proj['id']][1] != fingerprints[proj['id']]
+    ]
+    return fingerprints, stored, changed
+
+
+def save_summaries(new_summaries, fingerprints, stored):
+    """ Stored in bulk: one INSERT and one UPDATE whatever the number of changed projects """
+    now = datetime.datetime.now()
+    inserts = []
+    updates = []
+    for project_id, text in new_summaries.items():
+        if not text or not text.strip():
+            # Not stored, so the next standup asks the LLM again instead of reusing nothing
+            continue
+        row = {'fingerprint': fingerprints[project_id], 'summary': text, 'updated_at': now}
+        if project_id in stored:
+            updates.append({'id': stored[project_id][0], **row})
+        else:
+            inserts.append({'project_id': project_id, **row})
+    if not inserts and not updates:
+        return
+    try:
+        if inserts:
+            db.session.execute(insert(StandupSummary), inserts)
+        if updates:
+            db.session.execute(update(StandupSummary), updates)
+        db.session.commit()
+    except IntegrityError:
+        # Another request stored the same project first, ours is still returned
+        db.session.rollback()
+
+
+def merge_standup(project_summaries, stored, new_summaries, errors=None):
+    """ A project the LLM failed on keeps its last stored summary, if any, and carries the error """
+    errors = errors or {}
+    projects = []
+    for proj in project_summaries:
+        if proj['id'] in new_summaries:
+            summary, cached = new_summaries[proj['id']], False
+        elif proj['id'] in stored:
+            summary, cached = stored[proj['id']][2], True
+        else:
+            summary, cached = None, False
+        entry = {'project_id': proj['id'], 'title': proj['title'], 'summary': summary, 'cached': cached}
+        if proj['id'] in errors:
+            entry['error'] = errors[proj['id']].message
+        projects.append(entry)
+    standup = '\n\n'.join(f"{proj['title']}: {proj['summary']}" for proj in projects if proj['summary'])
+    return standup, projects
+
+
+def generate_standup(project_summaries, ai_client, max_tokens=120, concurrency=4):
+    """
+    Returns (standup_text, projects) where projects lists each project summary
+    and whether it came from the stored ones. A project the LLM fails on gets an
+    'error' instead of failing the whole standup; AIServiceError is only raised
+    when no project has a summary at all.
+    """
+    fingerprints, stored, changed = load_stored_summaries(project_summaries)
+
+    def summarize(proj):
+        try:
+            return ai_client.chat(project_messages(proj), max_tokens=max_tokens, temperature=0.6), None
+        except AIServiceError as e:
+            return None, e
+
+    # Only changed projects reach the LLM, a few of them at a time
+    new_summaries = {}
+    errors = {}
+    if changed:
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(changed))) as executor:
+            for proj, (text, error) in zip(changed, executor.map(summarize, changed)):
+                if error is None:
+                    new_summaries[proj['id']] = text
+                else:
+                    errors[proj['id']] = error
+
+    save_summaries(new_summaries, fingerprints, stored)
+    standup, projects = merge_standup(project_summaries, stored, new_summaries, errors)
+    if errors and not any(proj['summary'] for proj in projects):
+        raise next(iter(errors.values()))
+    return standup, projects
+
+
+def stream_standup(project_summaries, ai_client, max_tokens=120):
+    """
+    Same as generate_standup but yields (event, data) pairs as soon as they are available:
+    'project' for each stored summary, 'token' while a changed project is being summarized
+    and a final 'done' with the merged standup. A project the LLM fails on gets a
+    'project' event with an 'error' and the stream goes on with the next one.
+    """
+    fingerprints, stored, changed = load_stored_summaries(project_summaries)
+    changed_ids = {proj['id'] for proj in changed}
+
+    for proj in project_summaries:
+        if proj['id'] not in changed_ids:
+            yield 'project', {'project_id': proj['id'], 'title': proj['title'],
+                              'summary': stored[proj['id']][2], 'cached': True}
+
+    new_summaries = {}
+    errors = {}
+    for proj in changed:
+        tokens = []
+        try:
+            for token in ai_client.chat_stream(project_messages(proj), max_tokens=max_tokens, temperature=0.6):
+                tokens.append(token)
+                yield 'token', {'project_id': proj['id'], 'title': proj['title'], 'token': token}
+        except AIServiceError as e:
+            errors[proj['id']] = e
+            yield 'project', {'project_id': proj['id'], 'title': proj['title'],
+                              'summary': stored[proj['id']][2] if proj['id'] in stored else None,
+                              'cached': proj['id'] in stored, 'error': e.message}
+            continue
+        new_summaries[proj['id']] = ''.join(tokens).strip()
+        yield 'project', {'project_id': proj['id'], 'title': proj['title'],
+                          'summary': new_summaries[proj['id']], 'cached': False}
+
+    save_summaries(new_summaries, fingerprints, stored)
+    standup, projects = merge_standup(project_summaries, stored, new_summaries, errors)
+    yield 'done', {'standup': standup, 'projects': projects}
@@ -0,0 +1,206 @@
+"""
+Bulk task import and export in NDJSON (one JSON object per line) or CSV.
+Imports read the request body as a stream, validate each chunk of rows against
+the task statuses and the project participants already loaded in memory, and insert
+it with bulk INSERTs inside a single transaction: either every row is imported or none.
+Exports read tasks with a server-side cursor and write them row by row.
+
+Fields: title (required), description, status, assigned_to_id, tags, created_at (ISO 8601).
+In CSV, tags are separated with ';'.
+"""
+
+import io
+import csv
+import json
+import datetime
+from sqlalchemy import insert
+from api.models import db, Task, Tags
+
+EXPORT_FIELDS = ['id', 'title', 'description', 'status', 'created_at', 'author_id', 'assigned_to_id', 'tags']
+MAX_REPORTED_ERRORS = 100
+
+
+def detect_format(mimetype, requested=None):
+    if requested in ('csv', 'ndjson'):
+        return requested
+    return 'csv' if mimetype == 'text/csv' else 'ndjson'
+
+
+def read_rows(stream, fmt):
+    """ Yields (line_number, row_dict_or_None, error_or_None) from a binary stream """
+    text = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+    if fmt == 'csv':
+        # Quoted fields can span lines: the reader knows the line a row ends on
+        reader = csv.DictReader(text)
+        for row in reader:
+            yield reader.line_num, row, None
+        return
+
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield line_number, None, 'Invalid JSON'
+            continue
+        if not isinstance(row, dict):
+            yield line_number, None, 'Each line must be a JSON object'
+            continue
+        yield line_number, row, None
+
+
+def _text(row, field):
+    """ A text field of a row: None or a string, JSON lines can hold anything """
+    value = row.get(field)
+    if value is not None and not isinstance(value, str):
+        raise ValueError(f'{field} must be a string')
+    return value
+
+
+def parse_row(row, status_mapping, assignable_ids):
+    """ Returns (task_values, tags) for a row, raises ValueError with the reason if it is not valid """
+    title = (_text(row, 'title') or '').strip()
+    if not title:
+        raise ValueError('Missing title')
+    if len(title) > 120:
+        raise ValueError('Title longer than 120 characters')
+
+    status = (_text(row, 'status') or 'in progress').strip()
+    if status not in status_mapping:
+        raise ValueError(f'Invalid task status: {status}')
+
+    description = _text(row, 'description')
+
+    assigned_to_id = row.get('assigned_to_id')
+    if assigned_to_id in (None, ''):
+        assigned_to_id = None
+    else:
+        if isinstance(assigned_to_id, bool) or not isinstance(assigned_to_id, (int, str)):
+            raise ValueError('assigned_to_id must be a user id')
+        try:
+            assigned_to_id = int(assigned_to_id)
+        except ValueError:
+            raise ValueError('assigned_to_id must be a user id')
+        if assigned_to_id not in assignable_ids:
+            raise ValueError(f'Cannot assign task to user {assigned_to_id}')
+
+    created_at = _text(row, 'created_at')
+    if created_at:
+        try:
+            created_at = datetime.datetime.fromisoformat(created_at)
+        except (TypeError, ValueError):
+            raise ValueError('created_at must be an ISO 8601 date')
+    else:
+        created_at = None
+
+    tags = row.get('tags') or []
+    if isinstance(tags, str):
+        tags = tags.split(';')
+    if not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
+        raise ValueError('tags must be a list of strings')
+    tags = [tag.strip()[:120] for tag in tags if tag.strip()]
+
+    return {
+        'title': title,
+        'description': description or None,
+        'status': status_mapping[status],
+        'assigned_to_id': assigned_to_id,
+        'created_at': created_at,
+    }, tags
+
+
+def _insert_chunk(chunk, project_id, author_id):
+    now = datetime.datetime.now()
+
+    def task_row(values):
+        return {
+            **values,
+            'created_at': values['created_at'] or now,
+            'project_id': project_id,
+            'author_id': author_id,
+        }
+
+    # Core inserts on the tables: the ORM splits a bulk insert every time the set of
+    # NULL columns changes between rows. Only tasks with tags need their new ids back,
+    # RETURNING in parameter order is batched on PostgreSQL but row by row on SQLite
+    task_table = Task.__table__
+    untagged = [task_row(values) for values, tags in chunk if not tags]
+    tagged = [(task_row(values), tags) for values, tags in chunk if tags]
+    if untagged:
+        db.session.execute(insert(task_table), untagged)
+    if tagged:
+        task_ids = db.session.execute(
+            insert(task_table).returning(task_table.c.id, sort_by_parameter_order=True),
+            [row for row, _ in tagged]
+        ).scalars().all()
+        db.session.execute(insert(Tags.__table__), [
+            {'task_id': task_id, 'tag': tag}
+            for task_id, (_, tags) in zip(task_ids, tagged) for tag in tags
+        ])
+
+
+def import_tasks(rows, project_id, author_id, status_mapping, assignable_ids, chunk_size=500):
+    """
+    Imports the rows from read_rows() in chunks. Does not commit.
+    Returns (imported, errors); when there are errors nothing should be committed.
+    """
+    imported = 0
+    errors = []
+    chunk = []
+    for line_number, row, error in rows:
+        if error is None:
+            try:
+                chunk.append(parse_row(row, status_mapping, assignable_ids))
+            except ValueError as e:
+                error = str(e)
+        if error is not None:
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append({'line': line_number, 'error': error})
+            chunk = []
+            continue
+        # Once a row failed the import is rejected, the rest is only validated
+        if not errors and len(chunk) >= chunk_size:
+            _insert_chunk(chunk, project_id, author_id)
+            imported += len(chunk)
+            chunk = []
+        elif errors:
+            chunk = []
+
+    if chunk and not errors:
+        _insert_chunk(chunk, project_id, author_id)
+        imported += len(chunk)
+    return imported, errors
+
+
+def export_row(task):
+    return {
+        'id': task.id,
+        'title': task.title,
+        'description': task.description,
+        'status': task.status.value,
+        'created_at': task.created_at.isoformat() if task.created_at else None,
+        'author_id': task.author_id,
+        'assigned_to_id': task.assigned_to_id,
+        'tags': [tag.tag for tag in task.tags],
+    }
+
+
+def export_tasks(tasks, fmt):
+    """ Yields the export of an iterable of tasks (ideally a yield_per query) line by line """
+    if fmt == 'csv':
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+        writer.writeheader()
+        for task in tasks:
+            row = export_row(task)
+            row['tags'] = ';'.join(row['tags'])
+            writer.writerow(row)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        yield buffer.getvalue()
+        return
+
+    for task in tasks:
+        yield json.dumps(export_row(task)) + '\n'
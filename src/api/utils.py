@@ -1,7 +1,12 @@
 import os
 import jwt
+import json
+import time
 import datetime
-from flask import jsonify, url_for
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
+from flask import Response, jsonify, url_for, stream_with_context
 
 # JWT Creation
 def create_token(user_id):
@@ -42,4 +47,156 @@ def generate_sitemap(app):
     return jsonify(sitemap=output)
 
 
+# Small in-process cache with expiration and LRU eviction.
+# Every gunicorn worker has its own copy, so keep the TTL short for data that can change.
+class TTLCache:
+    def __init__(self, ttl=30, maxsize=1024):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
 
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            value, expires_at = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        """ ttl overrides the default lifetime, capped by it """
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._data[key] = (value, time.monotonic() + ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+# One value per process, created on first use.
+# Gunicorn forks its workers after importing the app, and a fork copies neither threads nor
+# a usable process pool, and it leaves sockets shared with the parent. Background threads,
+# pools and connection pools are therefore created lazily by the process that uses them:
+# get() calls factory() again in a new process, or when is_alive(value) says it is gone.
+class PerProcess:
+    def __init__(self, factory, is_alive=None):
+        self.factory = factory
+        self.is_alive = is_alive
+        self._value = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _usable(self):
+        return self._pid == os.getpid() and (self.is_alive is None or self.is_alive(self._value))
+
+    def get(self):
+        if self._usable():
+            return self._value
+        with self._lock:
+            if not self._usable():
+                self._value = self.factory()
+                self._pid = os.getpid()
+            return self._value
+
+    def reset(self, value=None):
+        """ Forgets the value (only if it is still `value`, when given), returns the one dropped """
+        with self._lock:
+            if self._value is None or (value is not None and self._value is not value):
+                return None
+            dropped, self._value, self._pid = self._value, None, None
+            return dropped
+
+
+# Streaming JSON responses
+# Iterators inside the payload are written item by item, so big lists never sit in memory,
+# and callables are evaluated when reached (e.g. a total counted while streaming the list).
+def iter_json(value):
+    if isinstance(value, dict):
+        yield '{'
+        for i, (key, item) in enumerate(value.items()):
+            yield (', ' if i else '') + json.dumps(key) + ': '
+            yield from iter_json(item)
+        yield '}'
+    elif isinstance(value, (list, tuple, Iterator)):
+        yield '['
+        for i, item in enumerate(value):
+            if i:
+                yield ', '
+            yield from iter_json(item)
+        yield ']'
+    elif callable(value):
+        yield from iter_json(value())
+    else:
+        yield json.dumps(value)
+
+
+def stream_json(payload, status_code=200, chunk_size=64 * 1024):
+    response = stream_lines(iter_json(payload), 'application/json', chunk_size=chunk_size)
+    response.status_code = status_code
+    return response
+
+
+def stream_lines(lines, mimetype, filename=None, chunk_size=64 * 1024):
+    # Pieces of text (lines of NDJSON or CSV, JSON tokens) are sent in chunks of about
+    # chunk_size characters instead of one write per piece
+    def generate():
+        buffer = []
+        size = 0
+        for line in lines:
+            buffer.append(line)
+            size += len(line)
+            if size >= chunk_size:
+                yield ''.join(buffer)
+                buffer = []
+                size = 0
+        yield ''.join(buffer)
+
+    response = Response(stream_with_context(generate()), mimetype=mimetype)
+    if filename:
+        response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+    return response
+
+
+def sse_event(data, event=None, event_id=None):
+    # One server-sent event, data is sent as JSON. Browsers send the last
+    # event_id back in the Last-Event-ID header when they reconnect
+    message = f'id: {event_id}\n' if event_id is not None else ''
+    message += f'event: {event}\n' if event else ''
+    return message + f'data: {json.dumps(data)}\n\n'
+
+
+def stream_sse(events):
+    response = Response(stream_with_context(events), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Tell proxies like nginx not to buffer the stream
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+class CountedIterator:
+    def __init__(self, iterable):
+        self._iterator = iter(iterable)
+        self.count = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        item = next(self._iterator)
+        self.count += 1
+        return item
@@ -1,20 +1,35 @@
 import os
+import json
+import hashlib
 import datetime
 import random
 import uuid
+import time
+from itertools import groupby
 
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, request, jsonify, send_from_directory, make_response
 from flask_migrate import Migrate
 from sqlalchemy.exc import IntegrityError
 
-from api.utils import APIException, generate_sitemap
-from api.models import db, User, Project, Task, RestorePassword, ProjectStatus, Project_Member, TaskStatus
-
+from api.utils import APIException, TTLCache, CountedIterator, generate_sitemap, stream_json, stream_lines, stream_sse, sse_event
+from api.models import db, User, Project, Task, RestorePassword, ProjectStatus, Project_Member, TaskStatus, ProjectChange
+from api.queries import task_load_options, task_export_load_options, project_summary_load_options, get_user_projects, user_projects_queries, get_project_graph, get_project_counts, get_project_role, get_project_participant_ids, filter_tasks, paginate_tasks, get_standup_data, add_members_bulk, get_user_project_revisions, get_project_revision
+
+from api.mail_queue import mail_queue
+from api.email_templates import email_templates
+from api.ai_client import ai_client, AIServiceError
+from api.ai_cache import suggestion_cache
+from api.standup import generate_standup, stream_standup
+from api.task_io import detect_format, read_rows, import_tasks, export_tasks
+from api.changes import TASK_COLUMNS, change, task_state, project_state, record_changes, record_user_change, get_changes
+from api.notifications import notifier, TooManySubscribers
+from api.passwords import password_hasher, PasswordHasherBusy
+from api.rate_limit import rate_limiter, RateLimitExceeded
+from api.maintenance import maintenance
 from api.admin import setup_admin
 from api.commands import setup_commands
 
-from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_jwt_identity
-from werkzeug.security import generate_password_hash, check_password_hash
+from flask_jwt_extended import JWTManager, create_access_token, jwt_required, get_current_user, get_jwt
 from flask_mail import Mail, Message
 from flask_cors import CORS
 
@@ -61,26 +76,132 @@ app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['JWT_SECRET_KEY'] = os.getenv("JWT_SECRET_KEY", "super-secret-key")
 app.config['JWT_ACCESS_TOKEN_EXPIRES'] = datetime.timedelta(hours=3)
 
+# TASK PAGINATION CONFIG
+app.config['TASKS_PAGE_SIZE'] = int(os.getenv("TASKS_PAGE_SIZE", 50))
+app.config['TASKS_MAX_PAGE_SIZE'] = int(os.getenv("TASKS_MAX_PAGE_SIZE", 500))
+
+# STREAMING CONFIG (rows fetched per round-trip when streaming with ?stream=1)
+app.config['STREAM_BATCH_SIZE'] = int(os.getenv("STREAM_BATCH_SIZE", 200))
+
+# TASK BATCH UPDATE CONFIG (max task ids per PATCH /api/project/<id>/tasks)
+app.config['TASKS_BATCH_UPDATE_MAX'] = int(os.getenv("TASKS_BATCH_UPDATE_MAX", 1000))
+
+# CHANGE FEED CONFIG (max revisions per GET /api/project/<id>/changes)
+app.config['CHANGES_PAGE_SIZE'] = int(os.getenv("CHANGES_PAGE_SIZE", 100))
+
+# LIVE NOTIFICATIONS CONFIG (see api/notifications.py): 'memory' for a single
+# worker, 'redis' to reach the clients connected to every worker
+app.config['NOTIFY_BACKEND'] = os.getenv("NOTIFY_BACKEND", "memory")
+app.config['NOTIFY_REDIS_URL'] = os.getenv("NOTIFY_REDIS_URL", os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+# Every open event stream holds one gunicorn thread: half of GUNICORN_THREADS at most by
+# default, so the rest of the API keeps threads. Over the limit clients poll the change feed
+app.config['NOTIFY_MAX_SUBSCRIBERS'] = int(os.getenv(
+    "NOTIFY_MAX_SUBSCRIBERS", max(1, int(os.getenv("GUNICORN_THREADS", 8)) // 2)))
+
+# TASK IMPORT CONFIG (rows per bulk INSERT, all chunks share one transaction)
+app.config['TASK_IMPORT_CHUNK_SIZE'] = int(os.getenv("TASK_IMPORT_CHUNK_SIZE", 500))
+
+# AI STANDUP CONFIG (latest task titles sent to the LLM per project)
+app.config['STANDUP_TASK_TITLES'] = int(os.getenv("STANDUP_TASK_TITLES", 10))
+# Projects summarized in parallel when several changed since the last standup
+app.config['STANDUP_CONCURRENCY'] = int(os.getenv("STANDUP_CONCURRENCY", 4))
+
+# AI CLIENT CONFIG (see api/ai_client.py)
+app.config['MISTRAL_API_KEY'] = os.getenv("MISTRAL_API_KEY")
+app.config['AI_CONNECT_TIMEOUT'] = float(os.getenv("AI_CONNECT_TIMEOUT", 3.05))
+app.config['AI_READ_TIMEOUT'] = float(os.getenv("AI_READ_TIMEOUT", 30))
+app.config['AI_MAX_RETRIES'] = int(os.getenv("AI_MAX_RETRIES", 2))
+app.config['AI_SUGGESTION_CACHE_TTL'] = int(os.getenv("AI_SUGGESTION_CACHE_TTL", 24 * 60 * 60))
+app.config['AI_SUGGESTION_CACHE_DB'] = os.getenv("AI_SUGGESTION_CACHE_DB", "1") == "1"
+
+# PASSWORD HASHING CONFIG (see api/passwords.py)
+app.config['PASSWORD_HASH_METHOD'] = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+# Hashing processes per worker, 0 hashes in the request thread
+app.config['PASSWORD_HASH_WORKERS'] = int(os.getenv("PASSWORD_HASH_WORKERS", min(2, os.cpu_count() or 1)))
+
+# RATE LIMIT CONFIG (see api/rate_limit.py): 'memory' counts per worker, 'redis' shares the counts
+app.config['RATE_LIMIT_ENABLED'] = os.getenv("RATE_LIMIT_ENABLED", "1") == "1"
+app.config['RATE_LIMIT_STORAGE'] = os.getenv("RATE_LIMIT_STORAGE", "memory")
+app.config['RATE_LIMIT_REDIS_URL'] = os.getenv("RATE_LIMIT_REDIS_URL", os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+app.config['RATE_LIMIT_TRUSTED_PROXIES'] = int(os.getenv("RATE_LIMIT_TRUSTED_PROXIES", 1 if ENV == "production" else 0))
+
+# MAINTENANCE CONFIG (see api/maintenance.py): seconds between cleanups of expired
+# password reset tokens in each worker, 0 leaves it to $ flask delete-expired-tokens
+app.config['MAINTENANCE_INTERVAL_SECONDS'] = int(os.getenv("MAINTENANCE_INTERVAL_SECONDS", 0))
+
+# PROFILE CACHE CONFIG (seconds, 0 disables it). Only GET /api/profile/<id> is cached.
+# Each worker has its own cache and an update or delete only evicts the entry in the
+# worker that handled it, so the other workers can serve the old profile, or a deleted
+# user, for up to this many seconds. Keep it short.
+app.config['PROFILE_CACHE_TTL'] = int(os.getenv("PROFILE_CACHE_TTL", 10))
+
 # MAIL CONFIG
 app.config.update(
-    MAIL_SERVER='smtp.gmail.com',
-    MAIL_PORT=587,
-    MAIL_USE_TLS=True,
+    MAIL_SERVER=os.getenv('MAIL_SERVER', 'smtp.gmail.com'),
+    MAIL_PORT=int(os.getenv('MAIL_PORT', 587)),
+    MAIL_USE_TLS=os.getenv('MAIL_USE_TLS', '1') == '1',
     MAIL_USE_SSL=False,
+    # MAIL_SUPPRESS_SEND=1 records mails instead of sending them (local development)
+    MAIL_SUPPRESS_SEND=os.getenv('MAIL_SUPPRESS_SEND') == '1',
     MAIL_USERNAME=os.getenv('MAIL_DEFAULT_SENDER'),
     MAIL_DEFAULT_SENDER=os.getenv('MAIL_DEFAULT_SENDER'),
     MAIL_PASSWORD=os.getenv('MAIL_PASSWORD'),
     DEBUG=True
 )
 
+# EMAIL TEMPLATES CONFIG (recompile templates on change only in development)
+app.config['EMAIL_TEMPLATES_AUTO_RELOAD'] = ENV == "development"
+
+# MAIL QUEUE CONFIG (see api/mail_queue.py)
+app.config['MAIL_QUEUE_ASYNC'] = os.getenv('MAIL_QUEUE_ASYNC', '1') == '1'
+app.config['MAIL_QUEUE_WORKERS'] = int(os.getenv('MAIL_QUEUE_WORKERS', 1))
+app.config['MAIL_QUEUE_MAX_ATTEMPTS'] = int(os.getenv('MAIL_QUEUE_MAX_ATTEMPTS', 5))
+
 # INIT EXTENSIONS
 db.init_app(app)
 migrate = Migrate(app, db, compare_type=True)
 jwt = JWTManager(app)
 mail = Mail(app)
+mail_queue.init_app(app, mail)
+email_templates.init_app(app, template_dir)
+ai_client.init_app(app)
+suggestion_cache.init_app(app)
+notifier.init_app(app)
+password_hasher.init_app(app)
+rate_limiter.init_app(app)
+maintenance.init_app(app)
 setup_admin(app)
 setup_commands(app)
 
+profile_cache = TTLCache(ttl=app.config['PROFILE_CACHE_TTL'], maxsize=2048)
+
+# JWT USER LOADING
+# The authenticated user is loaded once per request by flask_jwt_extended
+# and handlers read it with get_current_user().
+
+
+def token_user_id(jwt_data):
+    """ User id of a token, None if the subject is not a valid id """
+    try:
+        return int(jwt_data.get("sub"))
+    except (TypeError, ValueError):
+        return None
+
+
+@jwt.user_lookup_loader
+def user_lookup_callback(_jwt_header, jwt_data):
+    user_id = token_user_id(jwt_data)
+    if user_id is None:
+        return None
+    return db.session.get(User, user_id)
+
+
+@jwt.user_lookup_error_loader
+def user_lookup_error_callback(_jwt_header, jwt_data):
+    if token_user_id(jwt_data) is None:
+        return jsonify({'msg': 'Invalid token'}), 401
+    return jsonify({'msg': 'User not found'}), 404
+
 # ERROR HANDLER
 
 
@@ -88,6 +209,26 @@ setup_commands(app)
 def handle_invalid_usage(error):
     return jsonify(error.to_dict()), error.status_code
 
+
+@app.errorhandler(RateLimitExceeded)
+def handle_rate_limit_exceeded(error):
+    response = jsonify({'msg': 'Demasiados intentos, inténtalo de nuevo más tarde', 'retry_after': error.retry_after})
+    response.headers['Retry-After'] = str(error.retry_after)
+    return response, 429
+
+
+@app.errorhandler(TooManySubscribers)
+def handle_too_many_subscribers(error):
+    retry_after = app.config['NOTIFY_RETRY_AFTER']
+    response = jsonify({'msg': 'Too many live connections, poll the change feed instead', 'retry_after': retry_after})
+    response.headers['Retry-After'] = str(retry_after)
+    return response, 503
+
+
+@app.errorhandler(PasswordHasherBusy)
+def handle_password_hasher_busy(error):
+    return jsonify({'msg': 'Servidor ocupado, inténtalo de nuevo en unos segundos'}), 503
+
 # SITEMAP (DEV ONLY)
 
 
@@ -130,7 +271,7 @@ def register():
     phone = body.get('phone')
     profile_picture_url = body.get('profile_picture_url')
     random_profile_color = random.randint(0, 9)
-    hashed_password = generate_password_hash(body['password'])
+    hashed_password = password_hasher.hash(body['password'])
 
     new_user = User(
         full_name=body['full_name'],
@@ -150,20 +291,12 @@ def register():
         db.session.rollback()
         return jsonify({'msg': 'Ingresa un email distinto.'}), 400
 
-    # Send welcome email
-    path = os.path.join(template_dir, 'Welcome.html')
-    if os.path.exists(path):
-        with open(path, 'r') as f:
-            html_content = f.read()
-        msg = Message(
-            subject="Hello, welcome to EchoBoard!",
-            recipients=[new_user.email],
-        )
-        msg.html = html_content
-        try:
-            mail.send(msg)
-        except Exception as e:
-            return jsonify({'msg': f'Mail error: {str(e)}'}), 500
+    # Queue welcome email, it is delivered in the background
+    mail_queue.enqueue(
+        subject="Hello, welcome to EchoBoard!",
+        recipients=[new_user.email],
+        html=email_templates.render('Welcome.html', user=new_user)
+    )
 
     return jsonify({'msg': 'ok', 'new_user': new_user.serialize()}), 201
 
@@ -174,10 +307,21 @@ def login():
     if not body or 'email' not in body or 'password' not in body:
         return jsonify({'msg': 'Email y contraseña requeridos'}), 400
 
+    # Before any query or hash check, a rejected attempt costs nothing
+    rate_limiter.hit('login', email=str(body['email']))
+
     user = User.query.filter_by(email=body['email']).first()
-    if not user or not check_password_hash(user.password, body['password']):
+    if not user:
+        return jsonify({'msg': 'Credenciales inválidas'}), 401
+    valid, new_hash = password_hasher.verify(user.password, body['password'])
+    if not valid:
         return jsonify({'msg': 'Credenciales inválidas'}), 401
 
+    if new_hash:
+        # Hash made with an older method or parameters, upgraded now that we know the password
+        user.password = new_hash
+        db.session.commit()
+
     token = create_access_token(identity=str(user.id))
     return jsonify({
         "access_token": token,
@@ -192,17 +336,12 @@ def verification_token():
 
 @app.route('/api/test-mail/<string:email>', methods=['GET'])
 def test_mail(email):
-    path = os.path.join(template_dir, 'Test.html')
-    
-    if os.path.exists(path):
-        with open(path, 'r') as file:
-            html_content = file.read()
-        msg = Message(
-            subject="Test mail",
-            recipients=[email],
-        )
-        msg.html = html_content
-        
+    msg = Message(
+        subject="Test mail",
+        recipients=[email],
+    )
+    msg.html = email_templates.render('Test.html')
+
     try:
         mail.send(msg)
         return jsonify({'msg': 'Test email sent!'}), 200
@@ -215,6 +354,8 @@ def restore_password():
     if body is None or not body.get('email', '').strip():
         return jsonify({'msg': 'Debes enviar un email válido'}), 400
 
+    rate_limiter.hit('restore_password', email=body['email'])
+
     user = User.query.filter_by(email=body['email']).first()
     if not user:
         return jsonify({'msg': 'User not found'}), 404
@@ -237,21 +378,12 @@ def restore_password():
     frontend_url = os.getenv('FRONTEND_URL') or "http://localhost:3000"
     restore_link = f"{frontend_url}/restore-password/{token}"
 
-    # Send password reset email
-    path = os.path.join(template_dir, 'RestorePassword.html')
-    if os.path.exists(path):
-        with open(path, 'r') as f:
-            html_content = f.read()
-        html_content = html_content.replace('{{restore_link}}', restore_link)
-        msg = Message(
-            subject="Password Reset Request",
-            recipients=[user.email],
-        )
-        msg.html = html_content
-        try:
-            mail.send(msg)
-        except Exception as e:
-            return jsonify({'msg': f'Mail error: {str(e)}'}), 500
+    # Queue password reset email, it is delivered in the background
+    mail_queue.enqueue(
+        subject="Password Reset Request",
+        recipients=[user.email],
+        html=email_templates.render('RestorePassword.html', restore_link=restore_link)
+    )
 
     return jsonify({'msg': 'Password reset email sent'}), 200
 
@@ -270,7 +402,7 @@ def restore_password_confirmation(token):
     if not user:
         return jsonify({'msg': 'User not found'}), 404
 
-    user.password = generate_password_hash(body['new_password'])
+    user.password = password_hasher.hash(body['new_password'])
     db.session.commit()
 
     # Delete the restore password request
@@ -283,28 +415,26 @@ def restore_password_confirmation(token):
 @app.route('/api/profile', methods=['GET'])
 @jwt_required()
 def get_profile():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user:
-        return jsonify({'msg': 'User not found'}), 404
+    user = get_current_user()
     return jsonify({'user': user.serialize()}), 200
 
 @app.route('/api/profile/<int:user_id>', methods=['GET'])
 @jwt_required()
-def get_profile_by(user_id):    
-    user = User.query.get(user_id)
-    if not user:
-        return jsonify({'msg': 'User not found'}), 404
-    return jsonify({'user': user.serialize()}), 200
+def get_profile_by(user_id):
+    profile = profile_cache.get(user_id)
+    if profile is None:
+        user = User.query.get(user_id)
+        if not user:
+            return jsonify({'msg': 'User not found'}), 404
+        profile = user.serialize()
+        profile_cache.set(user_id, profile)
+    return jsonify({'user': profile}), 200
 
 
 @app.route('/api/profile', methods=['PUT'])
 @jwt_required()
 def update_profile():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user:
-        return jsonify({'msg': 'User not found'}), 404
+    user = get_current_user()
     body = request.get_json(silent=True)
     if not body:
         return jsonify({'msg': 'Missing body'}), 400
@@ -322,7 +452,9 @@ def update_profile():
     if 'profile_picture_url' in body:
         user.profile_picture_url = body['profile_picture_url']
     try:
+        record_user_change(user.id, 'updated', user.serialize())
         db.session.commit()
+        profile_cache.delete(user.id)
         return jsonify({'msg': 'Profile updated', 'user': user.serialize()}), 200
     except Exception:
         db.session.rollback()
@@ -364,10 +496,7 @@ def user_alias():
 @app.route('/api/user', methods=['DELETE'])
 @jwt_required()
 def delete_user():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user:
-        return jsonify({'msg': 'User not found'}), 404
+    user = get_current_user()
 
     # Optional: delete all user-related objects
     # Remove user from all projects
@@ -376,9 +505,11 @@ def delete_user():
     # Project.query.filter_by(admin_id=user_id).delete()
     # Remove user's tasks, comments, etc, as needed
 
+    record_user_change(user.id, 'deleted')
     db.session.delete(user)
     try:
         db.session.commit()
+        profile_cache.delete(user.id)
         return jsonify({'msg': 'User deleted successfully'}), 200
     except Exception:
         db.session.rollback()
@@ -390,10 +521,7 @@ def delete_user():
 @app.route('/api/project', methods=['POST'])
 @jwt_required()
 def new_project():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user:
-        return jsonify({'msg': 'User not found'}), 404
+    user = get_current_user()
     body = request.get_json(silent=True)
     if body is None:
         return jsonify({'msg': 'Debes enviar información en el body'}), 400
@@ -429,28 +557,10 @@ def new_project():
     member_errors = []
 
     if member_emails and isinstance(member_emails, list):
-        for email in member_emails:
-            if not email or not email.strip():
-                continue
-
-            member_user = User.query.filter_by(email=email.strip()).first()
-            if not member_user:
-                member_errors.append(f"User with email {email} not found")
-                continue
-
-            if member_user.id == user.id:
-                member_errors.append(f"Cannot add admin as member")
-                continue
-
-            new_member = Project_Member(
-                project_id=new_project.id,
-                member_id=member_user.id
-            )
-            db.session.add(new_member)
-            added_members.append({
-                'email': member_user.email,
-                'full_name': member_user.full_name
-            })
+        added, results = add_members_bulk(new_project, member_emails)
+        added_members = [{'email': member['email'], 'full_name': member['full_name']}
+                         for member in added]
+        member_errors = [result['msg'] for result in results if result['msg']]
 
     try:
         db.session.commit()
@@ -472,24 +582,99 @@ def new_project():
         return jsonify({'msg': 'Error creating project'}), 500
 
 
+# CONDITIONAL GET
+# Project, project list and task list responses carry a strong ETag built from the
+# revision of the projects involved (Project.revision, bumped by every write that changes
+# them). A request with a matching If-None-Match gets a 304 from that single cheap
+# lookup, without loading or serializing the project graph.
+
+
+def make_etag(*parts):
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+def not_modified(etag):
+    """ 304 response if the client already has this version, None otherwise """
+    if etag in request.if_none_match:
+        response = app.response_class(status=304)
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'private, no-cache'
+        return response
+    return None
+
+
+def with_etag(response, etag):
+    response = make_response(response)
+    response.set_etag(etag)
+    # Clients may keep it but have to revalidate it every time
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def wants_stream():
+    """ ?stream=1 asks large collection endpoints for a streamed JSON response """
+    return request.args.get('stream') in ('1', 'true')
+
+
+def stream_user_projects(user_id):
+    # Projects are fetched in batches with a server-side cursor and serialized one by one
+    admin_projects, member_projects = user_projects_queries(user_id)
+    batch_size = app.config['STREAM_BATCH_SIZE']
+    return stream_json({
+        'msg': 'Projects retrieved successfully',
+        'user_projects': {
+            'admin': (project.serialize() for project in admin_projects.yield_per(batch_size)),
+            'member': (project.serialize() for project in member_projects.yield_per(batch_size))
+        }
+    })
+
+
+def serialize_user_projects(user_id):
+    """
+    Serialized (admin, member) project lists for a user.
+    ?view=summary returns counts per status instead of the full tasks and members lists.
+    """
+    if request.args.get('view') == 'summary':
+        admin_projects, member_projects = get_user_projects(
+            user_id, project_summary_load_options())
+        task_counts, member_counts = get_project_counts(
+            [project.id for project in admin_projects + member_projects])
+        return (
+            [project.serialize_summary(task_counts.get(project.id), member_counts.get(project.id, 0))
+             for project in admin_projects],
+            [project.serialize_summary(task_counts.get(project.id), member_counts.get(project.id, 0))
+             for project in member_projects]
+        )
+
+    admin_projects, member_projects = get_user_projects(user_id)
+    return (
+        [project.serialize() for project in admin_projects],
+        [project.serialize() for project in member_projects]
+    )
+
+
 @app.route('/api/projects', methods=['GET'])
 @jwt_required()
 def get_projects():
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user:
-        return jsonify({'msg': 'User not found'}), 404
+    user = get_current_user()
 
-    admin_of = [project.serialize() for project in user.admin_of]
-    member_of = [project.project.serialize() for project in user.member_of]
+    etag = make_etag(request.full_path, user.id, get_user_project_revisions(user.id))
+    cached = not_modified(etag)
+    if cached:
+        return cached
 
-    return jsonify({
+    if wants_stream() and request.args.get('view') != 'summary':
+        return with_etag(stream_user_projects(user.id), etag)
+
+    admin_of, member_of = serialize_user_projects(user.id)
+
+    return with_etag((jsonify({
         'msg': 'Projects retrieved successfully',
         'user_projects': {
             'admin': admin_of,
             'member': member_of
         }
-    }), 200
+    }), 200), etag)
 
 @app.route('/api/projects/<int:user_id>', methods=['GET'])
 @jwt_required()
@@ -498,50 +683,185 @@ def get_projects_by(user_id):
     if not user:
         return jsonify({'msg': 'User not found'}), 404
 
-    admin_of = [project.serialize() for project in user.admin_of]
-    member_of = [project.project.serialize() for project in user.member_of]
+    etag = make_etag(request.full_path, user.id, get_user_project_revisions(user.id))
+    cached = not_modified(etag)
+    if cached:
+        return cached
 
-    return jsonify({
+    if wants_stream() and request.args.get('view') != 'summary':
+        return with_etag(stream_user_projects(user.id), etag)
+
+    admin_of, member_of = serialize_user_projects(user.id)
+
+    return with_etag((jsonify({
         'msg': 'Projects retrieved successfully',
         'user_projects': {
             'admin': admin_of,
             'member': member_of
         }
-    }), 200
+    }), 200), etag)
 
 
 @app.route('/api/project/<int:project_id>', methods=['GET'])
 @jwt_required()
 def get_project(project_id):
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user:
-        return jsonify({'msg': 'User not found'}), 404
+    user = get_current_user()
 
     project = Project.query.get(project_id)
     if not project:
         return jsonify({'msg': 'Project not found'}), 404
 
-    project_members = Project_Member.query.filter_by(
-        project_id=project_id).all()
-
-    if user.id is not project.admin_id and user.id not in [member.member_id for member in project_members]:
+    if get_project_role(project, user.id) is None:
         # If the user is not an admin or a member of the project, return an error
         return jsonify({'msg': 'You are not authorized to view this project'}), 403
 
-    return jsonify({
+    etag = make_etag(request.full_path, user.id, project.revision)
+    cached = not_modified(etag)
+    if cached:
+        return cached
+
+    project = get_project_graph(project_id)
+    return with_etag((jsonify({
         'msg': 'Project retrieved successfully',
         'project': project.serialize()
+    }), 200), etag)
+
+
+@app.route('/api/project/<int:project_id>/changes', methods=['GET'])
+@jwt_required()
+def get_project_changes(project_id):
+    # Deltas since a known revision (see api/changes.py). Clients start from the
+    # 'revision' of this endpoint with ?since=0 or after a full reload of the project
+    user = get_current_user()
+
+    project = Project.query.get(project_id)
+    if not project:
+        return jsonify({'msg': 'Project not found'}), 404
+
+    if get_project_role(project, user.id) is None:
+        return jsonify({'msg': 'You are not authorized to view this project'}), 403
+
+    since = request.args.get('since', type=int)
+    if since is None or since < 0:
+        return jsonify({'msg': 'since must be a revision number'}), 400
+
+    limit = request.args.get('limit', app.config['CHANGES_PAGE_SIZE'], type=int)
+    limit = max(1, min(limit, app.config['CHANGES_PAGE_SIZE']))
+    changes, last_revision, has_more = get_changes(project_id, since, limit)
+    # Read after the changes: a write committed in between is then in the next page,
+    # never skipped. The client goes on from 'revision', the last one it was sent
+    current_revision = get_project_revision(project_id)
+
+    if since > current_revision:
+        # Not a revision of this project (restored database, wrong project...): reload it
+        return jsonify({
+            'msg': 'Unknown revision, reload the project',
+            'current_revision': current_revision,
+            'resync': True
+        }), 409
+
+    return jsonify({
+        'msg': 'Changes retrieved successfully',
+        'revision': last_revision,
+        'current_revision': current_revision,
+        'has_more': has_more,
+        'changes': [entry.serialize() for entry in changes]
     }), 200
 
 
+@app.route('/api/project/<int:project_id>/events', methods=['GET'])
+@jwt_required()
+def project_events(project_id):
+    # Live changes of a project as server-sent events, one 'change' event per revision
+    # with the same entries as the change feed. With ?since=<rev> (or the Last-Event-ID
+    # header of a reconnecting browser) the changes missed since then are sent first.
+    # Access is checked again every heartbeat: the stream ends with a 'revoked' event once
+    # the user is no longer in the project or the token expired.
+    user = get_current_user()
+
+    project = Project.query.get(project_id)
+    if not project:
+        return jsonify({'msg': 'Project not found'}), 404
+
+    if get_project_role(project, user.id) is None:
+        return jsonify({'msg': 'You are not authorized to view this project'}), 403
+
+    since = request.args.get('since', type=int)
+    if since is None:
+        since = request.headers.get('Last-Event-ID', type=int)
+    current_revision = project.revision
+    user_id = user.id
+    expires_at = get_jwt().get('exp')
+    heartbeat = app.config['NOTIFY_HEARTBEAT_SECONDS']
+
+    # Subscribed before reading the backlog, so no change falls in between
+    subscription = notifier.subscribe(project_id)
+
+    def has_access():
+        if expires_at is not None and time.time() >= expires_at:
+            return False
+        try:
+            project = db.session.get(Project, project_id)
+            return project is not None and get_project_role(project, user_id) is not None
+        finally:
+            db.session.close()
+
+    def events():
+        last_revision = since
+        with subscription:
+            yield sse_event({'project_id': project_id, 'revision': current_revision}, 'ready')
+
+            has_more = since is not None
+            while has_more:
+                changes, page_revision, has_more = get_changes(
+                    project_id, last_revision, app.config['CHANGES_PAGE_SIZE'])
+                for revision, entries in groupby(changes, key=lambda entry: entry.revision):
+                    yield sse_event({
+                        'project_id': project_id,
+                        'revision': revision,
+                        'changes': [entry.serialize() for entry in entries]
+                    }, 'change', revision)
+                last_revision = page_revision
+
+            # The stream can stay open for hours, it must not hold a database connection
+            db.session.close()
+
+            check_at = time.monotonic() + heartbeat
+            while True:
+                if subscription.overflowed:
+                    # Messages were dropped: the client has to catch up with ?since=
+                    yield sse_event({'project_id': project_id, 'revision': last_revision}, 'resync')
+                    return
+                if time.monotonic() >= check_at:
+                    if not has_access():
+                        yield sse_event({'project_id': project_id}, 'revoked')
+                        return
+                    check_at = time.monotonic() + heartbeat
+                message = subscription.get(timeout=max(0, check_at - time.monotonic()))
+                if message is None:
+                    # Keeps proxies from closing an idle connection and detects gone clients
+                    yield ': ping\n\n'
+                    continue
+                data = json.loads(message)
+                if last_revision is not None and data['revision'] <= last_revision:
+                    continue
+                last_revision = data['revision']
+                if any(entry['entity'] in ('member', 'user') and entry['entity_id'] == user_id
+                       for entry in data['changes']):
+                    # The user was removed from the project or deleted: check before going on
+                    check_at = 0
+                yield sse_event(data, 'change', data['revision'])
+
+    response = stream_sse(events())
+    # Frees the subscription even when the client leaves before the stream starts
+    response.call_on_close(subscription.close)
+    return response
+
+
 @app.route('/api/project/<int:project_id>', methods=['PUT'])
 @jwt_required()
 def edit_project(project_id):
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user:
-        return jsonify({'msg': 'User not found'}), 404
+    user = get_current_user()
 
     project = Project.query.get(project_id)
     if not project:
@@ -571,6 +891,7 @@ def edit_project(project_id):
             project.status = PROJECT_STATUS_MAPPING[body['status']]
 
     try:
+        record_changes(project.id, [change('project', project.id, 'updated', project_state(project))], user.id)
         db.session.commit()
         return jsonify({'msg': 'Project updated successfully', 'project': project.serialize()}), 200
     except Exception as e:
@@ -581,10 +902,7 @@ def edit_project(project_id):
 @app.route('/api/project/<int:project_id>', methods=['DELETE'])
 @jwt_required()
 def delete_project(project_id):
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user:
-        return jsonify({'msg': 'User not found'}), 404
+    user = get_current_user()
     project = Project.query.get(project_id)
     if not project:
         return jsonify({'msg': 'Project not found'}), 404
@@ -594,6 +912,7 @@ def delete_project(project_id):
     # Delete all members, tasks, and comments (if you have foreign key constraints)
     Project_Member.query.filter_by(project_id=project_id).delete()
     Task.query.filter_by(project_id=project_id).delete()
+    ProjectChange.query.filter_by(project_id=project_id).delete()
     # If you want: Comment.query.filter_by(project_id=project_id).delete()
 
     db.session.delete(project)
@@ -611,10 +930,7 @@ def delete_project(project_id):
 @app.route('/api/project/<int:project_id>/members', methods=['POST'])
 @jwt_required()
 def add_project_members(project_id):
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user:
-        return jsonify({'msg': 'User not found'}), 404
+    user = get_current_user()
     project = Project.query.get(project_id)
     if not project:
         return jsonify({'msg': 'Project not found'}), 404
@@ -628,39 +944,22 @@ def add_project_members(project_id):
     if not isinstance(member_emails, list):
         return jsonify({'msg': 'Members must be a list of emails'}), 400
 
-    added_members = []
-
-    for email in member_emails:
-        if not email or not email.strip():
-            continue
-        member_user = User.query.filter_by(email=email.strip()).first()
-        if not member_user:
-            return jsonify({'msg': f'User with email {email} not found'}), 400
-        existing_member = Project_Member.query.filter_by(
-            project_id=project_id,
-            member_id=member_user.id
-        ).first()
-
-        if existing_member:
-            return jsonify({'msg': f'User {email} is already a member'}), 400
-        if member_user.id == user.id:
-            return jsonify({'msg': 'Cannot add admin as member'}), 400
-        new_member = Project_Member(
-            project_id=project_id,
-            member_id=member_user.id
-        )
-        db.session.add(new_member)
-        added_members.append({
-            'id': member_user.id,
-            'email': member_user.email,
-            'full_name': member_user.full_name
-        })
+    # All emails are resolved and inserted in bulk, each one gets its own result
+    added_members, results = add_members_bulk(project, member_emails)
+    errors = [result['msg'] for result in results if result['msg']]
+    if errors and not added_members:
+        return jsonify({'msg': errors[0], 'errors': errors, 'results': results}), 400
 
     try:
+        record_changes(project_id, [
+            change('member', member['id'], 'added', member) for member in added_members
+        ], user.id)
         db.session.commit()
         return jsonify({
             'msg': 'Members added successfully',
-            'added_members': added_members
+            'added_members': added_members,
+            'errors': errors,
+            'results': results
         }), 200
     except Exception:
         db.session.rollback()
@@ -670,10 +969,7 @@ def add_project_members(project_id):
 @app.route('/api/project/<int:project_id>/member/<int:member_id>', methods=['DELETE'])
 @jwt_required()
 def delete_project_member(project_id, member_id):
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user:
-        return jsonify({'msg': 'User not found'}), 404
+    user = get_current_user()
     project = Project.query.get(project_id)
     if not project:
         return jsonify({'msg': 'Project not found'}), 404
@@ -691,6 +987,7 @@ def delete_project_member(project_id, member_id):
 
     db.session.delete(member)
     try:
+        record_changes(project_id, [change('member', member_id, 'removed')], user.id)
         db.session.commit()
         return jsonify({'msg': 'Member removed from project successfully'}), 200
     except Exception:
@@ -701,68 +998,126 @@ def delete_project_member(project_id, member_id):
 # ========== TASK ENDPOINTS ==========
 
 
+def parse_task_filters(args):
+    """
+    Task list filters from the query string: ?status=, ?assigned_to_id= (a user id or 'none')
+    and ?tag=. Returns (filters, error_message).
+    """
+    filters = {}
+    status = args.get('status')
+    if status:
+        if status not in TASK_STATUS_MAPPING:
+            return None, 'Invalid task status'
+        filters['status'] = TASK_STATUS_MAPPING[status]
+    assigned_to_id = args.get('assigned_to_id')
+    if assigned_to_id:
+        if assigned_to_id == 'none':
+            filters['unassigned'] = True
+        elif assigned_to_id.isdigit():
+            filters['assigned_to_id'] = int(assigned_to_id)
+        else:
+            return None, 'assigned_to_id must be a user id or none'
+    if args.get('tag'):
+        filters['tag'] = args.get('tag')
+    return filters, None
+
+
 @app.route('/api/project/<int:project_id>/tasks', methods=['GET'])
 @jwt_required()
 def get_project_tasks(project_id):
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user:
-        return jsonify({'msg': 'User not found'}), 404
+    user = get_current_user()
 
     project = Project.query.get(project_id)
     if not project:
         return jsonify({'msg': 'Project not found'}), 404
 
-    project_members = Project_Member.query.filter_by(
-        project_id=project_id).all()
-    is_admin = (user.id == project.admin_id)
-    is_member = user.id in [member.member_id for member in project_members]
+    role = get_project_role(project, user.id)
+    is_admin = role == 'admin'
+    is_member = role == 'member'
 
     if not is_admin and not is_member:
         return jsonify({'msg': 'You are not authorized to view tasks from this project'}), 400
 
+    filters, error = parse_task_filters(request.args)
+    if error:
+        return jsonify({'msg': error}), 400
+
+    etag = make_etag(request.full_path, user.id, project.revision)
+    cached = not_modified(etag)
+    if cached:
+        return cached
+
+    tasks_query = filter_tasks(
+        Task.query.options(*task_load_options()).filter_by(project_id=project_id),
+        **filters
+    )
+    if not is_admin:
+        tasks_query = tasks_query.filter(
+            (Task.assigned_to_id == user.id) | (Task.author_id == user.id)
+        )
+
+    # Pagination is opt-in: ?limit=<n> and/or ?cursor=<next_cursor>
+    next_cursor = None
+    if 'limit' in request.args or 'cursor' in request.args:
+        limit = request.args.get('limit', app.config['TASKS_PAGE_SIZE'], type=int)
+        limit = max(1, min(limit, app.config['TASKS_MAX_PAGE_SIZE']))
+        try:
+            tasks, next_cursor = paginate_tasks(
+                tasks_query, request.args.get('cursor'), limit)
+        except ValueError:
+            return jsonify({'msg': 'Invalid cursor'}), 400
+    elif wants_stream():
+        tasks = tasks_query.order_by(Task.created_at, Task.id).yield_per(
+            app.config['STREAM_BATCH_SIZE'])
+        if is_admin:
+            tasks_data = CountedIterator(task.serialize() for task in tasks)
+        else:
+            tasks_data = CountedIterator(task.serialize_for_member(user.id) for task in tasks)
+        return with_etag(stream_json({
+            'msg': 'All project tasks retrieved successfully' if is_admin else 'Your tasks retrieved successfully',
+            'role': role,
+            'tasks': tasks_data,
+            'total_tasks': lambda: tasks_data.count,
+            'next_cursor': None
+        }), etag)
+    else:
+        tasks = tasks_query.order_by(Task.created_at, Task.id).all()
+
     if is_admin:
-        all_tasks = Task.query.filter_by(project_id=project_id).all()
-        tasks_data_serialize = [task.serialize() for task in all_tasks]
+        tasks_data_serialize = [task.serialize() for task in tasks]
 
-        return jsonify({
+        return with_etag((jsonify({
             'msg': 'All project tasks retrieved successfully',
             'role': 'admin',
             'tasks': tasks_data_serialize,
-            'total_tasks': len(tasks_data_serialize)
-        }), 200
+            'total_tasks': len(tasks_data_serialize),
+            'next_cursor': next_cursor
+        }), 200), etag)
 
     else:
-        member_tasks = Task.query.filter_by(project_id=project_id).filter(
-            (Task.assigned_to_id == user.id) | (Task.author_id == user.id)
-        ).all()
-
         tasks_data = [task.serialize_for_member(
-            user.id) for task in member_tasks]
+            user.id) for task in tasks]
 
-        return jsonify({
+        return with_etag((jsonify({
             'msg': 'Your tasks retrieved successfully',
             'role': 'member',
             'tasks': tasks_data,
-            'total_tasks': len(tasks_data)
-        }), 200
+            'total_tasks': len(tasks_data),
+            'next_cursor': next_cursor
+        }), 200), etag)
 
 
 @app.route('/api/project/<int:project_id>/task', methods=['POST'])
 @jwt_required()
 def create_task(project_id):
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user:
-        return jsonify({'msg': 'User not found'}), 404
+    user = get_current_user()
     project = Project.query.get(project_id)
     if not project:
         return jsonify({'msg': 'Project not found'}), 404
 
-    project_members = Project_Member.query.filter_by(
-        project_id=project_id).all()
-    is_admin = (user.id == project.admin_id)
-    is_member = user.id in [member.member_id for member in project_members]
+    role = get_project_role(project, user.id)
+    is_admin = role == 'admin'
+    is_member = role == 'member'
 
     if not is_admin and not is_member:
         return jsonify({'msg': 'You are not authorized to create tasks in this project'}), 400
@@ -781,8 +1136,7 @@ def create_task(project_id):
         if not assigned_user:
             return jsonify({'msg': 'Assigned user not found'}), 404
 
-        valid_assignee = (assigned_user.id == project.admin_id or
-                          assigned_user.id in [member.member_id for member in project_members])
+        valid_assignee = get_project_role(project, assigned_user.id) is not None
         if not valid_assignee:
             return jsonify({'msg': 'Cannot assign task to user who is not part of the project'}), 400
         if is_member and assigned_user.id != user.id:
@@ -807,6 +1161,8 @@ def create_task(project_id):
         )
 
         db.session.add(new_task)
+        db.session.flush()
+        record_changes(project_id, [change('task', new_task.id, 'created', task_state(new_task))], user.id)
         db.session.commit()
  
         return jsonify({
@@ -822,17 +1178,13 @@ def create_task(project_id):
 @app.route('/api/project/<int:project_id>/task/<int:task_id>', methods=['PUT'])
 @jwt_required()
 def update_task(project_id, task_id):
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user:
-        return jsonify({'msg': 'User not found'}), 404
+    user = get_current_user()
     project = Project.query.get(project_id)
     if not project:
         return jsonify({'msg': 'Project not found'}), 404
-    project_members = Project_Member.query.filter_by(
-        project_id=project_id).all()
-    is_admin = (user.id == project.admin_id)
-    is_member = user.id in [member.member_id for member in project_members]
+    role = get_project_role(project, user.id)
+    is_admin = role == 'admin'
+    is_member = role == 'member'
     task = Task.query.filter_by(id=task_id, project_id=project_id).first()
     if not task:
         return jsonify({'msg': 'Task not found'}), 404
@@ -856,10 +1208,7 @@ def update_task(project_id, task_id):
             assigned_user = User.query.get(assigned_to_id)
             if not assigned_user:
                 return jsonify({'msg': 'Assigned user not found'}), 404
-            project_members = Project_Member.query.filter_by(
-                project_id=project_id).all()
-            valid_assignee = (assigned_user.id == project.admin_id or
-                              assigned_user.id in [member.member_id for member in project_members])
+            valid_assignee = get_project_role(project, assigned_user.id) is not None
             if not valid_assignee:
                 return jsonify({'msg': 'Cannot assign task to user who is not part of the project'}), 400
             if is_member and assigned_user.id != user.id:
@@ -870,6 +1219,7 @@ def update_task(project_id, task_id):
         task.assigned_to_id = assigned_to_id
 
     try:
+        record_changes(project_id, [change('task', task.id, 'updated', task_state(task))], user.id)
         db.session.commit()
         return jsonify({
             'msg': 'Task updated successfully',
@@ -880,13 +1230,90 @@ def update_task(project_id, task_id):
         return jsonify({'msg': 'Error updating task'}), 500
 
 
+# Same status / assigned_to_id / description change for many tasks: {"task_ids": [...], "status": "done"}.
+# The rules of update_task are checked for all the tasks with one query and the
+# change is a single UPDATE ... WHERE id IN (...).
+@app.route('/api/project/<int:project_id>/tasks', methods=['PATCH'])
+@jwt_required()
+def batch_update_tasks(project_id):
+    user = get_current_user()
+    project = Project.query.get(project_id)
+    if not project:
+        return jsonify({'msg': 'Project not found'}), 404
+    is_admin = project.admin_id == user.id
+
+    body = request.get_json(silent=True)
+    if body is None:
+        return jsonify({'msg': 'Debes enviar información en el body'}), 400
+
+    task_ids = body.get('task_ids')
+    # bool is a subclass of int, true/false are not task ids
+    if not isinstance(task_ids, list) or not task_ids or \
+            not all(isinstance(task_id, int) and not isinstance(task_id, bool) for task_id in task_ids):
+        return jsonify({'msg': 'task_ids must be a list of task ids'}), 400
+    task_ids = set(task_ids)
+    if len(task_ids) > app.config['TASKS_BATCH_UPDATE_MAX']:
+        return jsonify({'msg': f"You can update up to {app.config['TASKS_BATCH_UPDATE_MAX']} tasks at once"}), 400
+
+    values = {}
+    if 'description' in body:
+        if body['description'] is not None and not isinstance(body['description'], str):
+            return jsonify({'msg': 'description must be a string'}), 400
+        values[Task.description] = body['description']
+    if 'status' in body:
+        if not isinstance(body['status'], str) or body['status'] not in TASK_STATUS_MAPPING:
+            return jsonify({'msg': 'Invalid task status'}), 400
+        values[Task.status] = TASK_STATUS_MAPPING[body['status']]
+    if 'assigned_to_id' in body:
+        if not is_admin:
+            return jsonify({'msg': 'Only the project admin can assign tasks'}), 400
+        assigned_to_id = body['assigned_to_id']
+        if isinstance(assigned_to_id, bool) or not isinstance(assigned_to_id, (int, type(None))):
+            return jsonify({'msg': 'assigned_to_id must be a user id'}), 400
+        assigned_to_id = assigned_to_id or None
+        if assigned_to_id and get_project_role(project, assigned_to_id) is None:
+            return jsonify({'msg': 'Cannot assign task to user who is not part of the project'}), 400
+        values[Task.assigned_to_id] = assigned_to_id
+    if not values:
+        return jsonify({'msg': 'Nothing to update: send status, assigned_to_id or description'}), 400
+
+    # One authorization pass: the project tasks among task_ids and who wrote them
+    found = db.session.query(Task.id, Task.author_id).filter(
+        Task.project_id == project_id, Task.id.in_(task_ids)).all()
+    missing = task_ids - {task_id for task_id, _ in found}
+    if missing:
+        return jsonify({'msg': 'Tasks not found', 'task_ids': sorted(missing)}), 404
+    if not is_admin:
+        forbidden = [task_id for task_id, author_id in found if author_id != user.id]
+        if forbidden:
+            return jsonify({'msg': 'You are not authorized to edit these tasks', 'task_ids': sorted(forbidden)}), 400
+
+    try:
+        Task.query.filter(
+            Task.project_id == project_id, Task.id.in_(task_ids)
+        ).update(values, synchronize_session=False)
+        updated_rows = db.session.query(*TASK_COLUMNS).filter(Task.id.in_(task_ids)).all()
+        record_changes(project_id, [
+            change('task', row.id, 'updated', task_state(row)) for row in updated_rows
+        ], user.id)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        return jsonify({'msg': 'Error updating tasks'}), 500
+
+    tasks = Task.query.options(*task_load_options()).filter(
+        Task.id.in_(task_ids)).order_by(Task.created_at, Task.id).all()
+    return jsonify({
+        'msg': 'Tasks updated successfully',
+        'tasks': [task.serialize() for task in tasks],
+        'total_tasks': len(tasks)
+    }), 200
+
+
 @app.route('/api/project/<int:project_id>/task/<int:task_id>', methods=['DELETE'])
 @jwt_required()
 def delete_task(project_id, task_id):
-    user_id = get_jwt_identity()
-    user = User.query.get(user_id)
-    if not user:
-        return jsonify({'msg': 'User not found'}), 404
+    user = get_current_user()
     project = Project.query.get(project_id)
     if not project:
         return jsonify({'msg': 'Project not found'}), 404
@@ -898,6 +1325,7 @@ def delete_task(project_id, task_id):
 
     try:
         db.session.delete(task)
+        record_changes(project_id, [change('task', task_id, 'deleted')], user.id)
         db.session.commit()
         return jsonify({
             'msg': 'Task deleted successfully',
@@ -907,9 +1335,106 @@ def delete_task(project_id, task_id):
         db.session.rollback()
         return jsonify({'msg': 'Error updating task'}), 500
 
+
+# Bulk import / export of the tasks of a project as NDJSON or CSV (see api/task_io.py).
+# The format comes from ?format=csv|ndjson or the Content-Type of the import.
+
+
+@app.route('/api/project/<int:project_id>/tasks/import', methods=['POST'])
+@jwt_required()
+def import_project_tasks(project_id):
+    user = get_current_user()
+    project = Project.query.get(project_id)
+    if not project:
+        return jsonify({'msg': 'Project not found'}), 404
+
+    role = get_project_role(project, user.id)
+    if role is None:
+        return jsonify({'msg': 'You are not authorized to create tasks in this project'}), 400
+
+    # Members can only assign tasks to themselves, like in create_task
+    if role == 'admin':
+        assignable_ids = get_project_participant_ids(project)
+    else:
+        assignable_ids = {user.id}
+
+    fmt = detect_format(request.mimetype, request.args.get('format'))
+    try:
+        imported, errors = import_tasks(
+            read_rows(request.stream, fmt),
+            project_id,
+            user.id,
+            TASK_STATUS_MAPPING,
+            assignable_ids,
+            app.config['TASK_IMPORT_CHUNK_SIZE']
+        )
+        if errors:
+            db.session.rollback()
+            return jsonify({
+                'msg': 'No tasks were imported, fix the invalid rows and try again',
+                'errors': errors
+            }), 400
+        # Imports can be huge, the feed gets one entry telling clients to reload the tasks.
+        # An empty import changed nothing: no new revision, nothing to notify
+        if imported:
+            record_changes(project_id, [change('tasks', None, 'imported', {'count': imported})], user.id)
+            db.session.commit()
+    except UnicodeDecodeError:
+        db.session.rollback()
+        return jsonify({'msg': 'The file must be UTF-8 encoded'}), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'msg': f'Error importing tasks: {str(e)}'}), 500
+
+    return jsonify({
+        'msg': 'Tasks imported successfully',
+        'imported': imported
+    }), 201
+
+
+@app.route('/api/project/<int:project_id>/tasks/export', methods=['GET'])
+@jwt_required()
+def export_project_tasks(project_id):
+    user = get_current_user()
+    project = Project.query.get(project_id)
+    if not project:
+        return jsonify({'msg': 'Project not found'}), 404
+
+    role = get_project_role(project, user.id)
+    if role is None:
+        return jsonify({'msg': 'You are not authorized to view tasks from this project'}), 400
+
+    filters, error = parse_task_filters(request.args)
+    if error:
+        return jsonify({'msg': error}), 400
+
+    # yield_per streams the rows (a server-side cursor on PostgreSQL), tags are
+    # loaded with one IN query per batch
+    tasks_query = filter_tasks(
+        Task.query.options(*task_export_load_options()).filter_by(project_id=project_id),
+        **filters
+    )
+    if role != 'admin':
+        tasks_query = tasks_query.filter(
+            (Task.assigned_to_id == user.id) | (Task.author_id == user.id)
+        )
+    tasks = tasks_query.order_by(Task.created_at, Task.id).yield_per(
+        app.config['STREAM_BATCH_SIZE'])
+
+    fmt = detect_format(None, request.args.get('format'))
+    mimetype = 'text/csv' if fmt == 'csv' else 'application/x-ndjson'
+    return stream_lines(export_tasks(tasks, fmt), mimetype,
+                        filename=f'project-{project_id}-tasks.{fmt}')
+
 # ========== AI ENDPOINTS ==========
+# Both AI endpoints can stream their answer as server-sent events (Accept: text/event-stream
+# or ?stream=1): tokens reach the client while the LLM writes them. Run gunicorn with the
+# gthread worker class (see Procfile) so these long requests only hold a thread, not a worker.
+
+
+def wants_event_stream():
+    return wants_stream() or 'text/event-stream' in request.headers.get('Accept', '')
 
-import requests
 
 @app.route("/api/ai/suggest-description", methods=["POST"])
 def ai_suggest_description():
@@ -919,114 +1444,90 @@ def ai_suggest_description():
     if not task_title:
         return jsonify({"msg": "No title provided"}), 400
 
-    mistral_api_key = os.getenv("MISTRAL_API_KEY")
-    if not mistral_api_key:
+    model = "mistral-tiny"
+    temperature = 0.7
+    messages = [
+        {"role": "system", "content": "You help write clear, concise task descriptions for dev teams."},
+        {"role": "user", "content": f"Write a clear and concise description for this task: {task_title}"}
+    ]
+    suggestion = suggestion_cache.get(task_title, model, temperature)
+    if suggestion is not None:
+        if wants_event_stream():
+            return stream_sse(iter([
+                sse_event({"token": suggestion}, 'token'),
+                sse_event({"suggestion": suggestion, "cached": True}, 'done')
+            ]))
+        return jsonify({"suggestion": suggestion, "cached": True})
+
+    if not ai_client.api_key:
         return jsonify({"msg": "Mistral API key not configured"}), 500
 
-    headers = {
-        "Authorization": f"Bearer {mistral_api_key}",
-        "Content-Type": "application/json",
-    }
-
-    payload = {
-        "model": "mistral-tiny",  # Or mistral-small, mistral-medium
-        "messages": [
-            {"role": "system", "content": "You help write clear, concise task descriptions for dev teams."},
-            {"role": "user", "content": f"Write a clear and concise description for this task: {task_title}"}
-        ],
-        "max_tokens": 60,
-        "temperature": 0.7
-    }
+    if wants_event_stream():
+        def events():
+            tokens = []
+            try:
+                for token in ai_client.chat_stream(messages, max_tokens=60, temperature=temperature, model=model):
+                    tokens.append(token)
+                    yield sse_event({"token": token}, 'token')
+            except AIServiceError as e:
+                print("Mistral API Error:", e.message, e.detail)
+                yield sse_event({"msg": "Error generating description", "error": e.detail or e.message}, 'error')
+                return
+            suggestion = ''.join(tokens).strip()
+            suggestion_cache.set(task_title, model, temperature, suggestion)
+            yield sse_event({"suggestion": suggestion, "cached": False}, 'done')
+        return stream_sse(events())
 
     try:
-        response = requests.post(
-            "https://api.mistral.ai/v1/chat/completions",
-            headers=headers,
-            json=payload
+        suggestion = ai_client.chat(
+            messages,
+            max_tokens=60,
+            temperature=temperature,
+            model=model
         )
-        if response.status_code != 200:
-            print("Mistral API Error:", response.text)
-            return jsonify({"msg": "Error generating description", "error": response.text}), 500
+        suggestion_cache.set(task_title, model, temperature, suggestion)
+        return jsonify({"suggestion": suggestion, "cached": False})
+    except AIServiceError as e:
+        print("Mistral API Error:", e.message, e.detail)
+        return jsonify({"msg": "Error generating description", "error": e.detail or e.message}), e.status_code
+
+
+@app.route("/api/ai/suggest-description/stats", methods=["GET"])
+@jwt_required()
+def ai_suggestion_cache_stats():
+    # Counters of this worker process since it started
+    return jsonify({"cache": suggestion_cache.get_stats()}), 200
 
-        suggestion = response.json()["choices"][0]["message"]["content"].strip()
-        return jsonify({"suggestion": suggestion})
-    except Exception as e:
-        print("Mistral API Error:", e)
-        return jsonify({"msg": "Error generating description", "error": str(e)}), 500
-    
 
 @app.route('/api/ai/standup', methods=['POST'])
 @jwt_required()
 def ai_standup():
-    all_projects = Project.query.all()
-    if not all_projects:
+    project_summaries = get_standup_data(
+        get_current_user().id, app.config['STANDUP_TASK_TITLES'])
+    if not project_summaries:
         return jsonify({"msg": "No projects found."}), 404
 
-    project_summaries = []
-    for project in all_projects:
-        tasks = Task.query.filter_by(project_id=project.id).all()
-        num_tasks = len(tasks)
-        num_done = len([t for t in tasks if t.status and "done" in str(t.status).lower()])
-        num_inprogress = len([t for t in tasks if t.status and "progress" in str(t.status).lower()])
-        num_urgent = len([t for t in tasks if t.status and "urgent" in str(t.status).lower()])
-        project_summaries.append({
-            "title": project.title,
-            "description": project.description or "",
-            "tasks": [t.title for t in tasks],
-            "num_tasks": num_tasks,
-            "num_done": num_done,
-            "num_inprogress": num_inprogress,
-            "num_urgent": num_urgent,
-        })
-
-    prompt = (
-        "You are an AI standup bot. Summarize the current progress for each project. "
-        "For each project, give a brief status update mentioning tasks done, in progress, urgent tasks, and anything notable. "
-        "Make it readable and actionable for a daily standup update.\n\n"
-    )
-    for proj in project_summaries:
-        prompt += (
-            f"Project: {proj['title']}\n"
-            f"Description: {proj['description']}\n"
-            f"Total Tasks: {proj['num_tasks']}, Done: {proj['num_done']}, In Progress: {proj['num_inprogress']}, Urgent: {proj['num_urgent']}\n"
-            f"Tasks: {', '.join(proj['tasks']) if proj['tasks'] else 'No tasks yet.'}\n\n"
-        )
-
-    mistral_api_key = os.getenv("MISTRAL_API_KEY")
-    if not mistral_api_key:
+    if not ai_client.api_key:
         return jsonify({"msg": "Mistral API key not configured"}), 500
 
-    headers = {
-        "Authorization": f"Bearer {mistral_api_key}",
-        "Content-Type": "application/json",
-    }
-
-    payload = {
-        "model": "mistral-tiny",
-        "messages": [
-            {"role": "system", "content": "You are an AI project manager. Write a short standup summary update for all current projects given their tasks and status."},
-            {"role": "user", "content": prompt}
-        ],
-        "max_tokens": 280,
-        "temperature": 0.6
-    }
+    if wants_event_stream():
+        def events():
+            try:
+                for event, data in stream_standup(project_summaries, ai_client):
+                    yield sse_event(data, event)
+            except AIServiceError as e:
+                print("Mistral API Error:", e.message, e.detail)
+                yield sse_event({"msg": "Error generating standup summary", "error": e.detail or e.message}, 'error')
+        return stream_sse(events())
 
     try:
-        response = requests.post(
-            "https://api.mistral.ai/v1/chat/completions",
-            headers=headers,
-            json=payload
-        )
-        if response.status_code != 200:
-            print("Mistral API Error:", response.text)
-            return jsonify({"msg": "Error generating standup summary", "error": response.text}), 500
-
-        summary = response.json()["choices"][0]["message"]["content"].strip()
-        return jsonify({"standup": summary})
-    except Exception as e:
-        print("Mistral API Error:", e)
-        return jsonify({"msg": "Error generating standup summary", "error": str(e)}), 500
-
+        # Only projects that changed since their last summary are sent to the LLM
+        summary, projects = generate_standup(
+            project_summaries, ai_client, concurrency=app.config['STANDUP_CONCURRENCY'])
+        return jsonify({"standup": summary, "projects": projects})
+    except AIServiceError as e:
+        print("Mistral API Error:", e.message, e.detail)
+        return jsonify({"msg": "Error generating standup summary", "error": e.detail or e.message}), e.status_code
 
 
 # ---- RUN APP ----
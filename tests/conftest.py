@@ -0,0 +1,102 @@
+"""
+Test setup: the app from src/app.py against a throwaway SQLite database, created
+empty for every test. Passwords are hashed inline, mails stay in the queue until a
+test delivers them and rate limits are off unless a test turns them on.
+
+    $ python -m pytest -q
+"""
+import datetime
+import os
+import sys
+import tempfile
+
+import pytest
+
+DB_PATH = os.path.join(tempfile.gettempdir(), 'echoboard_tests.db')
+os.environ['DATABASE_URL'] = f'sqlite:///{DB_PATH}'
+os.environ['JWT_SECRET_KEY'] = 'test-secret-key-long-enough-for-hs256'
+os.environ['MISTRAL_API_KEY'] = 'test'
+os.environ['PASSWORD_HASH_WORKERS'] = '0'
+os.environ['PASSWORD_HASH_METHOD'] = 'pbkdf2:sha256:1000'
+os.environ['MAIL_QUEUE_ASYNC'] = '0'
+os.environ['RATE_LIMIT_ENABLED'] = '0'
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '../src'))
+
+from sqlalchemy import event  # noqa: E402
+from flask_jwt_extended import create_access_token  # noqa: E402
+from app import app as flask_app  # noqa: E402
+from api.models import db, User  # noqa: E402
+from api.ai_client import ai_client, CircuitBreaker  # noqa: E402
+from api.ai_cache import suggestion_cache  # noqa: E402
+from api.utils import PerProcess  # noqa: E402
+from fake_smtp import FakeSMTPServer  # noqa: E402
+from fake_mistral import FakeMistralAdapter  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    flask_app.config['TESTING'] = True
+    with flask_app.app_context():
+        db.drop_all()
+        db.create_all()
+        yield flask_app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def queries(app):
+    """ SQL statements run while the test is running, clear() it before the part to measure """
+    statements = []
+
+    def count_statement(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', count_statement)
+    yield statements
+    event.remove(db.engine, 'before_cursor_execute', count_statement)
+
+
+@pytest.fixture
+def smtp_server(app, monkeypatch):
+    """ FakeSMTPServer that the mail extension of the app delivers to """
+    server = FakeSMTPServer().start()
+    state = app.extensions['mail']
+    settings = {'server': '127.0.0.1', 'port': server.port, 'use_tls': False, 'use_ssl': False,
+                'username': None, 'password': None, 'default_sender': 'echoboard@example.com',
+                'debug': 0, 'suppress': False}
+    for name, value in settings.items():
+        monkeypatch.setattr(state, name, value)
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def mistral(app, monkeypatch):
+    """ FakeMistralAdapter answering every call of ai_client, with a fresh circuit breaker """
+    adapter = FakeMistralAdapter()
+    monkeypatch.setitem(app.config, 'AI_RETRY_BACKOFF', 0)
+    monkeypatch.setattr(ai_client, 'breaker', CircuitBreaker(
+        app.config['AI_BREAKER_THRESHOLD'], app.config['AI_BREAKER_COOLDOWN']))
+    monkeypatch.setattr(ai_client, '_session', PerProcess(ai_client._new_session))
+    ai_client.session.mount(app.config['MISTRAL_API_URL'], adapter)
+    suggestion_cache.memory.clear()
+    yield adapter
+    suggestion_cache.memory.clear()
+
+
+def make_user(name, password='x'):
+    user = User(full_name=name.title(), email=f'{name}@example.com', password=password,
+                country='ES', created_at=datetime.datetime.now(), is_active=True)
+    db.session.add(user)
+    db.session.flush()
+    return user
+
+
+def auth_headers(user):
+    return {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
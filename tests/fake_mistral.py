@@ -0,0 +1,51 @@
+"""
+Local stand-in for the Mistral chat completions API, mounted as a requests transport
+adapter on the session of api.ai_client, so no socket is opened.
+`responses` is the script of what the next calls get, in order:
+- a string: a 200 completion with that text (an SSE stream when the call asked for one)
+- an int: an error with that HTTP status
+- an exception instance (requests.Timeout(), ...): raised as the transport would
+Once the script runs out every call gets `default`.
+"""
+import io
+import json
+
+import requests
+from requests.adapters import BaseAdapter
+
+
+class FakeMistralAdapter(BaseAdapter):
+    def __init__(self, default='Fake completion'):
+        super().__init__()
+        self.responses = []
+        self.default = default
+        self.calls = []
+
+    def send(self, request, stream=False, timeout=None, **kwargs):
+        payload = json.loads(request.body)
+        self.calls.append({'payload': payload, 'timeout': timeout})
+        outcome = self.responses.pop(0) if self.responses else self.default
+        if isinstance(outcome, Exception):
+            raise outcome
+
+        if isinstance(outcome, int):
+            status, body = outcome, json.dumps({'message': f'Fake error {outcome}'})
+        elif payload.get('stream'):
+            status = 200
+            chunks = [outcome[i:i + 4] for i in range(0, len(outcome), 4)]
+            body = ''.join(
+                f"data: {json.dumps({'choices': [{'delta': {'content': chunk}}]})}\n\n" for chunk in chunks
+            ) + 'data: [DONE]\n\n'
+        else:
+            status, body = 200, json.dumps({'choices': [{'message': {'content': outcome}}]})
+
+        response = requests.Response()
+        response.status_code = status
+        response.raw = io.BytesIO(body.encode())
+        response.encoding = 'utf-8'
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self):
+        pass
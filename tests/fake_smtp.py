@@ -0,0 +1,92 @@
+"""
+Local SMTP stand-in: accepts mail on 127.0.0.1 and keeps the messages in memory.
+Set `failures` to answer the next N messages with a temporary error (451) and
+`refuse` to close every new connection with a 421, as a degraded server would.
+Also usable by hand while developing, with MAIL_SERVER=127.0.0.1 MAIL_PORT=1025 MAIL_USE_TLS=0:
+
+    $ python tests/fake_smtp.py [1025]
+"""
+import socketserver
+import sys
+import threading
+
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    def reply(self, line):
+        self.wfile.write(f'{line}\r\n'.encode())
+
+    def handle(self):
+        server = self.server
+        if server.refuse:
+            self.reply('421 Service not available')
+            return
+        self.reply('220 localhost fake SMTP')
+        lines = None
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            line = line.decode('utf-8', 'replace').rstrip('\r\n')
+            if lines is not None:
+                if line != '.':
+                    lines.append(line[1:] if line.startswith('..') else line)
+                    continue
+                with server.lock:
+                    failed = server.failures > 0
+                    if failed:
+                        server.failures -= 1
+                    else:
+                        server.messages.append('\n'.join(lines))
+                self.reply('451 Try again later' if failed else '250 OK')
+                lines = None
+                continue
+            command = line[:4].upper()
+            if command == 'DATA':
+                lines = []
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+            elif command == 'QUIT':
+                self.reply('221 Bye')
+                return
+            elif command in ('EHLO', 'HELO'):
+                self.reply('250 localhost')
+            else:
+                self.reply('250 OK')
+
+
+class FakeSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, port=0):
+        super().__init__(('127.0.0.1', port), SMTPHandler)
+        self.messages = []
+        self.failures = 0
+        self.refuse = False
+        self.lock = threading.Lock()
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == '__main__':
+    server = FakeSMTPServer(int(sys.argv[1]) if len(sys.argv) > 1 else 1025)
+    print(f'Fake SMTP server on 127.0.0.1:{server.port}, Ctrl+C to stop')
+    seen = 0
+    server.start()
+    try:
+        while True:
+            threading.Event().wait(1)
+            for message in server.messages[seen:]:
+                print(message, end='\n\n')
+            seen = len(server.messages)
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,66 @@
+import datetime
+import time
+
+import pytest
+from sqlalchemy import text
+
+from api.ai_cache import suggestion_cache
+from api.maintenance import maintenance
+from api.models import db, AISuggestion
+
+
+def add_suggestion(title, expires_in):
+    now = datetime.datetime.now()
+    db.session.add(AISuggestion(
+        cache_key=suggestion_cache.key(title, 'mistral-tiny', 0.7), title=title,
+        suggestion=f'About {title}', created_at=now,
+        expires_at=now + datetime.timedelta(seconds=expires_in)))
+    db.session.commit()
+
+
+def test_db_hit_is_kept_in_memory_only_for_the_rest_of_its_lifetime(app, mistral):
+    add_suggestion('Fix login', 5)
+    assert suggestion_cache.get('Fix login', 'mistral-tiny', 0.7) == 'About Fix login'
+    _, expires_at = suggestion_cache.memory._data[suggestion_cache.key('Fix login', 'mistral-tiny', 0.7)]
+    assert expires_at - time.monotonic() <= 5
+
+
+def test_expired_rows_are_purged_on_write(app, mistral):
+    for i in range(3):
+        add_suggestion(f'Old {i}', -60)
+    add_suggestion('Fresh', 60)
+    suggestion_cache.set('New title', 'mistral-tiny', 0.7, 'Something')
+    assert sorted(row.title for row in AISuggestion.query) == ['Fresh', 'New title']
+
+
+def test_maintenance_deletes_expired_suggestions(app, mistral):
+    for i in range(3):
+        add_suggestion(f'Old {i}', -60)
+    add_suggestion('Fresh', 60)
+    assert maintenance.run()['ai_suggestion'] == (3, 1)
+    assert AISuggestion.query.count() == 1
+
+
+def test_database_errors_are_a_cache_miss(app, client, mistral):
+    db.session.execute(text('DROP TABLE ai_suggestion'))
+    db.session.commit()
+    assert suggestion_cache.get('Fix login', 'mistral-tiny', 0.7) is None
+
+    mistral.responses = ['A description']
+    response = client.post('/api/ai/suggest-description', json={'title': 'Fix login'})
+    assert response.status_code == 200
+    assert response.get_json() == {'suggestion': 'A description', 'cached': False}
+    # Still served from memory
+    response = client.post('/api/ai/suggest-description', json={'title': 'Fix login'})
+    assert response.get_json() == {'suggestion': 'A description', 'cached': True}
+
+
+@pytest.mark.parametrize('completion', ['', '   \n'])
+def test_empty_completions_are_not_cached(app, client, mistral, completion):
+    mistral.responses = [completion, 'A description']
+    response = client.post('/api/ai/suggest-description', json={'title': 'Fix login'})
+    assert response.get_json()['cached'] is False
+    assert AISuggestion.query.count() == 0
+
+    response = client.post('/api/ai/suggest-description', json={'title': 'Fix login'})
+    assert response.get_json() == {'suggestion': 'A description', 'cached': False}
@@ -0,0 +1,92 @@
+import pytest
+import requests
+
+from api.ai_client import ai_client, AIServiceError, CircuitOpenError
+
+MESSAGES = [{'role': 'user', 'content': 'Hi'}]
+
+
+def chat():
+    return ai_client.chat(MESSAGES, max_tokens=10, temperature=0)
+
+
+def test_timeout_is_retried(app, mistral):
+    mistral.responses = [requests.Timeout('read timed out'), 'Hello']
+    assert chat() == 'Hello'
+    assert len(mistral.calls) == 2
+    assert mistral.calls[0]['timeout'] == (app.config['AI_CONNECT_TIMEOUT'], app.config['AI_READ_TIMEOUT'])
+    assert ai_client.breaker.failures == 0
+
+
+def test_server_errors_exhaust_the_retries(app, mistral):
+    mistral.responses = [503] * 10
+    with pytest.raises(AIServiceError) as error:
+        chat()
+    assert error.value.status_code == 502
+    assert len(mistral.calls) == app.config['AI_MAX_RETRIES'] + 1
+    assert ai_client.breaker.failures == 1
+
+
+def test_client_errors_are_not_retried(app, mistral):
+    mistral.responses = [401]
+    with pytest.raises(AIServiceError):
+        chat()
+    assert len(mistral.calls) == 1
+    assert ai_client.breaker.failures == 0
+
+
+def test_any_request_error_is_an_ai_service_error(app, mistral):
+    mistral.responses = [requests.exceptions.ChunkedEncodingError('broken')] * 10
+    with pytest.raises(AIServiceError):
+        chat()
+    assert ai_client.breaker.failures == 1
+
+
+def open_breaker(mistral):
+    mistral.responses = [503] * 100
+    for _ in range(ai_client.breaker.threshold):
+        with pytest.raises(AIServiceError):
+            chat()
+    mistral.calls.clear()
+
+
+def test_open_breaker_fails_fast_then_recovers_half_open(app, mistral):
+    open_breaker(mistral)
+    with pytest.raises(CircuitOpenError):
+        chat()
+    assert mistral.calls == []
+
+    # Cooldown over: a single trial call goes through and closes the circuit
+    ai_client.breaker.opened_at -= ai_client.breaker.cooldown
+    mistral.responses = ['Back']
+    assert chat() == 'Back'
+    assert ai_client.breaker.opened_at is None
+    assert chat() == 'Fake completion'
+
+
+@pytest.mark.parametrize('trial_error', [503, requests.exceptions.TooManyRedirects('loop')])
+def test_failed_half_open_trial_reopens_and_allows_the_next_trial(app, mistral, trial_error):
+    open_breaker(mistral)
+    ai_client.breaker.opened_at -= ai_client.breaker.cooldown
+    mistral.responses = [trial_error] * (app.config['AI_MAX_RETRIES'] + 1)
+    with pytest.raises(AIServiceError):
+        chat()
+    with pytest.raises(CircuitOpenError):
+        chat()
+
+    # The failed trial did not leave the breaker waiting for it forever
+    ai_client.breaker.opened_at -= ai_client.breaker.cooldown
+    assert chat() == 'Fake completion'
+
+
+def test_chat_stream_yields_tokens(app, mistral):
+    mistral.responses = ['Streamed answer']
+    tokens = list(ai_client.chat_stream(MESSAGES, max_tokens=10, temperature=0))
+    assert len(tokens) > 1
+    assert ''.join(tokens) == 'Streamed answer'
+
+
+def test_endpoint_answers_provider_errors_with_502(client, mistral):
+    mistral.responses = [requests.exceptions.ContentDecodingError('bad gzip')] * 10
+    response = client.post('/api/ai/suggest-description', json={'title': 'Fix login'})
+    assert response.status_code == 502
@@ -0,0 +1,27 @@
+from flask_jwt_extended import create_access_token
+
+from api.models import db
+from conftest import make_user, auth_headers
+
+
+def test_token_with_non_numeric_subject_is_rejected(client):
+    headers = {'Authorization': f"Bearer {create_access_token(identity='not-a-number')}"}
+    response = client.get('/api/profile', headers=headers)
+    assert response.status_code == 401
+
+
+def test_token_of_deleted_user(client):
+    user = make_user('gone')
+    headers = auth_headers(user)
+    db.session.delete(user)
+    db.session.commit()
+    response = client.get('/api/profile', headers=headers)
+    assert response.status_code == 404
+
+
+def test_profile_uses_the_authenticated_user(client):
+    user = make_user('me')
+    db.session.commit()
+    response = client.get('/api/profile', headers=auth_headers(user))
+    assert response.status_code == 200
+    assert response.get_json()['user']['email'] == 'me@example.com'
@@ -0,0 +1,47 @@
+import datetime
+
+import pytest
+
+from api.models import db, Project, Task, ProjectStatus, TaskStatus
+from conftest import make_user, auth_headers
+
+
+@pytest.fixture
+def project(app):
+    admin = make_user('admin')
+    now = datetime.datetime.now()
+    project = Project(title='Board', created_at=now, due_date=now,
+                      status=ProjectStatus.in_progress, admin=admin)
+    project.tasks = [Task(title=f'Task {i}', created_at=now, status=TaskStatus.in_progress,
+                          task_author=admin) for i in range(3)]
+    db.session.add(project)
+    db.session.commit()
+    return project
+
+
+def patch(client, project, body):
+    return client.patch(f'/api/project/{project.id}/tasks', json=body, headers=auth_headers(project.admin))
+
+
+def test_batch_update(client, project):
+    task_ids = [task.id for task in project.tasks]
+    response = patch(client, project, {'task_ids': task_ids, 'status': 'done', 'assigned_to_id': project.admin_id})
+    assert response.status_code == 200
+    assert {task['status'] for task in response.get_json()['tasks']} == {'done'}
+    assert {task['assigned_to_id'] for task in response.get_json()['tasks']} == {project.admin_id}
+
+
+@pytest.mark.parametrize('body', [
+    {'task_ids': [True], 'status': 'done'},
+    {'task_ids': ['1'], 'status': 'done'},
+    {'status': ['done']},
+    {'description': 5},
+    {'assigned_to_id': '1'},
+    {'assigned_to_id': [1]},
+    {'assigned_to_id': True},
+    {'assigned_to_id': False},
+])
+def test_wrong_types_are_rejected(client, project, body):
+    body.setdefault('task_ids', [task.id for task in project.tasks])
+    response = patch(client, project, body)
+    assert response.status_code == 400
@@ -0,0 +1,71 @@
+import datetime
+
+import pytest
+
+import app as app_module
+from api.changes import change, record_changes
+from api.models import db, Project, ProjectStatus
+from conftest import make_user, auth_headers
+
+
+@pytest.fixture
+def project(app):
+    admin = make_user('admin')
+    now = datetime.datetime.now()
+    project = Project(title='Board', created_at=now, due_date=now,
+                      status=ProjectStatus.in_progress, admin=admin)
+    db.session.add(project)
+    db.session.commit()
+    return project
+
+
+def add_task(client, project, title):
+    response = client.post(f'/api/project/{project.id}/task', json={'title': title},
+                           headers=auth_headers(project.admin))
+    assert response.status_code == 201
+
+
+def get_changes(client, project, since, **params):
+    return client.get(f'/api/project/{project.id}/changes', query_string={'since': since, **params},
+                      headers=auth_headers(project.admin))
+
+
+def test_changes_are_paged_by_revision(client, project):
+    for title in ('First', 'Second', 'Third'):
+        add_task(client, project, title)
+
+    data = get_changes(client, project, 0, limit=2).get_json()
+    assert [entry['revision'] for entry in data['changes']] == [1, 2]
+    assert (data['revision'], data['current_revision'], data['has_more']) == (2, 3, True)
+
+    data = get_changes(client, project, data['revision']).get_json()
+    assert [entry['revision'] for entry in data['changes']] == [3]
+    assert (data['revision'], data['has_more']) == (3, False)
+
+
+def test_write_committed_during_the_request_is_not_skipped(client, project, monkeypatch):
+    add_task(client, project, 'First')
+    project_id, admin_id = project.id, project.admin_id
+
+    def get_changes_then_write(*args):
+        result = original(*args)
+        record_changes(project_id, [change('task', None, 'create')], admin_id)
+        db.session.commit()
+        return result
+
+    original = app_module.get_changes
+    monkeypatch.setattr(app_module, 'get_changes', get_changes_then_write)
+    data = get_changes(client, project, 0).get_json()
+    assert (data['revision'], data['current_revision']) == (1, 2)
+
+    monkeypatch.setattr(app_module, 'get_changes', original)
+    data = get_changes(client, project, data['revision']).get_json()
+    assert [entry['revision'] for entry in data['changes']] == [2]
+
+
+def test_revision_ahead_of_the_project_asks_for_a_resync(client, project):
+    add_task(client, project, 'First')
+    response = get_changes(client, project, 8)
+    assert response.status_code == 409
+    assert response.get_json()['current_revision'] == 1
+    assert response.get_json()['resync'] is True
@@ -0,0 +1,75 @@
+import datetime
+
+import pytest
+
+from api.models import db, Project, Project_Member, Task, ProjectStatus, TaskStatus
+from conftest import make_user, auth_headers
+
+
+@pytest.fixture
+def project(app):
+    admin = make_user('admin')
+    member = make_user('member')
+    now = datetime.datetime.now()
+    project = Project(title='Board', created_at=now, due_date=now,
+                      status=ProjectStatus.in_progress, admin=admin)
+    project.members = [Project_Member(member=member)]
+    project.tasks = [Task(title='Task', created_at=now, status=TaskStatus.in_progress,
+                          task_author=admin, assigned_to=member)]
+    db.session.add(project)
+    db.session.commit()
+    return project
+
+
+def get(client, url, user, etag=None):
+    headers = auth_headers(user)
+    if etag:
+        headers['If-None-Match'] = etag
+    return client.get(url, headers=headers)
+
+
+@pytest.mark.parametrize('path', ['', '/tasks'])
+def test_unchanged_project_answers_304(client, project, path):
+    url = f'/api/project/{project.id}{path}'
+    response = get(client, url, project.admin)
+    assert response.status_code == 200
+    etag = response.headers['ETag'].strip('"')
+
+    response = get(client, url, project.admin, etag)
+    assert response.status_code == 304
+    assert response.get_data() == b''
+
+
+def test_task_update_changes_the_etag(client, project):
+    url = f'/api/project/{project.id}'
+    etag = get(client, url, project.admin).headers['ETag'].strip('"')
+    task = project.tasks[0]
+    response = client.put(f'/api/project/{project.id}/task/{task.id}', json={'status': 'done'},
+                          headers=auth_headers(project.admin))
+    assert response.status_code == 200
+
+    response = get(client, url, project.admin, etag)
+    assert response.status_code == 200
+    assert response.headers['ETag'].strip('"') != etag
+    assert response.get_json()['project']['tasks'][0]['status'] == 'done'
+
+
+def test_member_rename_changes_the_etag(client, project):
+    url = f'/api/project/{project.id}'
+    etag = get(client, url, project.admin).headers['ETag'].strip('"')
+    member = project.members[0].member
+    response = client.put('/api/profile', json={'full_name': 'Renamed'}, headers=auth_headers(member))
+    assert response.status_code == 200
+
+    response = get(client, url, project.admin, etag)
+    assert response.status_code == 200
+    assert 'Renamed' in [user['full_name'] for user in response.get_json()['project']['members']]
+
+
+def test_member_and_admin_get_different_task_etags(client, project):
+    url = f'/api/project/{project.id}/tasks'
+    admin_etag = get(client, url, project.admin).headers['ETag']
+    member = project.members[0].member
+    response = get(client, url, member, admin_etag.strip('"'))
+    assert response.status_code == 200
+    assert response.headers['ETag'] != admin_etag
@@ -0,0 +1,98 @@
+import datetime
+import json
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from api.models import db, Project, Project_Member, ProjectStatus
+from api.notifications import notifier
+from conftest import make_user, auth_headers
+
+MAX_PINGS = 100
+
+
+@pytest.fixture
+def project(app, monkeypatch):
+    monkeypatch.setitem(app.config, 'NOTIFY_HEARTBEAT_SECONDS', 0.05)
+    admin = make_user('admin')
+    member = make_user('member')
+    now = datetime.datetime.now()
+    project = Project(title='Board', created_at=now, due_date=now,
+                      status=ProjectStatus.in_progress, admin=admin)
+    db.session.add(project)
+    db.session.flush()
+    db.session.add(Project_Member(project_id=project.id, member_id=member.id))
+    db.session.commit()
+    return project
+
+
+def member_of(project):
+    return project.members[0].member
+
+
+def open_stream(client, project, headers):
+    return client.get(f'/api/project/{project.id}/events', headers=headers, buffered=False)
+
+
+def events(response):
+    """ (event, data) of every event of a stream, pings left out """
+    pings = 0
+    for chunk in response.response:
+        chunk = chunk.decode() if isinstance(chunk, bytes) else chunk
+        if chunk.startswith(':'):
+            pings += 1
+            assert pings < MAX_PINGS, 'the stream should have ended'
+            continue
+        fields = dict(line.split(': ', 1) for line in chunk.strip().split('\n'))
+        yield fields['event'], json.loads(fields['data'])
+
+
+def test_subscribers_over_the_limit_are_sent_to_the_change_feed(app, client, project, monkeypatch):
+    monkeypatch.setitem(app.config, 'NOTIFY_MAX_SUBSCRIBERS', 1)
+    headers = auth_headers(project.admin)
+    first = open_stream(client, project, headers)
+    assert first.status_code == 200
+
+    response = open_stream(client, project, headers)
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == str(app.config['NOTIFY_RETRY_AFTER'])
+
+    # The slot is given back when the first client leaves, even before its stream started
+    first.close()
+    assert notifier.subscribers == 0
+    response = open_stream(client, project, headers)
+    assert response.status_code == 200
+    response.close()
+
+
+def test_removed_member_stream_is_closed(client, project):
+    member = member_of(project)
+    stream = events(open_stream(client, project, auth_headers(member)))
+    assert next(stream)[0] == 'ready'
+
+    response = client.delete(f'/api/project/{project.id}/member/{member.id}',
+                             headers=auth_headers(project.admin))
+    assert response.status_code == 200
+    event, data = next(stream)
+    assert (event, data['changes'][0]['entity'], data['changes'][0]['action']) == ('change', 'member', 'removed')
+    assert next(stream)[0] == 'revoked'
+    assert list(stream) == []
+    assert notifier.subscribers == 0
+
+
+def test_stream_ends_when_the_token_expires(client, project):
+    token = create_access_token(identity=str(project.admin_id), expires_delta=datetime.timedelta(seconds=1))
+    stream = events(open_stream(client, project, {'Authorization': f'Bearer {token}'}))
+    assert [event for event, data in stream] == ['ready', 'revoked']
+
+
+def test_profile_changes_reach_live_subscribers(client, project):
+    member = member_of(project)
+    with notifier.subscribe(project.id) as subscription:
+        response = client.put('/api/profile', json={'full_name': 'New name'}, headers=auth_headers(member))
+        assert response.status_code == 200
+        data = json.loads(subscription.get(timeout=1))
+    assert data['revision'] == 1
+    change, = data['changes']
+    assert (change['entity'], change['entity_id'], change['action']) == ('user', member.id, 'updated')
+    assert change['data']['full_name'] == 'New name'
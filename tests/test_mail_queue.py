@@ -0,0 +1,84 @@
+import datetime
+
+from api.mail_queue import mail_queue
+from api.models import db, OutboundMail, MailStatus
+
+
+def enqueue(subject='Welcome'):
+    return mail_queue.enqueue(subject, ['someone@example.com'], '<p>Hello</p>').id
+
+
+def test_mail_is_delivered_and_removed_from_the_queue(app, smtp_server):
+    enqueue()
+    assert mail_queue.send_pending() == 1
+    assert len(smtp_server.messages) == 1
+    assert 'Subject: Welcome' in smtp_server.messages[0]
+    assert OutboundMail.query.count() == 0
+
+
+def test_failed_send_is_retried_with_backoff_until_delivered(app, smtp_server):
+    retry = app.config['MAIL_QUEUE_RETRY_SECONDS']
+    smtp_server.failures = 2
+    mail_id = enqueue()
+    now = datetime.datetime.now()
+
+    assert mail_queue.send_pending(now) == 1
+    outbound_mail = db.session.get(OutboundMail, mail_id)
+    assert outbound_mail.status == MailStatus.pending
+    assert outbound_mail.attempts == 1
+    assert '451' in outbound_mail.last_error
+    assert outbound_mail.next_attempt_at == now + datetime.timedelta(seconds=retry)
+
+    # Not due yet
+    assert mail_queue.send_pending(now + datetime.timedelta(seconds=retry - 1)) == 0
+
+    now += datetime.timedelta(seconds=retry)
+    assert mail_queue.send_pending(now) == 1
+    outbound_mail = db.session.get(OutboundMail, mail_id)
+    assert outbound_mail.attempts == 2
+    assert outbound_mail.next_attempt_at == now + datetime.timedelta(seconds=retry * 2)
+
+    assert mail_queue.send_pending(now + datetime.timedelta(seconds=retry * 2)) == 1
+    assert db.session.get(OutboundMail, mail_id) is None
+    assert len(smtp_server.messages) == 1
+
+
+def test_mail_fails_for_good_after_max_attempts(app, smtp_server, monkeypatch):
+    monkeypatch.setitem(app.config, 'MAIL_QUEUE_MAX_ATTEMPTS', 2)
+    smtp_server.failures = 10
+    mail_id = enqueue()
+    now = datetime.datetime.now()
+    for _ in range(2):
+        mail_queue.send_pending(now)
+        now += datetime.timedelta(days=1)
+    assert mail_queue.send_pending(now) == 0
+    outbound_mail = db.session.get(OutboundMail, mail_id)
+    assert outbound_mail.status == MailStatus.failed
+    assert outbound_mail.attempts == 2
+    assert smtp_server.messages == []
+
+
+def test_unreachable_server_retries_the_whole_batch(app, smtp_server):
+    smtp_server.refuse = True
+    mail_ids = [enqueue(f'Mail {i}') for i in range(3)]
+    now = datetime.datetime.now()
+    assert mail_queue.send_pending(now) == 3
+    assert all(db.session.get(OutboundMail, mail_id).attempts == 1 for mail_id in mail_ids)
+
+    smtp_server.refuse = False
+    assert mail_queue.send_pending(now + datetime.timedelta(days=1)) == 3
+    assert OutboundMail.query.count() == 0
+    assert len(smtp_server.messages) == 3
+
+
+def test_claimed_mail_is_sent_again_when_the_lease_expires(app, smtp_server):
+    lease = app.config['MAIL_QUEUE_LEASE_SECONDS']
+    mail_id = enqueue()
+    now = datetime.datetime.now()
+    # A worker claims the mail and dies before sending it
+    assert len(mail_queue._claim(now)) == 1
+
+    assert mail_queue.send_pending(now + datetime.timedelta(seconds=lease - 1)) == 0
+    assert mail_queue.send_pending(now + datetime.timedelta(seconds=lease)) == 1
+    assert db.session.get(OutboundMail, mail_id) is None
+    assert len(smtp_server.messages) == 1
@@ -0,0 +1,37 @@
+import os
+import time
+
+import pytest
+from flask import Flask
+
+from api.passwords import PasswordHasher, PasswordHasherBusy
+
+TIMEOUT = 0.5
+
+
+@pytest.fixture
+def hasher():
+    app = Flask(__name__)
+    app.config.update(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_MAX_PENDING=1,
+                      PASSWORD_HASH_TIMEOUT=TIMEOUT, PASSWORD_HASH_METHOD='pbkdf2:sha256:1000')
+    hasher = PasswordHasher(app)
+    # Starts the pool, so spawning the child does not count against the timeouts below
+    assert hasher.verify(hasher.hash('secret'), 'secret') == (True, None)
+    yield hasher
+    hasher.shutdown()
+
+
+def test_timed_out_hash_is_busy_and_keeps_its_slot(hasher):
+    with pytest.raises(PasswordHasherBusy):
+        hasher._run(time.sleep, 3 * TIMEOUT)
+    # Still running in the pool: no room for another job until it is over
+    with pytest.raises(PasswordHasherBusy):
+        hasher._run(abs, -1)
+    time.sleep(2 * TIMEOUT)
+    assert hasher._run(abs, -1) == 1
+
+
+def test_crashed_pool_is_replaced(hasher):
+    with pytest.raises(PasswordHasherBusy):
+        hasher._run(os._exit, 1)
+    assert hasher.verify(hasher.hash('secret'), 'secret') == (True, None)
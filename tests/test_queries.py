@@ -0,0 +1,199 @@
+import datetime
+import json
+
+import pytest
+
+from api.models import db, Project, Project_Member, Task, Comment, Tags, ProjectStatus, TaskStatus
+from api.queries import get_user_projects, add_members_bulk
+from conftest import make_user, auth_headers
+
+
+def make_projects(user, num_projects, num_members, num_tasks):
+    """ num_projects administered by user and as many where it is a member, all alike """
+    now = datetime.datetime.now()
+    members = [make_user(f'member{i}') for i in range(num_members)]
+    other_admin = make_user('other')
+    for i in range(num_projects * 2):
+        admin = user if i % 2 == 0 else other_admin
+        project = Project(title=f'Project {i}', created_at=now, due_date=now,
+                          status=ProjectStatus.in_progress, admin=admin)
+        db.session.add(project)
+        project.members = [Project_Member(member=member) for member in members]
+        if admin is other_admin:
+            project.members.append(Project_Member(member=user))
+        for j in range(num_tasks):
+            assignee = members[j % len(members)] if members else None
+            task = Task(title=f'Task {j}', created_at=now, status=TaskStatus.urgent,
+                        task_author=admin, assigned_to=assignee, project=project)
+            task.comments = [Comment(title='Comment', description='Text', created_at=now,
+                                     comment_author=admin) for _ in range(2)]
+            task.tags = [Tags(tag='bug'), Tags(tag='ux')]
+            db.session.add(task)
+    db.session.commit()
+
+
+def count_get_projects(client, queries, num_projects, num_members, num_tasks):
+    user = make_user('user')
+    make_projects(user, num_projects, num_members, num_tasks)
+    headers = auth_headers(user)
+    db.session.expunge_all()
+
+    queries.clear()
+    response = client.get('/api/projects', headers=headers)
+    assert response.status_code == 200
+    projects = response.get_json()['user_projects']
+    assert len(projects['admin']) == len(projects['member']) == num_projects
+    assert all(len(project['tasks']) == num_tasks for project in projects['admin'])
+    return len(queries)
+
+
+@pytest.mark.parametrize('size', [(3, 2, 3), (12, 6, 15)])
+def test_get_projects_query_count_does_not_grow(app, client, queries, size):
+    baseline = count_get_projects(client, queries, 1, 1, 1)
+    db.session.remove()
+    db.drop_all()
+    db.create_all()
+    assert count_get_projects(client, queries, *size) == baseline
+
+
+def test_get_user_projects_loads_the_whole_graph(app, queries):
+    user = make_user('user')
+    make_projects(user, 4, 3, 5)
+    user_id = user.id
+    db.session.expunge_all()
+
+    queries.clear()
+    admin_projects, member_projects = get_user_projects(user_id)
+    loaded = len(queries)
+    for project in admin_projects + member_projects:
+        project.serialize()
+    assert len(queries) == loaded
+
+
+@pytest.fixture
+def board(app):
+    """ 13 tasks, several sharing a created_at, with mixed statuses, assignees and tags """
+    admin = make_user('admin')
+    member = make_user('member')
+    start = datetime.datetime(2026, 1, 1)
+    project = Project(title='Board', created_at=start, due_date=start,
+                      status=ProjectStatus.in_progress, admin=admin)
+    project.members = [Project_Member(member=member)]
+    statuses = [TaskStatus.urgent, TaskStatus.done, TaskStatus.in_progress]
+    for i in range(13):
+        task = Task(title=f'Task {i}', created_at=start + datetime.timedelta(hours=i // 3),
+                    status=statuses[i % 3], task_author=admin, project=project,
+                    assigned_to=member if i % 2 else None)
+        task.tags = [Tags(tag='bug')] if i % 4 == 0 else []
+        db.session.add(task)
+    db.session.commit()
+    return project
+
+
+def get_tasks(client, project, **params):
+    response = client.get(f'/api/project/{project.id}/tasks', query_string=params,
+                          headers=auth_headers(project.admin))
+    return response.status_code, response.get_json()
+
+
+def all_pages(client, project, **params):
+    ids, cursor = [], None
+    while True:
+        status, data = get_tasks(client, project, limit=4, **({'cursor': cursor} if cursor else {}), **params)
+        assert status == 200
+        ids += [task['id'] for task in data['tasks']]
+        cursor = data['next_cursor']
+        if cursor is None:
+            return ids
+
+
+def test_keyset_pages_have_no_duplicates_or_gaps(client, board):
+    _, data = get_tasks(client, board)
+    expected = [task['id'] for task in data['tasks']]
+    assert len(expected) == 13
+    assert all_pages(client, board) == expected
+
+
+@pytest.mark.parametrize('params, expected', [
+    ({'status': 'urgent'}, lambda i: i % 3 == 0),
+    ({'assigned_to_id': 'none'}, lambda i: i % 2 == 0),
+    ({'tag': 'bug'}, lambda i: i % 4 == 0),
+    ({'status': 'done', 'assigned_to_id': 'none'}, lambda i: i % 3 == 1 and i % 2 == 0),
+])
+def test_filters_apply_across_pages(client, board, params, expected):
+    titles = {task.id: task.title for task in board.tasks}
+    ids = all_pages(client, board, **params)
+    assert [titles[task_id] for task_id in ids] == [f'Task {i}' for i in range(13) if expected(i)]
+
+
+def test_assignee_filter(client, board):
+    member_id = board.members[0].member_id
+    _, data = get_tasks(client, board, assigned_to_id=member_id)
+    assert len(data['tasks']) == 6
+    assert {task['assigned_to_id'] for task in data['tasks']} == {member_id}
+
+
+@pytest.mark.parametrize('params', [
+    {'cursor': 'not a cursor'},
+    {'cursor': 'bm90fGEgY3Vyc29y'},
+    {'status': 'sleeping'},
+    {'assigned_to_id': 'someone'},
+])
+def test_bad_cursor_or_filter_is_a_400(client, board, params):
+    assert get_tasks(client, board, **params)[0] == 400
+
+
+def test_add_members_reports_each_email(client, board):
+    existing = board.members[0].member
+    new = make_user('new')
+    db.session.commit()
+    emails = ['ghost@example.com', existing.email, board.admin.email, new.email, new.email]
+    response = client.post(f'/api/project/{board.id}/members', json={'members': emails},
+                           headers=auth_headers(board.admin))
+    assert response.status_code == 200
+    data = response.get_json()
+    assert [result['status'] for result in data['results']] == [
+        'not_found', 'already_member', 'is_admin', 'added', 'duplicate']
+    assert [member['id'] for member in data['added_members']] == [new.id]
+    assert len(data['errors']) == 4
+    assert {member.member_id for member in board.members} == {existing.id, new.id}
+
+
+def test_add_members_without_any_new_member_is_a_400(client, board):
+    response = client.post(f'/api/project/{board.id}/members', json={'members': ['ghost@example.com']},
+                           headers=auth_headers(board.admin))
+    assert response.status_code == 400
+    assert response.get_json()['results'][0]['status'] == 'not_found'
+    assert len(board.members) == 1
+
+
+@pytest.mark.parametrize('count', [1, 20])
+def test_add_members_bulk_query_count_does_not_grow(board, queries, count):
+    emails = [make_user(f'new{i}').email for i in range(count)] + ['ghost@example.com']
+    db.session.refresh(board)
+    queries.clear()
+    added, _ = add_members_bulk(board, emails)
+    assert len(added) == count
+    assert len(queries) == 3
+
+
+def test_summary_view_matches_the_full_projects(client, board):
+    headers = auth_headers(board.admin)
+    full, = client.get('/api/projects', headers=headers).get_json()['user_projects']['admin']
+    summary, = client.get('/api/projects?view=summary', headers=headers).get_json()['user_projects']['admin']
+    for field in set(summary) - {'members_count', 'tasks_count', 'tasks_by_status'}:
+        assert summary[field] == full[field]
+    assert summary['members_count'] == len(full['members'])
+    assert summary['tasks_count'] == len(full['tasks'])
+    assert summary['tasks_by_status'] == {
+        status.value: sum(task['status'] == status.value for task in full['tasks']) for status in TaskStatus}
+
+
+@pytest.mark.parametrize('url', ['/api/projects', '/api/project/{id}/tasks'])
+def test_streamed_response_is_the_same_json(client, board, url):
+    url = url.format(id=board.id)
+    headers = auth_headers(board.admin)
+    expected = client.get(url, headers=headers).get_json()
+    response = client.get(f'{url}?stream=1', headers=headers)
+    assert response.is_streamed
+    assert json.loads(response.get_data(as_text=True)) == expected
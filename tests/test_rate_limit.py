@@ -0,0 +1,30 @@
+import pytest
+
+from api.rate_limit import rate_limiter, MemoryStore
+
+
+@pytest.fixture
+def login(app, client, monkeypatch):
+    monkeypatch.setitem(app.config, 'RATE_LIMIT_ENABLED', True)
+    monkeypatch.setitem(app.config, 'RATE_LIMIT_LOGIN_IP', '2/minute')
+    monkeypatch.setitem(app.config, 'RATE_LIMIT_LOGIN_EMAIL', '3/minute')
+    monkeypatch.setattr(rate_limiter, 'store', MemoryStore())
+
+    def login(ip, email='victim@example.com'):
+        return client.post('/api/login', json={'email': email, 'password': 'guess'},
+                           environ_base={'REMOTE_ADDR': ip}).status_code
+    return login
+
+
+def test_requests_rejected_by_ip_do_not_drain_the_email_bucket(login):
+    assert [login('10.0.0.1') for _ in range(5)] == [401, 401, 429, 429, 429]
+    # Two tokens of the email were used, the rejected attempts took none
+    assert login('10.0.0.2') == 401
+    assert login('10.0.0.3') == 429
+
+
+def test_requests_rejected_by_email_do_not_drain_the_ip_bucket(login):
+    assert [login(f'10.0.0.{i}') for i in range(4)] == [401, 401, 401, 429]
+    assert login('10.0.0.3', email='other@example.com') == 401
+    assert login('10.0.0.3', email='other@example.com') == 401
+    assert login('10.0.0.3', email='other@example.com') == 429
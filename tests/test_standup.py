@@ -0,0 +1,97 @@
+import datetime
+import json
+
+import pytest
+
+from api.models import db, Project, Task, ProjectStatus, TaskStatus
+from conftest import make_user, auth_headers
+
+FAILURE = [503, 503, 503]
+
+
+@pytest.fixture
+def headers(app, mistral, monkeypatch):
+    """ A user with projects A, B and C, summarized one at a time in that order """
+    monkeypatch.setitem(app.config, 'STANDUP_CONCURRENCY', 1)
+    monkeypatch.setitem(app.config, 'AI_MAX_RETRIES', len(FAILURE) - 1)
+    user = make_user('user')
+    now = datetime.datetime.now()
+    for title in 'ABC':
+        db.session.add(Project(title=title, created_at=now, due_date=now,
+                               status=ProjectStatus.in_progress, admin=user))
+    db.session.commit()
+    return auth_headers(user)
+
+
+def test_one_failing_project_keeps_the_others(client, mistral, headers):
+    mistral.responses = ['Summary A', *FAILURE, 'Summary C']
+    response = client.post('/api/ai/standup', headers=headers)
+    assert response.status_code == 200
+    projects = {proj['title']: proj for proj in response.get_json()['projects']}
+    assert projects['A']['summary'] == 'Summary A'
+    assert projects['B']['summary'] is None
+    assert 'error' in projects['B']
+    assert projects['C']['summary'] == 'Summary C'
+    assert response.get_json()['standup'] == 'A: Summary A\n\nC: Summary C'
+
+    # The next standup only asks again for the project that failed
+    mistral.calls.clear()
+    mistral.responses = ['Summary B']
+    response = client.post('/api/ai/standup', headers=headers)
+    assert len(mistral.calls) == 1
+    projects = {proj['title']: proj for proj in response.get_json()['projects']}
+    assert projects['B'] == {'project_id': projects['B']['project_id'], 'title': 'B',
+                             'summary': 'Summary B', 'cached': False}
+    assert projects['A']['cached'] and projects['C']['cached']
+
+
+def test_standup_fails_when_no_project_has_a_summary(client, mistral, headers):
+    mistral.responses = FAILURE * 3
+    response = client.post('/api/ai/standup', headers=headers)
+    assert response.status_code == 502
+
+
+def test_streamed_standup_goes_on_after_a_failing_project(client, mistral, headers):
+    mistral.responses = ['Summary A', *FAILURE, 'Summary C']
+    response = client.post('/api/ai/standup?stream=1', headers=headers)
+    events = [
+        (block.split('\n')[0][len('event: '):], json.loads(block.split('data: ', 1)[1]))
+        for block in response.get_data(as_text=True).split('\n\n') if block.startswith('event:')
+    ]
+    projects = [data for event, data in events if event == 'project']
+    assert [(proj['title'], 'error' in proj) for proj in projects] == [('A', False), ('B', True), ('C', False)]
+    event, done = events[-1]
+    assert event == 'done'
+    assert done['standup'] == 'A: Summary A\n\nC: Summary C'
+
+
+def test_empty_summaries_are_not_stored(client, mistral, headers):
+    mistral.responses = ['Summary A', '  ', 'Summary C']
+    client.post('/api/ai/standup', headers=headers)
+
+    mistral.calls.clear()
+    mistral.responses = ['Summary B']
+    response = client.post('/api/ai/standup', headers=headers)
+    assert len(mistral.calls) == 1
+    assert response.get_json()['standup'] == 'A: Summary A\n\nB: Summary B\n\nC: Summary C'
+
+
+def test_status_swap_that_keeps_the_counts_refreshes_the_summary(client, mistral, headers):
+    project = Project.query.filter_by(title='A').one()
+    now = datetime.datetime.now()
+    done, urgent = (Task(title=f'Task {status.value}', created_at=now, status=status,
+                         project=project, author_id=project.admin_id)
+                    for status in (TaskStatus.done, TaskStatus.urgent))
+    db.session.add_all([done, urgent])
+    db.session.commit()
+    client.post('/api/ai/standup', headers=headers)
+
+    for task, status in ((done, 'urgent'), (urgent, 'done')):
+        response = client.put(f'/api/project/{project.id}/task/{task.id}', json={'status': status}, headers=headers)
+        assert response.status_code == 200
+    mistral.calls.clear()
+    mistral.responses = ['New summary A']
+    response = client.post('/api/ai/standup', headers=headers)
+    assert len(mistral.calls) == 1
+    projects = {proj['title']: proj for proj in response.get_json()['projects']}
+    assert projects['A']['summary'] == 'New summary A'
@@ -0,0 +1,67 @@
+import datetime
+import json
+
+import pytest
+
+from api.models import db, Project, Task, ProjectStatus
+from conftest import make_user, auth_headers
+
+
+@pytest.fixture
+def project(app):
+    admin = make_user('admin')
+    now = datetime.datetime.now()
+    project = Project(title='Board', created_at=now, due_date=now,
+                      status=ProjectStatus.in_progress, admin=admin)
+    db.session.add(project)
+    db.session.commit()
+    return project
+
+
+def import_lines(client, project, rows):
+    body = '\n'.join(json.dumps(row) for row in rows)
+    return client.post(f'/api/project/{project.id}/tasks/import', data=body,
+                       content_type='application/x-ndjson', headers=auth_headers(project.admin))
+
+
+def test_import_tasks(client, project):
+    response = import_lines(client, project, [
+        {'title': 'First', 'status': 'urgent', 'tags': ['bug', 'ux']},
+        {'title': 'Second', 'description': 'Details', 'assigned_to_id': project.admin_id},
+    ])
+    assert response.status_code == 201
+    assert response.get_json()['imported'] == 2
+    assert sorted(task.title for task in Task.query) == ['First', 'Second']
+
+
+@pytest.mark.parametrize('row, error', [
+    ({'title': 5}, 'title must be a string'),
+    ({'title': ['a']}, 'title must be a string'),
+    ({'title': 'Ok', 'status': 1}, 'status must be a string'),
+    ({'title': 'Ok', 'description': {'a': 1}}, 'description must be a string'),
+    ({'title': 'Ok', 'created_at': 20240101}, 'created_at must be a string'),
+    ({'title': 'Ok', 'assigned_to_id': True}, 'assigned_to_id must be a user id'),
+    ({'title': 'Ok', 'assigned_to_id': [1]}, 'assigned_to_id must be a user id'),
+    ({'title': 'Ok', 'tags': [1, {}]}, 'tags must be a list of strings'),
+])
+def test_rows_with_wrong_types_are_reported_per_line(client, project, row, error):
+    response = import_lines(client, project, [{'title': 'Valid'}, row])
+    assert response.status_code == 400
+    assert response.get_json()['errors'] == [{'line': 2, 'error': error}]
+    assert Task.query.count() == 0
+
+
+def test_csv_errors_report_the_line_of_the_row(client, project):
+    body = 'title,description,status\nFirst,"Two\nlines",done\nSecond,Ok,sleeping\n'
+    response = client.post(f'/api/project/{project.id}/tasks/import', data=body,
+                           content_type='text/csv', headers=auth_headers(project.admin))
+    assert response.status_code == 400
+    assert [error['line'] for error in response.get_json()['errors']] == [4]
+
+
+def test_empty_import_does_not_bump_the_revision(client, project):
+    response = import_lines(client, project, [])
+    assert response.status_code == 201
+    assert response.get_json()['imported'] == 0
+    db.session.refresh(project)
+    assert project.revision == 0
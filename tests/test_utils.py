@@ -0,0 +1,41 @@
+import os
+import threading
+
+from api.utils import PerProcess
+
+
+def test_per_process_value_is_created_once_per_process(monkeypatch):
+    created = []
+    value = PerProcess(lambda: created.append(object()) or created[-1])
+    first = value.get()
+    assert value.get() is first
+
+    # A forked worker gets its own
+    pid = os.getpid()
+    monkeypatch.setattr(os, 'getpid', lambda: pid + 1)
+    assert value.get() is not first
+    assert len(created) == 2
+
+
+def test_per_process_value_is_replaced_when_dead_or_reset():
+    stop = threading.Event()
+
+    def start():
+        thread = threading.Thread(target=stop.wait, daemon=True)
+        thread.start()
+        return thread
+
+    value = PerProcess(start, threading.Thread.is_alive)
+    thread = value.get()
+    assert value.get() is thread
+    stop.set()
+    thread.join()
+    stop.clear()
+    current = value.get()
+    assert current is not thread
+    assert value.get() is current
+
+    assert value.reset(thread) is None
+    assert value.reset(current) is current
+    assert value.get() is not current
+    stop.set()